@@ -1,4 +1,8 @@
+import threading
 import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from rich.console import Console
 from resolution.engine import handle_issue
 from notifications.notifier import notify
@@ -6,26 +10,111 @@ from notifications.notifier import notify
 console = Console()
 
 class JobAgent:
+    """Runs the configured jobs concurrently and resolves each issue as soon as its job finishes.
+
+    Jobs run on a pool of ``scheduler.max_workers`` threads. No more than
+    ``scheduler.type_limits[type]`` jobs of one type run at a time, and
+    ``scheduler.default_type_limit`` applies to types that are not listed.
+    Jobs over their type's limit wait in a per-type queue. When a job finishes,
+    its callback starts the next job of that type. If the job ended in a status
+    listed under ``resolution``, the callback also hands it to a separate
+    ``scheduler.resolution_workers`` pool, so slow actions such as
+    restart_service do not hold a job slot. A job that resolution puts back to
+    pending (retry, restart) is queued again.
+    """
+
     def __init__(self, jobs, config, llm_client):
         self.jobs = jobs
         self.config = config
         self.llm_client = llm_client
-        self.poll_interval = config.get('poll_interval', 2)
         self.escalation_threshold = config['notifications'].get('escalation_threshold', 2)
+        scheduler = config.get('scheduler') or {}
+        self.max_workers = scheduler.get('max_workers', 8)
+        self.resolution_workers = scheduler.get('resolution_workers', 4)
+        self.type_limits = scheduler.get('type_limits') or {}
+        self.default_type_limit = scheduler.get('default_type_limit')
+        self.makespan = None  # seconds monitor() took to settle every job
+        self.runs = 0  # job.run() calls, including reruns after retry/restart
+        self.resolution_latencies = []  # seconds from a job finishing to its issue being handled
+        self._lock = threading.Condition()
+        self._queued = {}  # job type -> deque of jobs waiting for a slot
+        self._running = Counter()  # job type -> jobs running
+        self._active = 0  # jobs queued, running or being resolved
+        self._job_pool = None
+        self._resolution_pool = None
 
     def monitor(self):
         console.print("[bold green]Starting job monitoring...[/bold green]")
-        while True:
-            for job in self.jobs:
-                if job.status == "pending":
-                    status = job.run()
-                    console.print(f"[cyan]Job {job.job_id} completed with status: {status}[/cyan]")
-                    if status in self.config['resolution']:
-                        self.handle_issue(job)
-            if all(job.status != "pending" for job in self.jobs):
-                break
-            time.sleep(self.poll_interval)
+        start = time.monotonic()
+        self._job_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._resolution_pool = ThreadPoolExecutor(max_workers=self.resolution_workers, thread_name_prefix="job-resolution")
+        try:
+            with self._lock:
+                for job in self.jobs:
+                    if job.status == "pending":
+                        self._active += 1
+                        self._enqueue(job)
+                self._lock.wait_for(lambda: self._active == 0)
+        finally:
+            self._job_pool.shutdown()
+            self._resolution_pool.shutdown()
+        self.makespan = time.monotonic() - start
         console.print("[bold green]All jobs processed.[/bold green]")
+        return self.makespan
+
+    def _limit(self, job_type):
+        return self.type_limits.get(job_type, self.default_type_limit)
+
+    def _enqueue(self, job):
+        # Caller holds self._lock
+        self._queued.setdefault(job.job_type, deque()).append(job)
+        self._start(job.job_type)
+
+    def _start(self, job_type):
+        # Start queued jobs of job_type while it is under its limit; caller holds self._lock
+        queue = self._queued.get(job_type)
+        limit = self._limit(job_type)
+        while queue and (limit is None or self._running[job_type] < limit):
+            job = queue.popleft()
+            self._running[job_type] += 1
+            self._job_pool.submit(job.run).add_done_callback(partial(self._on_finished, job))
+
+    def _on_finished(self, job, future):
+        with self._lock:
+            self.runs += 1
+            self._running[job.job_type] -= 1
+            self._start(job.job_type)
+        try:
+            status = future.result()
+        except Exception as e:
+            console.print(f"[red]Job {job.job_id} failed to run: {e}[/red]")
+            self._settle()
+            return
+        console.print(f"[cyan]Job {job.job_id} completed with status: {status}[/cyan]")
+        if status in self.config['resolution']:
+            self._resolution_pool.submit(self._resolve, job)
+        else:
+            self._settle()
+
+    def _resolve(self, job):
+        try:
+            self.handle_issue(job)
+        except Exception as e:
+            console.print(f"[red]Resolution for job {job.job_id} failed: {e}[/red]")
+        else:
+            with self._lock:
+                self.resolution_latencies.append(time.time() - job.end_time)
+                if job.status == "pending":
+                    self._enqueue(job)
+                    return
+        self._settle()
+
+    def _settle(self):
+        # A job reached a final status
+        with self._lock:
+            self._active -= 1
+            if not self._active:
+                self._lock.notify_all()
 
     def handle_issue(self, job):
         actions = self.config['resolution'].get(job.status, [])
@@ -34,4 +123,4 @@ class JobAgent:
             if result == "escalate":
                 notify(job, self.config, escalation=True)
             else:
-                notify(job, self.config, escalation=False) 
\ No newline at end of file
+                notify(job, self.config, escalation=False)
@@ -1,38 +1,186 @@
-from typing import List, Dict, Any
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional
 from agentic.base import Sensor, Effector, ReasoningModule
 from agentic.memory import Memory
+from agentic.suppression import EventSuppressor
+
+log = logging.getLogger(__name__)
 
 class Agent:
-    def __init__(self, sensors: List[Sensor], effectors: List[Effector], reasoning_module: ReasoningModule, memory: Memory = None):
+    """Polls sensors, decides on their events and runs the actions on every effector.
+
+    Each sensor is polled on its own thread, so a slow sensor only delays its
+    own events: run_once collects the polls that have finished and leaves a
+    slow one in flight for a later round. The (action, effector) calls for an
+    event run concurrently; a call that runs longer than its timeout
+    (effector.timeout, else effector_timeout; None waits forever), counted from
+    when it starts, is recorded as a timeout outcome and left to finish in the
+    background. The pool it holds a thread of is retired, so calls that hang
+    never leave later events without effector threads.
+    """
+
+    # Seconds between checks on calls still queued for a thread, whose timeout has not started yet
+    QUEUED_POLL = 0.05
+
+    def __init__(self, sensors: List[Sensor], effectors: List[Effector], reasoning_module: ReasoningModule, memory: Memory = None,
+                 suppressor: EventSuppressor = None, effector_timeout: Optional[float] = 30.0, sensor_wait: float = 1.0,
+                 max_effector_workers: int = 8):
         self.sensors = sensors
         self.effectors = effectors
         self.reasoning_module = reasoning_module
         self.memory = memory or Memory()
+        self.suppressor = suppressor  # optional: collapse repeats of an event within a window into one decision
+        self.effector_timeout = effector_timeout
+        self.sensor_wait = sensor_wait  # max seconds run_once waits for the first sensor poll to finish
+        self.max_effector_workers = max_effector_workers
         self.context = {}  # Can be expanded to persistent memory
+        # Executors only start threads as work arrives
+        self._sensor_pool = ThreadPoolExecutor(max_workers=max(1, len(sensors)), thread_name_prefix="agent-sensor")
+        self._effector_pool = self._new_effector_pool()
+        self._pool_lock = threading.Lock()  # the worker runs execute_actions from several threads
+        self.retired_pools = 0
+        self._polls = {}  # sensor index -> future of its in-flight get_event
+        self._stopped = threading.Event()
 
-    def run_once(self):
-        # Collect events from all sensors
-        for sensor in self.sensors:
-            event = sensor.get_event()
+    def _new_effector_pool(self):
+        return ThreadPoolExecutor(max_workers=self.max_effector_workers, thread_name_prefix="agent-effector")
+
+    def poll_sensors(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        # Start a poll on every sensor without one in flight, wait up to timeout (default sensor_wait)
+        # for the first to finish and return the events of every finished poll, in sensor order
+        for index, sensor in enumerate(self.sensors):
+            if index not in self._polls:
+                self._polls[index] = self._sensor_pool.submit(sensor.get_event)
+        if not self._polls:
+            return []
+        wait(list(self._polls.values()), timeout=self.sensor_wait if timeout is None else timeout, return_when=FIRST_COMPLETED)
+        events = []
+        for index in sorted(self._polls):
+            future = self._polls[index]
+            if not future.done():
+                continue
+            del self._polls[index]
+            try:
+                event = future.result()
+            except Exception as e:
+                log.error("Sensor %s failed: %s", type(self.sensors[index]).__name__, e)
+                continue
             if event:
+                events.append(event)
+        return events
+
+    def _timeout(self, effector):
+        timeout = getattr(effector, 'timeout', None)
+        return self.effector_timeout if timeout is None else timeout
+
+    def _submit(self, effector, action, started, index):
+        # Returns (pool, future); started[index] is set when the call gets a thread
+        def call():
+            started[index] = time.monotonic()
+            return effector.execute(action['type'], action.get('params', {}))
+        with self._pool_lock:
+            pool = self._effector_pool
+            return pool, pool.submit(call)
+
+    def _retire(self, pool):
+        # A timed-out call keeps its thread until it returns: later calls go to a fresh pool, and the
+        # old one lets its threads exit as their calls finish
+        with self._pool_lock:
+            if self._effector_pool is pool:
+                self._effector_pool = self._new_effector_pool()
+                self.retired_pools += 1
+                pool.shutdown(wait=False)
+
+    def execute_actions(self, actions: List[Dict[str, Any]]) -> List[Any]:
+        # Run every action on every effector concurrently; outcomes are in (action, effector) order.
+        # If an effector raises, the first error is re-raised once the other calls have finished or timed out.
+        calls = [(action, effector) for action in actions for effector in self.effectors]
+        if len(calls) == 1 and self._timeout(calls[0][1]) is None:
+            action, effector = calls[0]
+            return [effector.execute(action['type'], action.get('params', {}))]
+        started = [None] * len(calls)
+        submitted = [self._submit(effector, action, started, index) for index, (action, effector) in enumerate(calls)]
+        outcomes = [None] * len(calls)
+        error = None
+        pending = set(range(len(calls)))
+        while pending:
+            now = time.monotonic()
+            waits = []
+            for index in sorted(pending):
+                action, effector = calls[index]
+                pool, future = submitted[index]
+                timeout = self._timeout(effector)
+                if future.done():
+                    pending.discard(index)
+                    try:
+                        outcomes[index] = future.result()
+                    except Exception as e:
+                        error = error or e
+                elif started[index] is None:
+                    if pool is not self._effector_pool and future.cancel():
+                        # Queued behind a hung call on a retired pool: move it to the current one
+                        submitted[index] = self._submit(effector, action, started, index)
+                    if timeout is not None:
+                        waits.append(self.QUEUED_POLL)
+                elif timeout is not None and now >= started[index] + timeout:
+                    pending.discard(index)
+                    outcomes[index] = {'error': 'timeout', 'effector': type(effector).__name__, 'action': action['type'], 'timeout': timeout}
+                    self._retire(pool)
+                elif timeout is not None:
+                    waits.append(started[index] + timeout - now)
+            if pending:
+                wait([submitted[index][1] for index in pending], timeout=min(waits) if waits else None, return_when=FIRST_COMPLETED)
+        if error is not None:
+            raise error
+        return outcomes
+
+    def run_once(self) -> int:
+        # One round: collect the events sensors have ready, then decide and act on each; returns the event count
+        events = self.poll_sensors()
+        for event in events:
+            # A repeat of an event decided within the window only bumps that decision's occurrence count
+            if self.suppressor is not None and self.suppressor.admit(event) is not None:
+                continue
+            try:
                 # Decide on actions
                 actions = self.reasoning_module.decide(event, self.context)
-                outcomes = []
                 # Execute actions
-                for action in actions:
-                    for effector in self.effectors:
-                        outcome = effector.execute(action['type'], action.get('params', {}))
-                        outcomes.append(outcome)
-                # Record in memory
-                self.memory.record(event, actions, outcomes)
-
-    def run_forever(self, poll_interval: float = 5.0):
-        import time
-        while True:
-            self.run_once()
-            time.sleep(poll_interval)
+                outcomes = self.execute_actions(actions)
+            except Exception:
+                if self.suppressor is not None:
+                    self.suppressor.release(event)
+                raise
+            # Record in memory
+            entry = self.memory.record(event, actions, outcomes)
+            if self.suppressor is not None:
+                self.suppressor.attach(event, entry)
+        return len(events)
+
+    def run_forever(self, poll_interval: float = 5.0, min_interval: float = 0.05):
+        # Poll back to back while events are flowing; when a round comes back empty, sleep and double
+        # the sleep (from min_interval up to poll_interval) until events show up again. Runs until stop()
+        interval = min_interval
+        while not self._stopped.is_set():
+            if self.run_once():
+                interval = min_interval
+                continue
+            time.sleep(interval)
+            interval = min(interval * 2, poll_interval)
+
+    def stop(self):
+        self._stopped.set()
+
+    def close(self):
+        self.stop()
+        with self._pool_lock:
+            for pool in (self._sensor_pool, self._effector_pool):
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._polls = {}
 
     def feedback(self, feedback_data: Dict[str, Any]):
         # Store feedback and optionally adapt reasoning or actions
-        self.memory.history[-1]['feedback'] = feedback_data
-        # Here you could add logic to adapt rules, prompts, etc. based on feedback 
\ No newline at end of file
+        self.memory.history[-1].feedback = feedback_data
+        # Here you could add logic to adapt rules, prompts, etc. based on feedback
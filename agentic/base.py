@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 class Sensor(ABC):
     @abstractmethod
@@ -8,6 +8,8 @@ class Sensor(ABC):
         pass
 
 class Effector(ABC):
+    timeout = None  # seconds the agent waits for one execute call; None uses the agent's effector_timeout
+
     @abstractmethod
     def execute(self, action: str, params: Dict[str, Any]) -> Any:
         """Execute an action with given parameters."""
@@ -17,4 +19,8 @@ class ReasoningModule(ABC):
     @abstractmethod
     def decide(self, event: Dict[str, Any], context: Dict[str, Any]) -> list:
         """Given an event and context, return a list of actions to perform."""
-        pass 
\ No newline at end of file
+        pass
+
+    def decide_batch(self, events: List[Dict[str, Any]], context: Dict[str, Any]) -> List[list]:
+        """Decide on several events at once; returns one action list per event, in order."""
+        return [self.decide(event, context) for event in events] 
\ No newline at end of file
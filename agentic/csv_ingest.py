@@ -0,0 +1,143 @@
+"""Bulk ingestion of Kaggle event-log CSV exports straight into the event queue.
+
+    python -m agentic.csv_ingest eventos.csv --chunk-size 50000 --batch-size 1000
+
+The file is read in chunks of columns. "Nível" is mapped to statuses once per
+distinct value, rows whose status needs no action (success/debug/trace by
+default) are dropped before they reach the queue, and the remaining events
+are pushed with multi-value RPUSHes, one pipeline round trip per chunk. Uses
+pandas for reading and mapping when it is installed, the csv module otherwise.
+"""
+import argparse
+import csv
+import os
+from functools import lru_cache
+from itertools import islice
+
+try:
+    import pandas as pd
+except ImportError:  # optional: the csv module path needs no extra dependencies
+    pd = None
+
+from agentic.kaggle_csv_sensor import map_status
+from agentic.records import dumps
+
+EVENT_QUEUE = "agentic:events"
+SKIP_STATUSES = frozenset({"success", "debug", "trace"})
+LEVEL, TIMESTAMP, SOURCE, JOB_ID, DESCRIPTION = "Nível", "Data e Hora", "Fonte", "Identificação do Evento", "Description1"
+COLUMNS = (LEVEL, TIMESTAMP, SOURCE, JOB_ID, DESCRIPTION)
+
+# Log levels repeat heavily, so each distinct value goes through map_status once
+cached_status = lru_cache(maxsize=4096)(map_status)
+
+def map_statuses(levels):
+    # Status for every level in a column (list or pandas Series)
+    if pd is not None and isinstance(levels, pd.Series):
+        codes, uniques = pd.factorize(levels)
+        table = pd.Series([map_status(level) for level in uniques] + ["info"], dtype=object)
+        return table.to_numpy()[codes]  # code -1 (missing level) picks the trailing "info"
+    return [cached_status(level or "") for level in levels]
+
+def _python_chunks(path, chunk_size):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = {name: header.index(name) for name in COLUMNS if name in header}
+        while True:
+            raw = list(islice(reader, chunk_size))
+            if not raw:
+                return
+            # Blank lines are skipped, but a chunk of nothing but blank lines is not the end of the file
+            rows = [row for row in raw if row]
+            if not rows:
+                continue
+            yield {
+                name: [row[i] if i < len(row) else None for row in rows]
+                for name, i in positions.items()
+            }
+
+def _pandas_chunks(path, chunk_size):
+    frames = pd.read_csv(
+        path, chunksize=chunk_size, dtype=str, keep_default_na=False,
+        usecols=lambda name: name in COLUMNS, encoding="utf-8-sig",
+    )
+    for frame in frames:
+        yield {name: frame[name] for name in frame.columns}
+
+def read_chunks(path, chunk_size=50000, use_pandas=None):
+    # Yield {column name: column values} for chunk_size rows at a time
+    if use_pandas is None:
+        use_pandas = pd is not None
+    if use_pandas and pd is None:
+        raise ImportError("pandas is not installed")
+    return _pandas_chunks(path, chunk_size) if use_pandas else _python_chunks(path, chunk_size)
+
+def chunk_events(columns, first_index=1, skip_statuses=SKIP_STATUSES):
+    # Events for the rows of one chunk that survive the status filter; same shape as row_to_event
+    statuses = map_statuses(columns[LEVEL])
+    count = len(statuses)
+    def column(name, default=None):
+        values = columns.get(name)
+        return [default] * count if values is None else list(values)
+    job_ids, timestamps, sources = columns.get(JOB_ID), column(TIMESTAMP), column(SOURCE)
+    descriptions = column(DESCRIPTION, "")
+    if job_ids is not None:
+        job_ids = list(job_ids)
+    events = []
+    for i, status in enumerate(statuses):
+        if status in skip_statuses:
+            continue
+        event = {
+            "job_id": job_ids[i] if job_ids is not None else first_index + i,
+            "status": status,
+            "event_type": "job_issue",
+            "details": {"timestamp": timestamps[i], "source": sources[i], "description": descriptions[i]},
+        }
+        if status == "escalate":
+            event["escalate"] = True
+        events.append(event)
+    return events, count
+
+def ingest_csv(path, client, queue=EVENT_QUEUE, chunk_size=50000, batch_size=1000, skip_statuses=SKIP_STATUSES, use_pandas=None):
+    """Queue the events of a CSV export; returns {'rows', 'queued', 'skipped'}.
+
+    client may be None to parse, map and encode without pushing anything.
+    """
+    stats = {"rows": 0, "queued": 0, "skipped": 0}
+    for columns in read_chunks(path, chunk_size, use_pandas):
+        events, count = chunk_events(columns, stats["rows"] + 1, skip_statuses)
+        payloads = [dumps(event) for event in events]
+        if client is not None and payloads:
+            pipe = client.pipeline(transaction=False)
+            for start in range(0, len(payloads), batch_size):
+                pipe.rpush(queue, *payloads[start:start + batch_size])
+            pipe.execute()
+        stats["rows"] += count
+        stats["queued"] += len(payloads)
+        stats["skipped"] += count - len(payloads)
+    return stats
+
+def main():
+    import redis
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("csv_file")
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--keep-all", action="store_true", help="queue success/debug/trace rows too")
+    parser.add_argument("--no-pandas", action="store_true", help="use the csv module even if pandas is installed")
+    args = parser.parse_args()
+
+    client = redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", 6379)), db=int(os.getenv("REDIS_DB", 0)),
+    )
+    stats = ingest_csv(
+        args.csv_file, client, chunk_size=args.chunk_size, batch_size=args.batch_size,
+        skip_statuses=frozenset() if args.keep_all else SKIP_STATUSES, use_pandas=False if args.no_pandas else None,
+    )
+    print(f"Read {stats['rows']} rows: queued {stats['queued']}, skipped {stats['skipped']}")
+
+if __name__ == "__main__":
+    main()
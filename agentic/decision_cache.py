@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from feedback.store import event_hash, decision_cache_key
+
+log = logging.getLogger(__name__)
+
+
+def normalize_text(value) -> str:
+    # Case- and whitespace-insensitive form of a prompt field
+    return " ".join(str(value or "").lower().split())
+
+
+def decision_key(event: Dict[str, Any]) -> str:
+    # event_hash-style key over the prompt inputs that identify a repeated event;
+    # job_id and timestamp are deliberately left out so replays of the same failure share an entry
+    details = event.get('details') or {}
+    key = "|".join(normalize_text(v) for v in (
+        event.get('event_type'),
+        event.get('status'),
+        details.get('source'),
+        details.get('description'),
+    ))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def feedback_version(event: Dict[str, Any], feedback_list) -> Tuple[str, int]:
+    # A cached suggestion is only valid for the feedback it was generated with
+    return event_hash(event), len(feedback_list or [])
+
+
+class RedisDecisionTier:
+    """Shared cache tier: one Redis hash per feedback hash, so store_feedback can drop it in one DEL."""
+
+    def __init__(self, client, ttl_seconds=3600):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key, version):
+        raw = self.client.hget(decision_cache_key(version[0]), key)
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if entry.get('feedback_count') != version[1]:
+            return None
+        return entry['suggestion']
+
+    def put(self, key, version, suggestion):
+        name = decision_cache_key(version[0])
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hset(name, key, json.dumps({'suggestion': suggestion, 'feedback_count': version[1]}))
+        pipe.expire(name, self.ttl_seconds)
+        pipe.execute()
+
+
+class DecisionCache:
+    """In-process LRU + TTL cache of LLM suggestions with an optional shared Redis tier.
+
+    Entries are stored with the (event_hash, feedback count) they were generated
+    under; a lookup with a different version is treated as a miss and counted
+    as an invalidation, so new feedback for an event forces a fresh LLM call.
+    """
+
+    def __init__(self, max_entries=10000, ttl_seconds=3600, shared: Optional[RedisDecisionTier] = None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.shared = shared
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, version, suggestion)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key, version):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, cached_version, suggestion = entry
+                if expires_at <= now:
+                    del self._entries[key]
+                    self.evictions += 1
+                elif cached_version != version:
+                    del self._entries[key]
+                    self.invalidations += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return suggestion
+        if self.shared is not None:
+            try:
+                suggestion = self.shared.get(key, version)
+            except Exception as e:
+                log.warning("Shared decision cache tier unavailable: %s", e)
+                suggestion = None
+            if suggestion is not None:
+                self._store(key, version, suggestion, now)
+                with self._lock:
+                    self.shared_hits += 1
+                return suggestion
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, version, suggestion):
+        self._store(key, version, suggestion, self.clock())
+        if self.shared is not None:
+            try:
+                self.shared.put(key, version, suggestion)
+            except Exception as e:
+                log.warning("Shared decision cache tier unavailable: %s", e)
+
+    def _store(self, key, version, suggestion, now):
+        with self._lock:
+            self._entries[key] = (now + self.ttl_seconds, version, suggestion)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def resize(self, max_entries, ttl_seconds):
+        # Apply new limits in place so a config reload keeps the warm entries
+        with self._lock:
+            self.max_entries = max_entries
+            self.ttl_seconds = ttl_seconds
+            if self.shared is not None:
+                self.shared.ttl_seconds = ttl_seconds
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'saved_llm_calls': self.hits + self.shared_hits,
+            }
+
+
+def build_decision_cache(cache_config, redis_client=None) -> Optional[DecisionCache]:
+    # Build a cache from the reasoning.decision_cache section of config.yaml
+    if not cache_config or not cache_config.get('enabled', False):
+        return None
+    ttl = cache_config.get('ttl_seconds', 3600)
+    shared = None
+    if cache_config.get('shared', False):
+        if redis_client is None:
+            from feedback.store import r as redis_client
+        shared = RedisDecisionTier(redis_client, ttl_seconds=ttl)
+    return DecisionCache(max_entries=cache_config.get('max_entries', 10000), ttl_seconds=ttl, shared=shared)
@@ -0,0 +1,67 @@
+import logging
+import os
+import threading
+from typing import Callable, Dict
+
+log = logging.getLogger(__name__)
+
+
+class FileWatcher:
+    """Polls files for changes and runs a reload callback for each changed file.
+
+    A file counts as changed when its (mtime, size) signature differs from the
+    last one seen. Callbacks are expected to validate before swapping anything
+    in; if one raises, the error is reported, the running state is left as it
+    was and the new signature is remembered so the same broken file is not
+    retried on every poll.
+    """
+
+    def __init__(self, callbacks: Dict[str, Callable[[], object]], interval: float = 5.0):
+        self.callbacks = callbacks
+        self.interval = interval
+        self._signatures = {path: self._signature(path) for path in callbacks}
+        self._stop = threading.Event()
+        self._thread = None
+        self.reloads = 0
+        self.failures = 0
+
+    @staticmethod
+    def _signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def check(self):
+        # Run callbacks for changed files; returns the list of paths that reloaded successfully
+        reloaded = []
+        for path, callback in self.callbacks.items():
+            signature = self._signature(path)
+            if signature is None or signature == self._signatures.get(path):
+                continue
+            self._signatures[path] = signature
+            try:
+                result = callback()
+            except Exception as e:
+                self.failures += 1
+                log.warning("Rejected %s, keeping the previous version: %s", path, e)
+                continue
+            self.reloads += 1
+            reloaded.append(path)
+            log.info("Reloaded %s%s", path, f" ({result})" if result is not None else "")
+        return reloaded
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="agentic-hot-reload", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
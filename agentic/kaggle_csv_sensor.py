@@ -1,4 +1,7 @@
 import csv
+import json
+import os
+import time
 from agentic.base import Sensor
 
 def map_status(level):
@@ -21,28 +24,162 @@ def map_status(level):
     else:
         return "info"
 
+def row_to_event(row, index):
+    # One CSV row (a DictReader-style dict) as an event; index is the 1-based row number
+    status = map_status(row["Nível"])
+    event = {
+        "job_id": row.get("Identificação do Evento", index),
+        "status": status,
+        "event_type": "job_issue",
+        "details": {
+            "timestamp": row.get("Data e Hora"),
+            "source": row.get("Fonte"),
+            "description": row.get("Description1", "")
+        }
+    }
+    # Add escalation flag for critical/fatal/emergency
+    if status == "escalate":
+        event["escalate"] = True
+    return event
+
 class KaggleCSVSensor(Sensor):
-    def __init__(self, csv_file):
-        self.rows = list(csv.DictReader(open(csv_file, encoding="utf-8")))
-        self.index = 0
+    """Streams events from a Kaggle event-log CSV export.
+
+    Rows are read lazily one record at a time, so memory use does not depend
+    on the size of the file. The sensor tracks the byte offset of the next
+    unread row; with checkpoint_path it persists that offset (every
+    checkpoint_every events, at the end of the file and on close) so a
+    restarted sensor resumes where it left off. With follow=True it tails a
+    growing file: get_event returns None at the current end of the file and
+    picks up rows appended later, and a file that shrinks is read again from
+    the start.
+    """
+
+    def __init__(self, csv_file, checkpoint_path=None, follow=False, checkpoint_every=100, poll_interval=1.0):
+        self.csv_file = csv_file
+        self.checkpoint_path = checkpoint_path
+        self.follow = follow
+        self.checkpoint_every = checkpoint_every
+        self.poll_interval = poll_interval
+        self.fieldnames = None
+        self.offset = None  # byte offset of the next unread row
+        self.index = 0  # rows read so far
+        self._file = None
+        self._unsaved = 0
+        self._load_checkpoint()
+
+    def _load_checkpoint(self):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("file") == os.path.abspath(self.csv_file):
+            self.offset = checkpoint["offset"]
+            self.index = checkpoint.get("index", 0)
+
+    def save_checkpoint(self):
+        if not self.checkpoint_path or self.offset is None:
+            return
+        tmp = self.checkpoint_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"file": os.path.abspath(self.csv_file), "offset": self.offset, "index": self.index}, f)
+        os.replace(tmp, self.checkpoint_path)
+        self._unsaved = 0
+
+    def _read_record(self, f):
+        # Raw bytes of one CSV record (quoted fields may span lines); None at the end of the data.
+        # When tailing, a trailing record without its newline may still be being written, so it is left for later.
+        start = f.tell()
+        data = b""
+        while True:
+            line = f.readline()
+            data += line
+            if not line or not line.endswith(b"\n"):
+                if data and not self.follow and data.count(b'"') % 2 == 0:
+                    return data
+                f.seek(start)
+                return None
+            if data.count(b'"') % 2 == 0:
+                return data
+
+    def _open(self):
+        f = open(self.csv_file, "rb")
+        header = self._read_record(f)
+        if header is None:
+            f.close()
+            return False
+        self.fieldnames = next(csv.reader([header.decode("utf-8-sig")]))
+        header_end = f.tell()
+        if self.offset is None or self.offset < header_end or self.offset > os.fstat(f.fileno()).st_size:
+            if self.offset is not None and self.offset > header_end:
+                self.index = 0  # the file was truncated or replaced
+            self.offset = header_end
+        f.seek(self.offset)
+        self._file = f
+        return True
 
     def get_event(self):
-        if self.index < len(self.rows):
-            row = self.rows[self.index]
+        if self._file is None and not self._open():
+            return None
+        while True:
+            data = self._read_record(self._file)
+            if data is None:
+                if self._unsaved:
+                    self.save_checkpoint()
+                if self.follow and os.path.getsize(self.csv_file) < self.offset:
+                    # Truncated or rotated: start over on the new contents
+                    self._file.close()
+                    self._file = None
+                    self.offset = None
+                    self.index = 0
+                return None
+            self.offset = self._file.tell()
+            values = next(csv.reader([data.decode("utf-8")]), None)
+            if not values:
+                continue  # blank line
             self.index += 1
-            status = map_status(row["Nível"])
-            event = {
-                "job_id": row.get("Identificação do Evento", self.index),
-                "status": status,
-                "event_type": "job_issue",
-                "details": {
-                    "timestamp": row.get("Data e Hora"),
-                    "source": row.get("Fonte"),
-                    "description": row.get("Description1", "")
-                }
-            }
-            # Add escalation flag for critical/fatal/emergency
-            if status == "escalate":
-                event["escalate"] = True
+            self._unsaved += 1
+            row = dict(zip(self.fieldnames, values + [None] * (len(self.fieldnames) - len(values))))
+            event = row_to_event(row, self.index)
+            if self._unsaved >= self.checkpoint_every:
+                self.save_checkpoint()
             return event
-        return None 
\ No newline at end of file
+
+    def get_events(self, max_events):
+        # Up to max_events events that are available now (possibly none)
+        events = []
+        while len(events) < max_events:
+            event = self.get_event()
+            if event is None:
+                break
+            events.append(event)
+        return events
+
+    def events(self):
+        # Lazily yield every event; when tailing, wait poll_interval for new rows instead of stopping
+        for batch in self.batches(1):
+            yield batch[0]
+
+    def batches(self, batch_size):
+        # Lazily yield lists of up to batch_size events; a short list is yielded at the current end of the file
+        while True:
+            batch = self.get_events(batch_size)
+            if batch:
+                yield batch
+            elif self.follow:
+                time.sleep(self.poll_interval)
+            else:
+                return
+
+    def close(self):
+        if self._unsaved:
+            self.save_checkpoint()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,133 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+
+from agentic.records import dumps
+
+# Logging off the hot path: every logger set up here hands its records to one in-memory queue
+# (QueueHandler), and a single background thread (QueueListener) formats them and does the
+# file / console writes. Calling threads only pay for building the record and the queue put.
+
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")  # json: one JSON object per line; text: "time level logger message"
+
+_queue = queue.SimpleQueue()
+_lock = threading.Lock()
+_listener = None
+_handlers = []  # handlers the background thread writes to
+_file_loggers = set()  # names of loggers that only write to their own file
+_console = None  # the handler installed by configure_logging
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, plus the record's ``fields`` (logger.info(..., extra={"fields": {...}}))."""
+
+    def format(self, record):
+        entry = {"ts": round(record.created, 6), "level": record.levelname, "logger": record.name, "msg": record.getMessage()}
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        try:
+            return dumps(entry).decode("utf-8")
+        except TypeError:
+            return json.dumps(entry, default=str)
+
+
+class _Listener(logging.handlers.QueueListener):
+    def handle(self, record):
+        # flush() queues an Event; everything queued before it has been written once it is set
+        if isinstance(record, threading.Event):
+            record.set()
+            return
+        super().handle(record)
+
+
+def _formatter(fmt=None):
+    if (fmt or LOG_FORMAT) == "text":
+        return logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
+    return JsonFormatter()
+
+
+def _add_handler(handler):
+    global _listener
+    with _lock:
+        _handlers.append(handler)
+        if _listener is None:
+            _listener = _Listener(_queue, respect_handler_level=True)
+            _listener.start()
+            atexit.register(stop)
+        _listener.handlers = tuple(_handlers)
+
+
+def _queued(logger):
+    # Route the logger's records through the shared queue instead of its own handlers
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(_queue))
+
+
+def file_logger(name, filename, level=logging.INFO, fmt=None, directory=None):
+    """Logger ``name`` whose records go, via the background writer, to ``directory``/``filename`` only (default LOG_DIR)."""
+    logger = logging.getLogger(name)
+    with _lock:
+        if name in _file_loggers:
+            return logger
+        _file_loggers.add(name)
+    directory = directory or LOG_DIR
+    os.makedirs(directory, exist_ok=True)
+    handler = logging.FileHandler(os.path.join(directory, filename), encoding="utf-8")
+    handler.setFormatter(_formatter(fmt))
+    handler.addFilter(lambda record: record.name == name)
+    _add_handler(handler)
+    _queued(logger)
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
+
+
+def configure_logging(level=None, fmt=None, stream=None):
+    """Send every other logger's records at ``level`` (default LOG_LEVEL) to ``stream`` (stdout) via the background writer.
+
+    Calling it again replaces the previous stream.
+    """
+    global _console
+    handler = logging.StreamHandler(stream or sys.stdout)
+    handler.setFormatter(_formatter(fmt))
+    handler.addFilter(lambda record: record.name not in _file_loggers)
+    with _lock:
+        if _console in _handlers:
+            _handlers.remove(_console)
+        _console = handler
+    _add_handler(handler)
+    root = logging.getLogger()
+    _queued(root)
+    root.setLevel(level or LOG_LEVEL)
+    return handler
+
+
+def flush(timeout=None):
+    # Block until everything queued so far has been written
+    with _lock:
+        listener = _listener
+    if listener is None:
+        return True
+    done = threading.Event()
+    _queue.put_nowait(done)
+    return done.wait(timeout)
+
+
+def stop():
+    # Write what is still queued and stop the background thread; registered to run at exit
+    global _listener
+    with _lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
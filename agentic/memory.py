@@ -1,15 +1,38 @@
-from typing import List, Dict, Any
+import threading
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional
+from agentic.records import HistoryEntry
 
 class Memory:
-    def __init__(self):
-        self.history: List[Dict[str, Any]] = []
-
-    def record(self, event: Dict[str, Any], actions: List[Dict[str, Any]], outcomes: List[Any]):
-        self.history.append({
-            'event': event,
-            'actions': actions,
-            'outcomes': outcomes
-        })
-
-    def get_history(self) -> List[Dict[str, Any]]:
-        return self.history 
\ No newline at end of file
+    # max_records / max_age (seconds) bound the in-process history; None keeps everything
+    def __init__(self, max_records: Optional[int] = None, max_age: Optional[float] = None, clock=time.monotonic):
+        self.history = deque(maxlen=max_records)
+        self.max_age = max_age
+        self.clock = clock
+        self._recorded_at = deque(maxlen=max_records)
+        # The worker records from several dispatcher threads at once
+        self._lock = threading.Lock()
+
+    def record(self, event: Dict[str, Any], actions: List[Dict[str, Any]], outcomes: List[Any]) -> HistoryEntry:
+        # Returns the new entry; history[-1] may already be another thread's by the time the caller reads it
+        entry = HistoryEntry.from_parts(event, actions, outcomes)
+        with self._lock:
+            self.history.append(entry)
+            self._recorded_at.append(self.clock())
+            self._expire()
+        return entry
+
+    def _expire(self):
+        # Caller holds _lock
+        if self.max_age is None:
+            return
+        cutoff = self.clock() - self.max_age
+        while self._recorded_at and self._recorded_at[0] < cutoff:
+            self._recorded_at.popleft()
+            self.history.popleft()
+
+    def get_history(self) -> List[HistoryEntry]:
+        with self._lock:
+            self._expire()
+            return list(self.history)
@@ -0,0 +1,172 @@
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+from typing import Dict, Iterable, Optional, Tuple
+
+# Pipeline metrics. Workers count into process-local histograms and counters and periodically
+# add what they counted to one Redis hash; the API renders that hash (summed over all workers)
+# as Prometheus text at /metrics.
+
+METRICS_KEY = "agentic:metrics"
+# Upper bounds (seconds) of the stage latency buckets; anything slower lands in +Inf
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+STAGES = {
+    "queue_wait": "Event queued by the API until fetched by a worker",
+    "decide": "Reasoning decide() for one event",
+    "decide_batch": "Reasoning decide_batch() for one worker batch",
+    "llm_call": "One LLM request, retries included",
+    "remediation_match": "remediation.yaml lookup for one event",
+    "effector_execute": "All effector calls for one event",
+    "history_write": "One pipelined history write (records or occurrence counts)",
+}
+COUNTERS = {
+    "events_processed_total": "Events decided and written to history",
+    "events_suppressed_total": "Events folded into an earlier decision by the suppression window",
+    "events_failed_total": "Events that could not be decoded or processed",
+    "llm_requests_total": "LLM requests sent",
+    "llm_errors_total": "LLM requests that failed after retries",
+    "llm_rejected_total": "LLM calls rejected by the open circuit breaker without a request",
+}
+
+
+class Metrics:
+    """Process-local stage histograms and counters, flushed to Redis as increments.
+
+    observe() and inc() only update in-memory lists under a lock, so they are
+    cheap enough for every event. flush() swaps the pending counts out and adds
+    them to METRICS_KEY with HINCRBY / HINCRBYFLOAT in one pipeline, so several
+    workers add into the same totals. Set enabled to False to make observe,
+    inc and timer no-ops.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = STAGE_BUCKETS, enabled: bool = True):
+        self.buckets = buckets
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages = {}  # stage -> [count per bucket..., +Inf count, sum of seconds], since the last flush
+        self._counters = {}  # name -> increment since the last flush
+
+    def observe(self, stage: str, seconds: float):
+        if not self.enabled:
+            return
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            row = self._stages.get(stage)
+            if row is None:
+                row = self._stages[stage] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += seconds
+
+    def inc(self, name: str, amount: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def timer(self, stage: str):
+        # with metrics.timer("decide"): ... observes the block's duration (exceptions included)
+        return _Timer(self, stage) if self.enabled else _NO_TIMER
+
+    def flush(self, client, key: str = METRICS_KEY) -> int:
+        # Add everything counted since the last flush to the Redis hash; returns the number of fields touched.
+        # If Redis fails the counts are put back so the next flush retries them.
+        with self._lock:
+            stages, counters = self._stages, self._counters
+            self._stages, self._counters = {}, {}
+        if not stages and not counters:
+            return 0
+        try:
+            return self._write(client, key, stages, counters)
+        except Exception:
+            self._merge(stages, counters)
+            raise
+
+    def _write(self, client, key, stages, counters):
+        pipe = client.pipeline(transaction=False)
+        fields = 0
+        for stage, row in stages.items():
+            for index, count in enumerate(row[:-1]):
+                if count:
+                    pipe.hincrby(key, f"stage:{stage}:bucket:{index}", count)
+                    fields += 1
+            pipe.hincrby(key, f"stage:{stage}:count", sum(row[:-1]))
+            pipe.hincrbyfloat(key, f"stage:{stage}:sum", row[-1])
+            fields += 2
+        for name, amount in counters.items():
+            pipe.hincrby(key, f"counter:{name}", amount)
+            fields += 1
+        pipe.execute()
+        return fields
+
+    def _merge(self, stages, counters):
+        with self._lock:
+            for stage, row in stages.items():
+                current = self._stages.setdefault(stage, [0] * (len(self.buckets) + 1) + [0.0])
+                for index, value in enumerate(row):
+                    current[index] += value
+            for name, amount in counters.items():
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+
+class _Timer:
+    # A plain class rather than @contextmanager: a generator per block costs several times more
+    __slots__ = ("metrics", "stage", "start")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.stage, time.perf_counter() - self.start)
+
+
+_NO_TIMER = nullcontext()
+
+
+def _number(value) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+
+def render_prometheus(fields: Dict[str, str], buckets: Tuple[float, ...] = STAGE_BUCKETS,
+                      gauges: Optional[Iterable[Tuple[str, str, float]]] = None, prefix: str = "agentic_") -> str:
+    """Prometheus text exposition of a METRICS_KEY hash plus (name, help, value) gauges."""
+    stages, counters = {}, {}
+    for field, value in fields.items():
+        kind, _, rest = field.partition(":")
+        if kind == "counter":
+            counters[rest] = value
+        elif kind == "stage":
+            stage, _, part = rest.partition(":")
+            stages.setdefault(stage, {})[part] = value
+    lines = []
+    for name in sorted(set(COUNTERS) | set(counters)):
+        lines.append(f"# HELP {prefix}{name} {COUNTERS.get(name, name)}")
+        lines.append(f"# TYPE {prefix}{name} counter")
+        lines.append(f"{prefix}{name} {_number(counters.get(name, 0))}")
+    family = f"{prefix}stage_duration_seconds"
+    lines.append(f"# HELP {family} Latency of each pipeline stage ({'; '.join(f'{s}: {h}' for s, h in STAGES.items())})")
+    lines.append(f"# TYPE {family} histogram")
+    for stage in sorted(stages):
+        values = stages[stage]
+        cumulative = 0
+        for index, bound in enumerate(buckets):
+            cumulative += int(values.get(f"bucket:{index}", 0))
+            lines.append(f'{family}_bucket{{stage="{stage}",le="{bound:g}"}} {cumulative}')
+        cumulative += int(values.get(f"bucket:{len(buckets)}", 0))
+        lines.append(f'{family}_bucket{{stage="{stage}",le="+Inf"}} {cumulative}')
+        lines.append(f'{family}_sum{{stage="{stage}"}} {_number(values.get("sum", 0))}')
+        lines.append(f'{family}_count{{stage="{stage}"}} {int(values.get("count", 0))}')
+    for name, help_text, value in gauges or ():
+        lines.append(f"# HELP {prefix}{name} {help_text}")
+        lines.append(f"# TYPE {prefix}{name} gauge")
+        lines.append(f"{prefix}{name} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()  # the process-wide instance the worker, reasoning module and LLM client count into
@@ -1,22 +1,122 @@
 from agentic.base import ReasoningModule
-from typing import Dict, Any, List
-from llm.llama3_client import Llama3Client
+from typing import Dict, Any, List, NamedTuple
+from llm.llama3_client import Llama3Client, is_llm_error
+from agentic.reasoning_simple import SimpleReasoningModule
+import threading
 import yaml
 from feedback.store import get_feedback
 from feedback.adapter import enrich_prompt_with_feedback
-from remediation.engine import load_remediation_rules, find_remediation_action
+from remediation.engine import load_remediation_rules, compile_remediation_rules, find_remediation_action, DEFAULT_RULES_PATH
+from agentic.decision_cache import build_decision_cache, decision_key, feedback_version
+from agentic.metrics import metrics
+
+ESCALATE_TIER = 'escalation'
+REMEDIATION_TIER = 'remediation'
+RULES_TIER = 'rules'
+CACHE_TIER = 'cache'
+LLM_TIER = 'llm'
+FALLBACK_TIER = 'fallback'
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _as_list(value):
+    return [str(v).lower() for v in (value if isinstance(value, list) else [value])]
+
+def fast_path_rule_matches(match: Dict[str, Any], event: Dict[str, Any]) -> bool:
+    # Each key is optional; status/event_type/source accept a value or a list of values
+    details = event.get('details') or {}
+    fields = {
+        'status': event.get('status'),
+        'event_type': event.get('event_type'),
+        'source': details.get('source'),
+    }
+    for key, actual in fields.items():
+        if key in match and str(actual).lower() not in _as_list(match[key]):
+            return False
+    needle = match.get('description_contains')
+    if needle is not None and str(needle).lower() not in str(details.get('description') or '').lower():
+        return False
+    return True
+
+class FastPath(NamedTuple):
+    enabled: bool
+    rules: List[Dict[str, Any]]
+
+def build_fast_path(config: Dict[str, Any]) -> FastPath:
+    # Validate the reasoning.fast_path section; raises ValueError so a bad reload keeps the old one
+    section = (config.get('reasoning') or {}).get('fast_path') or {}
+    rules = section.get('rules') or []
+    for rule in rules:
+        if not isinstance(rule, dict) or not isinstance(rule.get('match', {}), dict):
+            raise ValueError(f"fast_path rule needs a 'match' mapping: {rule!r}")
+        if rule.get('decision', 'notify') not in ('notify', 'escalate'):
+            raise ValueError(f"fast_path decision must be 'notify' or 'escalate': {rule!r}")
+    return FastPath(bool(section.get('enabled', False)), list(rules))
 
 class LLMReasoningModule(ReasoningModule):
-    def __init__(self, config_path='config.yaml'):
+    def __init__(self, config_path='config.yaml', rules_path=None):
+        self.config_path = config_path
+        self.rules_path = rules_path or DEFAULT_RULES_PATH
         with open(config_path, 'r') as f:
             config = yaml.safe_load(f)
         self.llm_client = Llama3Client(config)
-        self.remediation_rules = load_remediation_rules()
+        self.remediation_rules = compile_remediation_rules(load_remediation_rules(self.rules_path))
+        self.cache = build_decision_cache(config.get('reasoning', {}).get('decision_cache'))
+        # Max events packed into one LLM request by decide_batch (1 disables batching)
+        self.batch_size = config['llm'].get('batch_size', 8)
+        # Rule-based path used when the model is down or the circuit breaker is open
+        self.fallback = SimpleReasoningModule()
+        self.llm_fallbacks = 0
+        # Rule-first fast path: settle events deterministically before consulting the LLM
+        self.fast_path = build_fast_path(config)
+        self.tier_counts = {tier: 0 for tier in (ESCALATE_TIER, REMEDIATION_TIER, RULES_TIER, CACHE_TIER, LLM_TIER, FALLBACK_TIER)}
+        self._stats_lock = threading.Lock()
 
-    def decide(self, event: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def reload_rules(self):
+        # Compile first so a broken remediation.yaml raises and the running rule set stays in place
+        self.remediation_rules = compile_remediation_rules(load_remediation_rules(self.rules_path))
+        return len(self.remediation_rules)
+
+    def reload_config(self):
+        # Re-read the hot-reloadable parts of config.yaml: fast path rules, batching,
+        # LLM prompts/timeouts/retries and cache limits. Everything is validated before anything is swapped.
+        with open(self.config_path, 'r') as f:
+            config = yaml.safe_load(f)
+        if not isinstance(config, dict) or not isinstance(config.get('llm'), dict):
+            raise ValueError(f"{self.config_path} has no 'llm' section")
+        fast_path = build_fast_path(config)
+        batch_size = int(config['llm'].get('batch_size', 8))
+        apply_llm_settings = self.llm_client.prepare_settings(config['llm'])
+        cache_config = (config.get('reasoning') or {}).get('decision_cache') or {}
+        if self.cache is not None:
+            max_entries = cache_config.get('max_entries', self.cache.max_entries)
+            ttl_seconds = cache_config.get('ttl_seconds', self.cache.ttl_seconds)
+            if not _is_number(max_entries) or int(max_entries) != max_entries or max_entries < 0:
+                raise ValueError(f"decision_cache max_entries must be a whole number >= 0: {max_entries!r}")
+            if not _is_number(ttl_seconds) or ttl_seconds <= 0:
+                raise ValueError(f"decision_cache ttl_seconds must be a positive number: {ttl_seconds!r}")
+        self.fast_path = fast_path
+        self.batch_size = batch_size
+        apply_llm_settings()
+        if self.cache is not None:
+            self.cache.resize(int(max_entries), ttl_seconds)
+
+    def _count(self, tier):
+        with self._stats_lock:
+            self.tier_counts[tier] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = {'tiers': dict(self.tier_counts)}
+        if self.cache is not None:
+            stats['decision_cache'] = self.cache.stats()
+        return stats
+
+    def _log_text(self, event: Dict[str, Any]) -> str:
         # Compose a detailed log or event description for the LLM
         details = event.get('details', {})
-        log_text = (
+        return (
             f"Job ID: {event.get('job_id')}\n"
             f"Status: {event.get('status')}\n"
             f"Event Type: {event.get('event_type')}\n"
@@ -24,12 +124,120 @@ class LLMReasoningModule(ReasoningModule):
             f"Source: {details.get('source')}\n"
             f"Description: {details.get('description')}"
         )
+
+    def _remediation(self, event: Dict[str, Any]):
+        with metrics.timer("remediation_match"):
+            return find_remediation_action(event, self.remediation_rules)
+
+    def _settle(self, event: Dict[str, Any], remediation_action):
+        # Returns a synthetic suggestion when a deterministic tier decides the outcome, else None
+        fast_path = self.fast_path
+        if not fast_path.enabled:
+            return None
+        if event.get('escalate') is True or str(event.get('status', '')).lower() == 'escalate':
+            self._count(ESCALATE_TIER)
+            return 'escalate'
+        if remediation_action:
+            self._count(REMEDIATION_TIER)
+            return ''
+        for rule in fast_path.rules:
+            if fast_path_rule_matches(rule.get('match') or {}, event):
+                self._count(RULES_TIER)
+                return rule.get('decision', 'notify')
+        return None
+
+    def decide(self, event: Dict[str, Any], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        remediation_action = self._remediation(event)
+        suggestion = self._settle(event, remediation_action)
+        if suggestion is not None:
+            return self._actions_for(event, suggestion, remediation_action)
+        log_text = self._log_text(event)
         # Retrieve feedback for similar events
         feedback_list = get_feedback(event)
-        # Enrich prompt with feedback
-        prompt = enrich_prompt_with_feedback(f"{self.llm_client.prompt_template}\n{log_text}", feedback_list)
-        # Call LLM for suggestion
-        suggestion = self.llm_client.analyze_log(prompt, job_id=event.get('job_id'))
+        if self.cache is not None:
+            cache_key = decision_key(event)
+            version = feedback_version(event, feedback_list)
+            suggestion = self.cache.get(cache_key, version)
+            if suggestion is not None:
+                self._count(CACHE_TIER)
+        if suggestion is None:
+            self._count(LLM_TIER)
+            # Enrich prompt with feedback
+            prompt = enrich_prompt_with_feedback(f"{self.llm_client.prompt_template}\n{log_text}", feedback_list)
+            # Call LLM for suggestion
+            # With a cache, identical in-flight events also share one LLM request
+            coalesce_key = (cache_key, version) if self.cache is not None else None
+            suggestion = self.llm_client.analyze_log(prompt, job_id=event.get('job_id'), coalesce_key=coalesce_key)
+            if self.cache is not None and not is_llm_error(suggestion):
+                self.cache.put(cache_key, version, suggestion)
+        return self._actions_for(event, suggestion, remediation_action)
+
+    def decide_batch(self, events: List[Dict[str, Any]], context: Dict[str, Any]) -> List[List[Dict[str, Any]]]:
+        # Like decide, but cache misses are classified together in as few LLM requests as possible
+        if len(events) == 1 or self.batch_size <= 1:
+            return [self.decide(event, context) for event in events]
+        remediations = [self._remediation(event) for event in events]
+        suggestions = [self._settle(event, remediation) for event, remediation in zip(events, remediations)]
+        pending = []  # (index, log_text, cache_key, version)
+        duplicates = {}  # index -> index of an identical pending event in this batch
+        first_pending = {}
+        for i, event in enumerate(events):
+            if suggestions[i] is not None:
+                continue
+            feedback_list = get_feedback(event)
+            cache_key = version = None
+            if self.cache is not None:
+                cache_key = decision_key(event)
+                version = feedback_version(event, feedback_list)
+                if (cache_key, version) in first_pending:
+                    duplicates[i] = first_pending[(cache_key, version)]
+                    self._count(CACHE_TIER)
+                    continue
+                suggestions[i] = self.cache.get(cache_key, version)
+                if suggestions[i] is not None:
+                    self._count(CACHE_TIER)
+            if suggestions[i] is None:
+                self._count(LLM_TIER)
+                if self.cache is not None:
+                    first_pending[(cache_key, version)] = i
+                pending.append((i, enrich_prompt_with_feedback(self._log_text(event), feedback_list), cache_key, version))
+        for start in range(0, len(pending), self.batch_size):
+            chunk = pending[start:start + self.batch_size]
+            results = self.llm_client.analyze_logs(
+                [text for _, text, _, _ in chunk],
+                job_ids=[events[i].get('job_id') for i, _, _, _ in chunk],
+            )
+            for (i, _, cache_key, version), suggestion in zip(chunk, results):
+                suggestions[i] = suggestion
+                if self.cache is not None and not is_llm_error(suggestion):
+                    self.cache.put(cache_key, version, suggestion)
+        for i, source in duplicates.items():
+            suggestions[i] = suggestions[source]
+        return [
+            self._actions_for(event, suggestion, remediation)
+            for event, suggestion, remediation in zip(events, suggestions, remediations)
+        ]
+
+    def _rule_based_actions(self, event: Dict[str, Any], remediation_action) -> List[Dict[str, Any]]:
+        self.llm_fallbacks += 1
+        self._count(FALLBACK_TIER)
+        actions = self.fallback.decide(event, {})
+        if event.get('escalate') is True or str(event.get('status', '')).lower() == 'escalate':
+            for action in actions:
+                action['params']['escalation'] = True
+        if remediation_action:
+            actions.append({
+                'type': 'remediate',
+                'params': {
+                    'job': event,
+                    'remediation': remediation_action
+                }
+            })
+        return actions
+
+    def _actions_for(self, event: Dict[str, Any], suggestion: str, remediation_action) -> List[Dict[str, Any]]:
+        if is_llm_error(suggestion):
+            return self._rule_based_actions(event, remediation_action)
         actions = []
         # Escalation logic: escalate if LLM says so, or if event has escalate True or status 'escalate'
         escalate = (
@@ -54,7 +262,6 @@ class LLMReasoningModule(ReasoningModule):
                 }
             })
         # Configurable remediation logic
-        remediation_action = find_remediation_action(event, self.remediation_rules)
         if remediation_action:
             actions.append({
                 'type': 'remediate',
@@ -72,4 +279,4 @@ class LLMReasoningModule(ReasoningModule):
                     'escalation': False
                 }
             })
-        return actions 
\ No newline at end of file
+        return actions
@@ -0,0 +1,165 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+try:
+    import orjson
+except ImportError:  # optional: plain json is used when orjson is not installed
+    orjson = None
+    import json
+
+# Typed, slotted forms of the event / action / history dicts used across the agent,
+# worker and API, plus the Redis wire format. Reasoning modules and effectors still
+# exchange plain dicts; records are built when an event is stored in history, where
+# each action refers to its event by event_id instead of carrying a copy of it.
+
+
+def new_event_id():
+    return uuid.uuid4().hex
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def dumps(value) -> bytes:
+        return orjson.dumps(value, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(value) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    loads = json.loads
+
+
+@dataclass(slots=True)
+class Event:
+    job_id: Any
+    status: Optional[str]
+    event_type: Optional[str] = "job_issue"
+    details: Optional[Dict[str, Any]] = None
+    event_id: Optional[str] = None
+    escalate: Optional[bool] = None
+    extra: Dict[str, Any] = field(default_factory=dict)  # any other keys, kept as-is
+
+    FIELDS = ('job_id', 'status', 'event_type', 'details', 'event_id', 'escalate')
+
+    @classmethod
+    def from_dict(cls, event: Dict[str, Any]) -> "Event":
+        return cls(
+            job_id=event.get('job_id'),
+            status=event.get('status'),
+            event_type=event.get('event_type'),
+            details=event.get('details'),
+            event_id=event.get('event_id'),
+            escalate=event.get('escalate'),
+            extra={k: v for k, v in event.items() if k not in cls.FIELDS},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        event = {'job_id': self.job_id, 'status': self.status}
+        if self.event_type is not None:
+            event['event_type'] = self.event_type
+        if self.details is not None:
+            event['details'] = self.details
+        if self.event_id is not None:
+            event['event_id'] = self.event_id
+        if self.escalate is not None:
+            event['escalate'] = self.escalate
+        event.update(self.extra)
+        return event
+
+
+@dataclass(slots=True)
+class Action:
+    type: str
+    event_id: Optional[str] = None
+    escalation: Optional[bool] = None
+    remediation: Optional[str] = None
+    params: Dict[str, Any] = field(default_factory=dict)  # any other params
+
+    @classmethod
+    def from_dict(cls, action: Dict[str, Any], event: Optional[Event] = None, source: Optional[Dict[str, Any]] = None) -> "Action":
+        # source is the event dict the action was decided for; an embedded copy of it becomes a reference
+        params = dict(action.get('params') or {})
+        job = params.pop('job', None)
+        event_id = params.pop('event_id', None)
+        if job is not None and event is not None and (job is source or job == source):
+            event_id = event.event_id
+        elif job is not None:
+            params['job'] = job
+        return cls(
+            type=action.get('type'),
+            event_id=event_id,
+            escalation=params.pop('escalation', None),
+            remediation=params.pop('remediation', None),
+            params=params,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        params = {}
+        if self.event_id is not None:
+            params['event_id'] = self.event_id
+        if self.escalation is not None:
+            params['escalation'] = self.escalation
+        if self.remediation is not None:
+            params['remediation'] = self.remediation
+        params.update(self.params)
+        return {'type': self.type, 'params': params}
+
+
+@dataclass(slots=True)
+class HistoryEntry:
+    event: Event
+    actions: List[Action]
+    outcomes: List[Any]
+    feedback: Optional[Dict[str, Any]] = None
+    id: Optional[int] = None
+    processed_at: Optional[float] = None
+    occurrences: int = 1  # identical events this decision stands for (see agentic.suppression)
+
+    @property
+    def event_id(self):
+        return self.event.event_id
+
+    @classmethod
+    def from_parts(cls, event: Dict[str, Any], actions: List[Dict[str, Any]], outcomes: List[Any]) -> "HistoryEntry":
+        record = Event.from_dict(event)
+        if record.event_id is None:
+            record.event_id = new_event_id()
+        return cls(event=record, actions=[Action.from_dict(a, record, event) for a in actions], outcomes=list(outcomes))
+
+    @classmethod
+    def from_dict(cls, record: Dict[str, Any]) -> "HistoryEntry":
+        source = record.get('event') or {}
+        event = Event.from_dict(source)
+        if event.event_id is None:
+            event.event_id = record.get('event_id') or new_event_id()
+        return cls(
+            event=event,
+            actions=[Action.from_dict(a, event, source) for a in record.get('actions') or []],
+            outcomes=list(record.get('outcomes') or []),
+            feedback=record.get('feedback'),
+            id=record.get('id'),
+            processed_at=record.get('processed_at'),
+            occurrences=record.get('occurrences', 1),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        record = {}
+        if self.id is not None:
+            record['id'] = self.id
+        record['event_id'] = self.event.event_id
+        if self.processed_at is not None:
+            record['processed_at'] = self.processed_at
+        if self.occurrences != 1:
+            record['occurrences'] = self.occurrences
+        record['event'] = self.event.to_dict()
+        record['actions'] = [action.to_dict() for action in self.actions]
+        record['outcomes'] = self.outcomes
+        if self.feedback is not None:
+            record['feedback'] = self.feedback
+        return record
+
+    def is_escalated(self) -> bool:
+        return any(action.escalation is True for action in self.actions)
@@ -0,0 +1,108 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from feedback.store import event_hash
+
+
+def suppression_key(event: Dict[str, Any]):
+    # event_hash (type, source, description) plus status and job_id: a repeat of the same failure
+    # collapses, while an escalation or another job's failure still gets its own decision
+    return event_hash(event), event.get('status'), str(event.get('job_id'))
+
+
+@dataclass(slots=True)
+class Leader:
+    # The event that was decided for a key, and how many identical events its decision stands for
+    started_at: float
+    count: int = 1
+    entry: Any = None  # its HistoryEntry once recorded
+
+
+class EventSuppressor:
+    """Collapses identical events inside a time window into one decision.
+
+    The first event for a key is admitted and goes through reasoning and the
+    effectors as usual; identical events arriving within window_seconds of it
+    are suppressed and only bump its occurrence count. Once the window has
+    passed the next occurrence is admitted again, so a problem that keeps
+    firing is re-decided (and re-notified) once per window.
+
+    Leaders are kept in arrival order, which is also expiry order, so expired
+    ones are dropped from the front in O(1) and memory is bounded by the keys
+    seen in one window, capped at max_keys (oldest dropped first).
+    """
+
+    def __init__(self, window_seconds=60, max_keys=100000, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self.max_keys = max_keys
+        self.clock = clock
+        self._leaders = OrderedDict()  # key -> Leader, oldest first
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.suppressed = 0
+        self.evictions = 0
+
+    def _expire(self, now):
+        while self._leaders:
+            leader = next(iter(self._leaders.values()))
+            if leader.started_at + self.window_seconds > now:
+                break
+            self._leaders.popitem(last=False)
+
+    def admit(self, event: Dict[str, Any]) -> Optional[Leader]:
+        # None when the event should be decided; otherwise the Leader it was folded into
+        key = suppression_key(event)
+        now = self.clock()
+        with self._lock:
+            self._expire(now)
+            leader = self._leaders.get(key)
+            if leader is not None:
+                leader.count += 1
+                if leader.entry is not None:
+                    leader.entry.occurrences = leader.count
+                self.suppressed += 1
+                return leader
+            self._leaders[key] = Leader(started_at=now)
+            while len(self._leaders) > self.max_keys:
+                self._leaders.popitem(last=False)
+                self.evictions += 1
+            self.admitted += 1
+            return None
+
+    def attach(self, event: Dict[str, Any], entry):
+        # Link an admitted event to its history entry; duplicates counted meanwhile are carried over
+        with self._lock:
+            leader = self._leaders.get(suppression_key(event))
+            if leader is not None and leader.entry is None:
+                leader.entry = entry
+                entry.occurrences = leader.count
+
+    def release(self, event: Dict[str, Any], entry=None):
+        # Processing of an admitted event failed: forget it so the next occurrence is decided.
+        # Pass the entry it was attached to when the failure came after attach (e.g. the history write).
+        with self._lock:
+            key = suppression_key(event)
+            leader = self._leaders.get(key)
+            if leader is not None and (leader.entry is None or leader.entry is entry):
+                del self._leaders[key]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            seen = self.admitted + self.suppressed
+            return {
+                'tracked': len(self._leaders),
+                'admitted': self.admitted,
+                'suppressed': self.suppressed,
+                'evictions': self.evictions,
+                'suppression_ratio': round(self.suppressed / seen, 4) if seen else 0.0,
+            }
+
+
+def build_suppressor(window_seconds, max_keys=100000) -> Optional[EventSuppressor]:
+    # A window of 0 (or less) turns suppression off
+    if not window_seconds or window_seconds <= 0:
+        return None
+    return EventSuppressor(window_seconds=window_seconds, max_keys=max_keys)
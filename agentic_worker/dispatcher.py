@@ -0,0 +1,61 @@
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+class KeyedDispatcher:
+    """Runs tasks on a bounded thread pool, keeping tasks that share a key in order.
+
+    Tasks with different keys (e.g. different job_ids) run concurrently on up to
+    ``max_workers`` threads. Tasks with the same key are chained so the second
+    only starts once the first has finished. ``submit`` blocks once
+    ``max_pending`` tasks are queued or running, which gives the consumer loop
+    natural backpressure instead of draining Redis into an unbounded backlog.
+    """
+
+    def __init__(self, max_workers=4, max_pending=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agentic-worker")
+        self._slots = threading.BoundedSemaphore(max_pending or max_workers * 2)
+        self._lock = threading.Condition()
+        self._chains = {}  # key -> deque of (future, fn, args) waiting behind the running task
+
+    def submit(self, key, fn, *args):
+        self._slots.acquire()
+        future = Future()
+        with self._lock:
+            chain = self._chains.get(key)
+            if chain is None:
+                self._chains[key] = deque()
+            else:
+                chain.append((future, fn, args))
+                return future
+        self.executor.submit(self._run, key, future, fn, args)
+        return future
+
+    def _run(self, key, future, fn, args):
+        try:
+            if future.set_running_or_notify_cancel():
+                future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            self._slots.release()
+            with self._lock:
+                chain = self._chains[key]
+                nxt = chain.popleft() if chain else None
+                if nxt is None:
+                    del self._chains[key]
+                    if not self._chains:
+                        self._lock.notify_all()
+            if nxt is not None:
+                self.executor.submit(self._run, key, *nxt)
+
+    def join(self, timeout=None):
+        # Block until every submitted task (including chained ones) has finished
+        with self._lock:
+            return self._lock.wait_for(lambda: not self._chains, timeout=timeout)
+
+    def shutdown(self, wait=True):
+        if wait:
+            self.join()
+        self.executor.shutdown(wait=wait)
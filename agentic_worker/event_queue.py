@@ -0,0 +1,179 @@
+import hashlib
+import logging
+import os
+import socket
+import threading
+import time
+
+EVENT_QUEUE = "agentic:events"
+
+log = logging.getLogger("agentic_worker")
+
+
+class EventQueue:
+    """Blocking, batched consumer for the agentic:events list.
+
+    ``fetch`` blocks on BLPOP for at most ``max_wait`` seconds, then drains up to
+    ``max_batch - 1`` further events with a single LPOP COUNT, so an idle worker
+    wakes up as soon as an event arrives and a busy one pays two Redis round
+    trips per batch instead of one per event.
+    """
+
+    def __init__(self, client, name=EVENT_QUEUE, max_batch=32, max_wait=1.0):
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.client = client
+        self.name = name
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+    def fetch(self):
+        # Returns a list of raw JSON payloads (possibly empty on timeout)
+        item = self.client.blpop(self.name, timeout=self.max_wait)
+        if item is None:
+            return []
+        batch = [item[1]]
+        if self.max_batch > 1:
+            rest = self.client.lpop(self.name, self.max_batch - 1)
+            if rest:
+                batch.extend(rest)
+        return batch
+
+    def ack(self, payload):
+        # Plain lists have nothing in flight; subclasses may track delivery
+        pass
+
+    def nack(self, payload):
+        # Failed events are dropped, as with the original lpop loop
+        pass
+
+    def reap(self):
+        return 0
+
+
+class ReliableEventQueue(EventQueue):
+    """At-least-once variant of EventQueue for running many workers safely.
+
+    Fetched events are moved atomically (BLMOVE/LMOVE) into a per-worker
+    processing list instead of being popped, and only removed from it by
+    ``ack``. Each worker keeps a heartbeat key alive with a TTL of
+    ``visibility_timeout``; ``reap`` moves the in-flight entries of workers whose
+    heartbeat has expired back to the head of the queue. Every redelivery bumps
+    an attempt counter and entries that reach ``max_attempts`` are moved to the
+    dead-letter list instead of being handed out again.
+
+    Attempt counters are keyed by the payload's digest, not by delivery, so
+    byte-identical payloads in flight at the same time share one counter. The
+    API gives every event its own event_id, so this only affects duplicates
+    pushed straight onto the list. ``ack`` keeps the counter while another copy
+    is still in this worker's processing list.
+    """
+
+    def __init__(self, client, name=EVENT_QUEUE, worker_id=None, max_batch=32, max_wait=1.0,
+                 visibility_timeout=60, max_attempts=5):
+        super().__init__(client, name, max_batch=max_batch, max_wait=max_wait)
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.processing = f"{name}:processing:{self.worker_id}"
+        self.workers_key = f"{name}:workers"
+        self.attempts_key = f"{name}:attempts"
+        self.dead_letter = f"{name}:dead"
+        self._heartbeat_thread = None
+
+    def _heartbeat_key(self, worker_id):
+        return f"{self.name}:heartbeat:{worker_id}"
+
+    @staticmethod
+    def _digest(payload):
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def heartbeat(self):
+        pipe = self.client.pipeline(transaction=False)
+        pipe.sadd(self.workers_key, self.worker_id)
+        pipe.set(self._heartbeat_key(self.worker_id), int(time.time()), ex=self.visibility_timeout)
+        pipe.execute()
+
+    def start_heartbeat(self, interval=None):
+        # Keep the heartbeat alive from a daemon thread so long LLM calls don't look like a crash
+        interval = interval or max(1.0, self.visibility_timeout / 3)
+
+        def beat():
+            while True:
+                try:
+                    self.heartbeat()
+                except Exception as e:
+                    log.error("Heartbeat failed: %s", e)
+                time.sleep(interval)
+
+        self.heartbeat()
+        self._heartbeat_thread = threading.Thread(target=beat, name="agentic-heartbeat", daemon=True)
+        self._heartbeat_thread.start()
+
+    def fetch(self):
+        item = self.client.blmove(self.name, self.processing, self.max_wait, "LEFT", "RIGHT")
+        if item is None:
+            return []
+        batch = [item]
+        if self.max_batch > 1:
+            pipe = self.client.pipeline(transaction=False)
+            for _ in range(self.max_batch - 1):
+                pipe.lmove(self.name, self.processing, "LEFT", "RIGHT")
+            batch.extend(p for p in pipe.execute() if p is not None)
+        return self._drop_exhausted(batch)
+
+    def _drop_exhausted(self, batch):
+        # Dead-letter entries that have already been delivered max_attempts times
+        attempts = self.client.hmget(self.attempts_key, [self._digest(p) for p in batch])
+        live = []
+        for payload, count in zip(batch, attempts):
+            if count is not None and int(count) >= self.max_attempts:
+                if self.client.lrem(self.processing, 1, payload):
+                    pipe = self.client.pipeline(transaction=True)
+                    pipe.rpush(self.dead_letter, payload)
+                    pipe.hdel(self.attempts_key, self._digest(payload))
+                    pipe.execute()
+                    log.warning("Dead-lettered event after %s attempts: %s", count, payload)
+            else:
+                live.append(payload)
+        return live
+
+    def ack(self, payload):
+        pipe = self.client.pipeline(transaction=True)
+        pipe.lrem(self.processing, 1, payload)
+        pipe.lpos(self.processing, payload)
+        _, other_copy = pipe.execute()
+        if other_copy is None:
+            self.client.hdel(self.attempts_key, self._digest(payload))
+
+    def nack(self, payload):
+        # Whoever removes the entry from the processing list owns the redelivery
+        if self.client.lrem(self.processing, 1, payload):
+            pipe = self.client.pipeline(transaction=True)
+            pipe.hincrby(self.attempts_key, self._digest(payload), 1)
+            pipe.rpush(self.name, payload)
+            pipe.execute()
+
+    def _requeue_all(self, processing):
+        # Move in-flight entries back to the head of the queue, oldest first
+        moved = 0
+        while True:
+            payload = self.client.lmove(processing, self.name, "RIGHT", "LEFT")
+            if payload is None:
+                return moved
+            self.client.hincrby(self.attempts_key, self._digest(payload), 1)
+            moved += 1
+
+    def recover(self):
+        # On startup, re-queue anything this worker id left in flight before a crash
+        return self._requeue_all(self.processing)
+
+    def reap(self):
+        # Re-queue the in-flight entries of workers whose heartbeat has expired
+        moved = 0
+        for worker_id in self.client.smembers(self.workers_key):
+            if worker_id == self.worker_id or self.client.exists(self._heartbeat_key(worker_id)):
+                continue
+            moved += self._requeue_all(f"{self.name}:processing:{worker_id}")
+            self.client.srem(self.workers_key, worker_id)
+        return moved
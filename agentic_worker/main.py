@@ -1,12 +1,22 @@
 import os
 import redis
 import json
+import logging
 import time
 from agentic.agent import Agent
 from agentic.sensor_sim import SimulatedSensor
 from agentic.memory import Memory
 from agentic.reasoning_llm import LLMReasoningModule
+from notifications import notifier
 from notifications.notifier import NotifierEffector
+from agentic_worker.event_queue import EventQueue, ReliableEventQueue, EVENT_QUEUE
+from agentic_worker.dispatcher import KeyedDispatcher
+from agentic.hot_reload import FileWatcher
+from agentic.suppression import build_suppressor
+from agentic.metrics import metrics
+from agentic.log import configure_logging
+from history.store import write_records, write_occurrences
+from history.archive import SegmentArchive, apply_retention
 
 # Redis connection (configurable via env)
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
@@ -14,38 +24,311 @@ REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
 redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
 
-EVENT_QUEUE = "agentic:events"
-HISTORY_LIST = "agentic:history"
+# Consumer tuning: max events drained per round trip and max seconds to block when idle
+WORKER_MAX_BATCH = int(os.getenv("WORKER_MAX_BATCH", 32))
+WORKER_MAX_WAIT = float(os.getenv("WORKER_MAX_WAIT", 1.0))
+# Events processed concurrently (1 = sequential); events for the same job_id always run in order
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", 4))
+# Reliable mode: in-flight list per worker, ack on completion, re-queue/dead-letter on failure
+WORKER_RELIABLE_QUEUE = os.getenv("WORKER_RELIABLE_QUEUE", "0") == "1"
+WORKER_ID = os.getenv("WORKER_ID")  # Defaults to <hostname>-<pid>; set a stable id (e.g. pod name) to recover after restarts
+WORKER_VISIBILITY_TIMEOUT = int(os.getenv("WORKER_VISIBILITY_TIMEOUT", 60))
+WORKER_MAX_ATTEMPTS = int(os.getenv("WORKER_MAX_ATTEMPTS", 5))
+WORKER_REAP_INTERVAL = float(os.getenv("WORKER_REAP_INTERVAL", 15))
+# Seconds between checks of config.yaml / remediation.yaml for hot reload (0 disables)
+WORKER_RELOAD_INTERVAL = float(os.getenv("WORKER_RELOAD_INTERVAL", 5))
+# In-process history kept by the agent; Redis holds the full record
+WORKER_MEMORY_MAX_RECORDS = int(os.getenv("WORKER_MEMORY_MAX_RECORDS", 1000))
+# Redis history retention (0 = unlimited); evicted records go to gzip segments in HISTORY_ARCHIVE_DIR (empty = drop them)
+HISTORY_MAX_RECORDS = int(os.getenv("HISTORY_MAX_RECORDS", 1000000))
+HISTORY_MAX_AGE = float(os.getenv("HISTORY_MAX_AGE", 0))
+HISTORY_ARCHIVE_DIR = os.getenv("HISTORY_ARCHIVE_DIR", "archive/history")
+HISTORY_RETENTION_INTERVAL = float(os.getenv("HISTORY_RETENTION_INTERVAL", 300))
+# Identical events (same event_hash, status and job_id) within this many seconds share one decision (0 disables)
+WORKER_SUPPRESSION_WINDOW = float(os.getenv("WORKER_SUPPRESSION_WINDOW", 60))
+WORKER_SUPPRESSION_MAX_KEYS = int(os.getenv("WORKER_SUPPRESSION_MAX_KEYS", 100000))
+# Seconds to wait for one effector call before recording it as timed out (0 = wait indefinitely)
+WORKER_EFFECTOR_TIMEOUT = float(os.getenv("WORKER_EFFECTOR_TIMEOUT", 30))
+# Per-stage latency histograms and counters, added to the agentic:metrics hash every interval (served by the API at /metrics)
+WORKER_METRICS = os.getenv("WORKER_METRICS", "1") == "1"
+WORKER_METRICS_INTERVAL = float(os.getenv("WORKER_METRICS_INTERVAL", 5))
+# Rich console rendering of notifications (off: they are logged as JSON lines like everything else, see agentic.log)
+WORKER_RICH_CONSOLE = os.getenv("WORKER_RICH_CONSOLE", "0") == "1"
+
+log = logging.getLogger("agentic_worker")
 
 # Set up the agentic system (can be extended to use real sensors/effectors)
 sensor = SimulatedSensor()  # Not used directly in worker, but agentic core expects it
 reasoning = LLMReasoningModule()
 effector = NotifierEffector()
-memory = Memory()
-agent = Agent(sensors=[sensor], effectors=[effector], reasoning_module=reasoning, memory=memory)
-
-def process_event(event_dict):
-    # Run the agentic reasoning/action for a single event
-    actions = agent.reasoning_module.decide(event_dict, agent.context)
-    outcomes = []
-    for action in actions:
-        for effector in agent.effectors:
-            outcome = effector.execute(action['type'], action.get('params', {}))
-            outcomes.append(outcome)
-    agent.memory.record(event_dict, actions, outcomes)
-    # Write to Redis history
-    redis_client.rpush(HISTORY_LIST, json.dumps(agent.memory.history[-1]))
+memory = Memory(max_records=WORKER_MEMORY_MAX_RECORDS or None)
+archive = SegmentArchive(HISTORY_ARCHIVE_DIR) if HISTORY_ARCHIVE_DIR else None
+suppressor = build_suppressor(WORKER_SUPPRESSION_WINDOW, WORKER_SUPPRESSION_MAX_KEYS)
+agent = Agent(
+    sensors=[sensor], effectors=[effector], reasoning_module=reasoning, memory=memory, suppressor=suppressor,
+    effector_timeout=WORKER_EFFECTOR_TIMEOUT or None,
+)
+
+metrics.enabled = WORKER_METRICS
+notifier.rich_console = WORKER_RICH_CONSOLE
+
+def load_event(event_json):
+    # Decode one queue payload; valid JSON that is not an object is rejected like undecodable JSON
+    event_dict = json.loads(event_json)
+    if not isinstance(event_dict, dict):
+        raise ValueError(f"event payload is not a JSON object: {event_json[:200]!r}")
+    return event_dict
+
+def observe_queue_wait(event_dict):
+    # The API stamps enqueued_at on the events it queues; it only feeds the queue_wait metric
+    enqueued_at = event_dict.pop('enqueued_at', None)
+    if isinstance(enqueued_at, (int, float)):
+        metrics.observe("queue_wait", max(0.0, time.time() - enqueued_at))
+
+def admit(event_dict):
+    # The suppression leader this event was folded into, or None when it has to be decided
+    return agent.suppressor.admit(event_dict) if agent.suppressor is not None else None
+
+def handle_event(event_dict, actions=None):
+    # Run the agentic reasoning/action for a single (admitted) event and return its history record
+    try:
+        if actions is None:
+            with metrics.timer("decide"):
+                actions = agent.reasoning_module.decide(event_dict, agent.context)
+        with metrics.timer("effector_execute"):
+            outcomes = agent.execute_actions(actions)
+    except Exception:
+        if agent.suppressor is not None:
+            agent.suppressor.release(event_dict)
+        raise
+    record = agent.memory.record(event_dict, actions, outcomes)
+    if agent.suppressor is not None:
+        agent.suppressor.attach(event_dict, record)
+    return record
+
+def suppressed_ids(event_dicts):
+    return [event_dict['event_id'] for event_dict in event_dicts if event_dict.get('event_id')]
+
+def leader_written(leader):
+    # A repeat can only be folded into a leader whose record is in Redis; otherwise it is retried
+    return leader.entry is not None and leader.entry.id is not None
+
+def release_records(written):
+    # The history write failed: the suppression window must not fold later repeats into these records
+    if agent.suppressor is not None:
+        for _, event_dict, record in written:
+            agent.suppressor.release(event_dict, record)
+
+def process_event(event_dict, redis_conn=None, actions=None):
+    record_event(event_dict, admit(event_dict), actions, redis_conn)
+
+def record_event(event_dict, leader, actions=None, redis_conn=None):
+    # Act on an event admit() has already seen (leader is what it returned) and write its history
+    if leader is not None:
+        if not leader_written(leader):
+            raise RuntimeError("the decision this event repeats has not been written to history yet")
+        # Same event already decided in this window: only its record's occurrence count changes
+        with metrics.timer("history_write"):
+            write_occurrences(redis_conn or redis_client, [(leader.entry, suppressed_ids([event_dict]))])
+        metrics.inc("events_suppressed_total")
+        return
+    record = handle_event(event_dict, actions)
+    # Write to Redis history (record + query indexes, see history.store)
+    try:
+        with metrics.timer("history_write"):
+            write_records(redis_conn or redis_client, [record])
+    except Exception:
+        release_records([(None, event_dict, record)])
+        raise
+    metrics.inc("events_processed_total")
+
+def process_batch(payloads, queue=None):
+    # Run a batch of raw queue payloads through handle_event, writing history in one pipelined round trip
+    decoded = []
+    folded = {}  # id(leader) -> (leader, [(event_json, event_dict)]) for events the suppression window absorbed
+    for event_json in payloads:
+        try:
+            event_dict = load_event(event_json)
+            observe_queue_wait(event_dict)
+            leader = admit(event_dict)
+        except Exception as e:
+            log.error("Error processing event: %s", e)
+            metrics.inc("events_failed_total")
+            if queue is not None:
+                queue.nack(event_json)
+            continue
+        if leader is None:
+            decoded.append((event_json, event_dict))
+        else:
+            folded.setdefault(id(leader), (leader, []))[1].append((event_json, event_dict))
+    # Decide on the whole batch at once so the LLM sees several events per request
+    try:
+        with metrics.timer("decide_batch"):
+            decisions = agent.reasoning_module.decide_batch([event_dict for _, event_dict in decoded], agent.context)
+    except Exception as e:
+        log.warning("Batch decision failed, deciding per event: %s", e)
+        decisions = [None] * len(decoded)
+    written = []  # (event_json, event_dict, record)
+    for (event_json, event_dict), actions in zip(decoded, decisions):
+        try:
+            log.debug("Processing event: %s", event_dict)
+            written.append((event_json, event_dict, handle_event(event_dict, actions)))
+        except Exception as e:
+            log.error("Error processing event: %s", e)
+            metrics.inc("events_failed_total")
+            if queue is not None:
+                queue.nack(event_json)
+    done = []
+    if written:
+        try:
+            with metrics.timer("history_write"):
+                write_records(redis_client, [record for _, _, record in written])
+        except Exception as e:
+            log.error("History write failed, retrying %s events: %s", len(written), e)
+            release_records(written)
+            metrics.inc("events_failed_total", len(written))
+            if queue is not None:
+                for event_json, _, _ in written:
+                    queue.nack(event_json)
+        else:
+            done.extend(event_json for event_json, _, _ in written)
+            metrics.inc("events_processed_total", len(written))
+    # Leaders are written now, so repeats folded into them (possibly within this batch) can point at their records.
+    # A repeat whose leader failed or was not written got no recorded decision and is retried like the leader.
+    updates = []
+    repeats = []
+    for leader, events in folded.values():
+        if not leader_written(leader):
+            if queue is not None:
+                for event_json, _ in events:
+                    queue.nack(event_json)
+            continue
+        updates.append((leader.entry, suppressed_ids(event_dict for _, event_dict in events)))
+        repeats.extend(event_json for event_json, _ in events)
+    if updates:
+        try:
+            with metrics.timer("history_write"):
+                write_occurrences(redis_client, updates)
+        except Exception as e:
+            log.error("Occurrence write failed, retrying %s events: %s", len(repeats), e)
+            metrics.inc("events_failed_total", len(repeats))
+            if queue is not None:
+                for event_json in repeats:
+                    queue.nack(event_json)
+        else:
+            done.extend(repeats)
+            metrics.inc("events_suppressed_total", len(repeats))
+    # Only acknowledge once the history writes have landed
+    if queue is not None:
+        for event_json in done:
+            queue.ack(event_json)
+
+def process_payload(event_json, event_dict, queue=None, leader=None, actions=None):
+    try:
+        log.debug("Processing event: %s", event_dict)
+        record_event(event_dict, leader, actions)
+    except Exception as e:
+        log.error("Error processing event: %s", e)
+        metrics.inc("events_failed_total")
+        if queue is not None:
+            queue.nack(event_json)
+        return
+    if queue is not None:
+        queue.ack(event_json)
+
+def dispatch_batch(payloads, dispatcher, queue=None):
+    # Admit and decide the batch on this thread, so new events share LLM requests (decide_batch), then hand
+    # effectors and history writes to the pool; submit blocks once the pool is saturated (backpressure).
+    # Repeats are admitted in queue order and run on their job's lane after the event they repeat.
+    admitted = []  # (event_json, event_dict, leader)
+    for event_json in payloads:
+        try:
+            event_dict = load_event(event_json)
+            observe_queue_wait(event_dict)
+            admitted.append((event_json, event_dict, admit(event_dict)))
+        except Exception as e:
+            log.error("Error processing event: %s", e)
+            metrics.inc("events_failed_total")
+            if queue is not None:
+                queue.nack(event_json)
+    fresh = [event_dict for _, event_dict, leader in admitted if leader is None]
+    decisions = [None] * len(fresh)
+    if fresh:
+        try:
+            with metrics.timer("decide_batch"):
+                decisions = agent.reasoning_module.decide_batch(fresh, agent.context)
+        except Exception as e:
+            log.warning("Batch decision failed, deciding per event: %s", e)
+    decisions = iter(decisions)
+    for event_json, event_dict, leader in admitted:
+        actions = next(decisions) if leader is None else None
+        dispatcher.submit(event_dict.get('job_id'), process_payload, event_json, event_dict, queue, leader, actions)
+
+def run_retention():
+    try:
+        evicted = apply_retention(redis_client, archive, max_records=HISTORY_MAX_RECORDS, max_age=HISTORY_MAX_AGE)
+    except Exception as e:
+        log.error("History retention failed: %s", e)
+        return
+    if evicted:
+        log.info("Archived %s history records to %s", evicted, HISTORY_ARCHIVE_DIR)
+
+def flush_metrics():
+    try:
+        metrics.flush(redis_client)
+    except Exception as e:
+        log.error("Metrics flush failed: %s", e)
+
+def make_queue():
+    if not WORKER_RELIABLE_QUEUE:
+        return EventQueue(redis_client, EVENT_QUEUE, max_batch=WORKER_MAX_BATCH, max_wait=WORKER_MAX_WAIT)
+    queue = ReliableEventQueue(
+        redis_client, EVENT_QUEUE, worker_id=WORKER_ID,
+        max_batch=WORKER_MAX_BATCH, max_wait=WORKER_MAX_WAIT,
+        visibility_timeout=WORKER_VISIBILITY_TIMEOUT, max_attempts=WORKER_MAX_ATTEMPTS,
+    )
+    recovered = queue.recover()
+    if recovered:
+        log.info("Re-queued %s in-flight events from a previous run", recovered)
+    queue.start_heartbeat()
+    return queue
 
 if __name__ == "__main__":
-    print("[Agentic Worker] Starting event processing loop...")
+    configure_logging()
+    log.info("Starting event processing loop...")
+    queue = make_queue()
+    if WORKER_RELOAD_INTERVAL > 0:
+        FileWatcher({
+            reasoning.config_path: reasoning.reload_config,
+            reasoning.rules_path: lambda: f"{reasoning.reload_rules()} rules",
+        }, interval=WORKER_RELOAD_INTERVAL).start()
+    dispatcher = KeyedDispatcher(max_workers=WORKER_CONCURRENCY) if WORKER_CONCURRENCY > 1 else None
+    last_reap = 0.0
+    last_retention = 0.0
+    last_reasoning_stats = None
+    last_metrics = time.time()
     while True:
-        event_json = redis_client.lpop(EVENT_QUEUE)
-        if event_json:
-            try:
-                event_dict = json.loads(event_json)
-                print(f"[Agentic Worker] Processing event: {event_dict}")
-                process_event(event_dict)
-            except Exception as e:
-                print(f"[Agentic Worker] Error processing event: {e}")
+        if WORKER_METRICS and time.time() - last_metrics >= WORKER_METRICS_INTERVAL:
+            flush_metrics()
+            last_metrics = time.time()
+        if time.time() - last_retention >= HISTORY_RETENTION_INTERVAL:
+            run_retention()
+            last_retention = time.time()
+        if time.time() - last_reap >= WORKER_REAP_INTERVAL:
+            reaped = queue.reap()
+            if reaped:
+                log.info("Re-queued %s events from dead workers", reaped)
+            reasoning_stats = reasoning.stats()
+            if suppressor is not None:
+                reasoning_stats['suppression'] = suppressor.stats()
+            if reasoning_stats != last_reasoning_stats:
+                log.info("Reasoning stats", extra={"fields": {"stats": reasoning_stats}})
+                last_reasoning_stats = reasoning_stats
+            last_reap = time.time()
+        batch = queue.fetch()
+        if not batch:
+            continue
+        if dispatcher is None:
+            process_batch(batch, queue)
         else:
-            time.sleep(1) 
\ No newline at end of file
+            dispatch_batch(batch, dispatcher, queue) 
\ No newline at end of file
@@ -1,75 +1,191 @@
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
-from api.models import EventIn, FeedbackIn, StatusOut, HistoryOut, HistoryRecord
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from api.models import EventIn, FeedbackIn, StatusOut, HistoryOut, HistoryRecord, BulkEventsOut, BulkEventError
 import os
-import redis
-import json
-from typing import List
+import redis.asyncio as aioredis
+import time
+from typing import List, Optional
+from agentic.records import loads, new_event_id
+from agentic.metrics import METRICS_KEY, render_prometheus
 from feedback.store import store_feedback
+from history.store import query_history_async, find_event_async, latest_for_job_async, count_records_async
+from history.archive import SegmentArchive
 
-app = FastAPI(title="AutoRemedy API", description="REST API for the AutoRemedy agentic system.")
-
-# Redis connection (configurable via env)
+# Redis connection (configurable via env). Handlers share one pooled asyncio client, created at
+# startup and closed at shutdown; a request waits up to REDIS_POOL_TIMEOUT for a free connection
 REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True)
+REDIS_MAX_CONNECTIONS = int(os.getenv("API_REDIS_MAX_CONNECTIONS", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("API_REDIS_POOL_TIMEOUT", 5))
+
+def create_redis():
+    pool = aioredis.BlockingConnectionPool(
+        host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB, decode_responses=True,
+        max_connections=REDIS_MAX_CONNECTIONS, timeout=REDIS_POOL_TIMEOUT,
+    )
+    return aioredis.Redis.from_pool(pool)
+
+@asynccontextmanager
+async def lifespan(app):
+    app.state.redis = create_redis()
+    try:
+        yield
+    finally:
+        await app.state.redis.aclose()
+
+def get_redis(request: Request):
+    return request.app.state.redis
+
+app = FastAPI(title="AutoRemedy API", description="REST API for the AutoRemedy agentic system.", lifespan=lifespan)
 
 EVENT_QUEUE = "agentic:events"
-HISTORY_LIST = "agentic:history"
+DEAD_LETTER_LIST = "agentic:events:dead"
+# POST /events: max events per request, and values per RPUSH within its single pipeline
+MAX_BULK_EVENTS = int(os.getenv("API_MAX_BULK_EVENTS", 10000))
+BULK_PUSH_CHUNK = 1000
+# Segments of history evicted from Redis by the worker (a volume shared with it)
+HISTORY_ARCHIVE_DIR = os.getenv("HISTORY_ARCHIVE_DIR", "archive/history")
+archive = SegmentArchive(HISTORY_ARCHIVE_DIR) if HISTORY_ARCHIVE_DIR else None
 
 @app.get("/")
-def root():
+async def root():
     return {"message": "AutoRemedy API is running"}
 
 @app.get("/health", response_model=StatusOut)
-def health():
+async def health(redis_client=Depends(get_redis)):
     try:
-        redis_client.ping()
+        await redis_client.ping()
         return StatusOut(status="ok")
     except Exception as e:
         return StatusOut(status="error", detail=str(e))
 
 @app.post("/event")
-def submit_event(event: EventIn):
-    # Push event to Redis queue
-    redis_client.rpush(EVENT_QUEUE, event.json())
-    return {"status": "submitted"}
+async def submit_event(event: EventIn, redis_client=Depends(get_redis)):
+    # Push event to Redis queue; the event id is returned so feedback can reference this exact event
+    if event.event_id is None:
+        event.event_id = new_event_id()
+    event.enqueued_at = time.time()
+    await redis_client.rpush(EVENT_QUEUE, event.model_dump_json())
+    return {"status": "submitted", "event_id": event.event_id}
 
-@app.get("/history", response_model=HistoryOut)
-def get_history():
-    # Get all history records from Redis
-    records = []
-    for item in redis_client.lrange(HISTORY_LIST, 0, -1):
+def _parse_bulk_body(body: bytes, content_type: str):
+    # [(index, item or None, parse error or None)] from a JSON array or NDJSON (one event per line)
+    if "ndjson" not in content_type and body.lstrip()[:1] == b"[":
         try:
-            record = json.loads(item)
-            records.append(record)
-        except Exception:
+            items = loads(body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of events")
+        return [(i, item, None) for i, item in enumerate(items)]
+    parsed = []
+    for i, line in enumerate(body.splitlines()):
+        if not line.strip():
             continue
-    return HistoryOut(records=records)
+        try:
+            parsed.append((i, loads(line), None))
+        except ValueError as e:
+            parsed.append((i, None, f"Invalid JSON: {e}"))
+    return parsed
+
+async def _push_events(redis_client, payloads):
+    pipe = redis_client.pipeline(transaction=False)
+    for start in range(0, len(payloads), BULK_PUSH_CHUNK):
+        pipe.rpush(EVENT_QUEUE, *payloads[start:start + BULK_PUSH_CHUNK])
+    await pipe.execute()
+
+@app.post("/events", response_model=BulkEventsOut)
+async def submit_events(request: Request, redis_client=Depends(get_redis)):
+    # Bulk submission: a JSON array or NDJSON body, validated per item and queued in one pipelined round trip.
+    # Valid events are queued even when others fail; failures are reported by their position in the body.
+    items = _parse_bulk_body(await request.body(), request.headers.get("content-type", ""))
+    if len(items) > MAX_BULK_EVENTS:
+        raise HTTPException(status_code=413, detail=f"At most {MAX_BULK_EVENTS} events per request")
+    payloads, event_ids, errors = [], [], []
+    enqueued_at = time.time()
+    for index, item, error in items:
+        if error is None:
+            try:
+                event = EventIn.model_validate(item)
+            except ValidationError as e:
+                error = "; ".join(f"{'.'.join(str(part) for part in err['loc']) or 'event'}: {err['msg']}" for err in e.errors())
+        if error is not None:
+            errors.append(BulkEventError(index=index, error=error))
+            continue
+        if event.event_id is None:
+            event.event_id = new_event_id()
+        event.enqueued_at = enqueued_at
+        payloads.append(event.model_dump_json())
+        event_ids.append(event.event_id)
+    if payloads:
+        await _push_events(redis_client, payloads)
+    return BulkEventsOut(status="submitted", submitted=len(payloads), event_ids=event_ids, errors=errors)
+
+@app.get("/history", response_model=HistoryOut)
+async def get_history(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = Query(None, description="next_cursor from the previous page"),
+    job_id: Optional[str] = None,
+    status: Optional[str] = None,
+    escalated: Optional[bool] = None,
+    since: Optional[float] = Query(None, description="processed_at lower bound (unix seconds)"),
+    until: Optional[float] = Query(None, description="processed_at upper bound (unix seconds)"),
+    redis_client=Depends(get_redis),
+):
+    # Newest-first page of history records, served from the indexes the worker maintains
+    filters = dict(job_id=job_id, status=status, escalated=escalated, since=since, until=until)
+    records, next_cursor = await query_history_async(redis_client, limit=limit, cursor=cursor, **filters)
+    if archive is not None and next_cursor is None and len(records) < limit:
+        # Past the end of Redis: continue into the archive, which only holds older record ids.
+        # Segment reads are file IO + gunzip, so they run off the event loop
+        older, next_cursor = await run_in_threadpool(archive.query, limit=limit - len(records), cursor=cursor, **filters)
+        records += older
+    return HistoryOut(records=records, next_cursor=next_cursor)
 
 @app.post("/feedback")
-def submit_feedback(feedback: FeedbackIn):
-    # Find the history record by event_id
-    history = redis_client.lrange(HISTORY_LIST, 0, -1)
-    found_event = None
-    for item in history:
-        record = json.loads(item)
-        if str(record['event'].get('job_id')) == str(feedback.event_id):
-            found_event = record['event']
-            break
-    if not found_event:
+async def submit_feedback(feedback: FeedbackIn, redis_client=Depends(get_redis)):
+    # Look the event up by event id; fall back to the latest record for a job_id (older clients)
+    found = await find_event_async(redis_client, feedback.event_id)
+    if found is None:
+        record = await latest_for_job_async(redis_client, feedback.event_id)
+        found = (record, None) if record else None
+    if not found:
         raise HTTPException(status_code=404, detail="Event not found in history")
-    # Store feedback using the new feedback store
-    store_feedback(found_event, action="unknown", feedback=feedback.rating, comment=feedback.comment)
+    record, hash_value = found
+    # Store feedback using the new feedback store (its own blocking client, so off the event loop)
+    await run_in_threadpool(
+        store_feedback, record['event'], action="unknown", feedback=feedback.rating, comment=feedback.comment, hash_value=hash_value,
+    )
     return {"status": "feedback added"}
 
 @app.get("/status", response_model=StatusOut)
-def get_status():
+async def get_status(redis_client=Depends(get_redis)):
     # Simple status endpoint (could be expanded)
     try:
-        event_queue_len = redis_client.llen(EVENT_QUEUE)
-        history_len = redis_client.llen(HISTORY_LIST)
-        return StatusOut(status="ok", detail=f"event_queue={event_queue_len}, history={history_len}")
+        event_queue_len = await redis_client.llen(EVENT_QUEUE)
+        history_len = await count_records_async(redis_client)
+        dead_letter_len = await redis_client.llen(DEAD_LETTER_LIST)
+        return StatusOut(status="ok", detail=f"event_queue={event_queue_len}, history={history_len}, dead_letter={dead_letter_len}")
     except Exception as e:
-        return StatusOut(status="error", detail=str(e)) 
\ No newline at end of file
+        return StatusOut(status="error", detail=str(e)) 
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics(redis_client=Depends(get_redis)):
+    # Prometheus text format: worker stage histograms and counters (summed over workers) plus queue gauges
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.hgetall(METRICS_KEY)
+    pipe.llen(EVENT_QUEUE)
+    pipe.llen(DEAD_LETTER_LIST)
+    fields, queue_depth, dead_letters = await pipe.execute()
+    requests_total = float(fields.get("counter:llm_requests_total", 0))
+    errors_total = float(fields.get("counter:llm_errors_total", 0))
+    gauges = [
+        ("queue_depth", f"Events waiting in {EVENT_QUEUE}", queue_depth),
+        ("dead_letter_depth", f"Events in {DEAD_LETTER_LIST}", dead_letters),
+        ("llm_error_ratio", "llm_errors_total / llm_requests_total since the counters started", errors_total / requests_total if requests_total else 0),
+    ]
+    return PlainTextResponse(render_prometheus(fields, gauges=gauges), media_type="text/plain; version=0.0.4")
@@ -6,9 +6,21 @@ class EventIn(BaseModel):
     status: str
     event_type: str = "job_issue"
     details: Optional[Dict[str, Any]] = None
+    event_id: Optional[str] = None
+    enqueued_at: Optional[float] = None  # set by the API when it queues the event (worker queue_wait metric)
+
+class BulkEventError(BaseModel):
+    index: int  # position of the item in the submitted array / NDJSON lines
+    error: str
+
+class BulkEventsOut(BaseModel):
+    status: str
+    submitted: int
+    event_ids: List[str]  # ids of the queued events, in submission order
+    errors: List[BulkEventError]
 
 class FeedbackIn(BaseModel):
-    event_id: str
+    event_id: str  # event id returned by POST /event (a job_id is still accepted)
     user: str
     rating: int
     comment: Optional[str] = None
@@ -18,10 +30,15 @@ class StatusOut(BaseModel):
     detail: Optional[str] = None
 
 class HistoryRecord(BaseModel):
+    id: Optional[int] = None
+    event_id: Optional[str] = None
+    processed_at: Optional[float] = None
+    occurrences: int = 1  # identical events folded into this record by the worker's suppression window
     event: Dict[str, Any]
     actions: List[Dict[str, Any]]
     outcomes: List[Any]
     feedback: Optional[Dict[str, Any]] = None
 
 class HistoryOut(BaseModel):
-    records: List[HistoryRecord] 
\ No newline at end of file
+    records: List[HistoryRecord]
+    next_cursor: Optional[int] = None 
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""Agent loop with slow sensors and effectors: serial loop vs concurrent Agent.
+
+    python -m benchmarks.bench_agent_loop --seconds 5
+
+Throughput: --fast-sensors sensors that always have an event ready plus one
+sensor that takes --slow-sensor seconds per poll. Each action goes to a fast
+effector, a --slow-effector one and one that hangs for --hang seconds
+on every --hang-every-th call. It compares the previous loop, which
+polled each sensor and ran each effector call in turn, with Agent.run_once,
+where the hanging effector is cut off at --effector-timeout.
+
+Pickup delay: events arrive at random (--arrival-rate per second) and the
+loop sleeps between empty rounds, either a fixed --poll-interval (previous
+run_forever) or adaptively from 0.05s up to the same interval.
+"""
+import argparse
+import itertools
+import random
+import statistics
+import threading
+import time
+
+from agentic.agent import Agent
+from agentic.base import Effector, Sensor
+from agentic.reasoning_simple import SimpleReasoningModule
+
+
+class BacklogSensor(Sensor):
+    # Always has an event; each poll takes delay seconds
+    def __init__(self, name, delay):
+        self.name = name
+        self.delay = delay
+        self.ids = itertools.count()
+
+    def get_event(self):
+        time.sleep(self.delay)
+        return {"job_id": f"{self.name}-{next(self.ids)}", "status": "fail", "event_type": "job_issue", "polled_at": time.perf_counter()}
+
+
+class ArrivalSensor(Sensor):
+    # Events arrive in the background at random times; get_event hands over the oldest one
+    def __init__(self, rate, seed):
+        self.rate = rate
+        self.rng = random.Random(seed)
+        self.pending = []
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        threading.Thread(target=self._arrive, daemon=True).start()
+
+    def _arrive(self):
+        while not self.stopped.wait(self.rng.expovariate(self.rate)):
+            with self.lock:
+                self.pending.append(time.perf_counter())
+
+    def get_event(self):
+        with self.lock:
+            if not self.pending:
+                return None
+            arrived_at = self.pending.pop(0)
+        return {"job_id": 1, "status": "fail", "event_type": "job_issue", "delay": time.perf_counter() - arrived_at}
+
+
+class SleepEffector(Effector):
+    def __init__(self, delay, hang=0.0, hang_every=0, timeout=None):
+        self.delay = delay
+        self.hang = hang
+        self.hang_every = hang_every
+        self.timeout = timeout
+        self.calls = itertools.count(1)
+
+    def execute(self, action, params):
+        call = next(self.calls)
+        time.sleep(self.hang if self.hang_every and call % self.hang_every == 0 else self.delay)
+
+
+def serial_run_once(agent):
+    # The previous Agent.run_once: one sensor at a time, one effector call at a time
+    for sensor in agent.sensors:
+        event = sensor.get_event()
+        if event:
+            actions = agent.reasoning_module.decide(event, agent.context)
+            outcomes = [effector.execute(action['type'], action.get('params', {})) for action in actions for effector in agent.effectors]
+            agent.memory.record(event, actions, outcomes)
+
+
+def throughput(args, concurrent):
+    sensors = [BacklogSensor(f"fast{i}", 0.005) for i in range(args.fast_sensors)] + [BacklogSensor("slow", args.slow_sensor)]
+    effectors = [
+        SleepEffector(0.002),
+        SleepEffector(args.slow_effector),
+        SleepEffector(0.002, hang=args.hang, hang_every=args.hang_every, timeout=args.effector_timeout),
+    ]
+    agent = Agent(sensors, effectors, SimpleReasoningModule(), max_effector_workers=32)
+    step = agent.run_once if concurrent else lambda: serial_run_once(agent)
+    latencies = []
+    deadline = time.perf_counter() + args.seconds
+    while time.perf_counter() < deadline:
+        seen = len(agent.memory.history)
+        step()
+        done = time.perf_counter()
+        latencies += [done - entry.event.extra["polled_at"] for entry in list(agent.memory.history)[seen:]]
+    agent.close()
+    count = len(latencies)
+    latencies.sort()
+    return count / args.seconds, latencies[count // 2], latencies[int(count * 0.95)]
+
+
+def pickup(args, adaptive):
+    sensor = ArrivalSensor(args.arrival_rate, args.seed)
+    agent = Agent([sensor], [SleepEffector(0.002)], SimpleReasoningModule())
+    rounds = itertools.count()
+    run_once = agent.run_once
+
+    def counted_run_once():
+        next(rounds)
+        return run_once()
+
+    agent.run_once = counted_run_once
+    if adaptive:
+        loop = lambda: agent.run_forever(poll_interval=args.poll_interval)
+    else:
+        def loop():
+            # The previous run_forever: a fixed sleep after every round
+            while not agent._stopped.is_set():
+                agent.run_once()
+                time.sleep(args.poll_interval)
+    thread = threading.Thread(target=loop, daemon=True)
+    thread.start()
+    time.sleep(args.seconds)
+    sensor.stopped.set()
+    agent.stop()
+    thread.join()
+    agent.close()
+    delays = sorted(entry.event.extra["delay"] for entry in agent.memory.history)
+    return len(delays), next(rounds), statistics.median(delays), delays[int(len(delays) * 0.95)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--fast-sensors", type=int, default=3)
+    parser.add_argument("--slow-sensor", type=float, default=0.5, help="seconds per poll of the slow sensor")
+    parser.add_argument("--slow-effector", type=float, default=0.05)
+    parser.add_argument("--hang", type=float, default=2.0)
+    parser.add_argument("--hang-every", type=int, default=50)
+    parser.add_argument("--effector-timeout", type=float, default=0.25)
+    parser.add_argument("--arrival-rate", type=float, default=2.0)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{'loop':<12}{'events/sec':>12}{'p50 ms':>10}{'p95 ms':>10}")
+    for name, concurrent in (("serial", False), ("concurrent", True)):
+        rate, p50, p95 = throughput(args, concurrent)
+        print(f"{name:<12}{rate:>12.1f}{p50 * 1000:>10.1f}{p95 * 1000:>10.1f}")
+    print()
+    print(f"{'polling':<12}{'events':>8}{'rounds':>8}{'pickup p50 ms':>15}{'pickup p95 ms':>15}")
+    for name, adaptive in (("fixed", False), ("adaptive", True)):
+        events, polls, p50, p95 = pickup(args, adaptive)
+        print(f"{name:<12}{events:>8}{polls:>8}{p50 * 1000:>15.1f}{p95 * 1000:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Events/sec through the API: one POST /event per event vs POST /events batches.
+
+    python -m benchmarks.bench_api_events --events 20000 --batch-size 1000
+
+Serves api.main.app with uvicorn on a local port in a background thread,
+backed by an in-process fakeredis, and posts over a keep-alive HTTP session.
+The single-event path is sampled on --single-events. Events come from the
+jobsim.load simulator (config.yaml job types, --seed).
+"""
+import argparse
+import itertools
+import json
+import socket
+import threading
+import time
+
+import fakeredis
+import requests
+import uvicorn
+import yaml
+
+import api.main
+from jobsim.load import LoadSimulator
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server():
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(api.main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def single(session, url, events):
+    for event in events:
+        session.post(f"{url}/event", json=event).raise_for_status()
+
+
+def bulk(session, url, events, batch_size, ndjson):
+    for start in range(0, len(events), batch_size):
+        batch = events[start:start + batch_size]
+        if ndjson:
+            body = "\n".join(json.dumps(e) for e in batch)
+            response = session.post(f"{url}/events", data=body, headers={"Content-Type": "application/x-ndjson"})
+        else:
+            response = session.post(f"{url}/events", json=batch)
+        response.raise_for_status()
+        assert response.json()["submitted"] == len(batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--single-events", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fake = fakeredis.FakeServer()
+    api.main.create_redis = lambda: fakeredis.FakeAsyncRedis(server=fake, decode_responses=True)
+    client = fakeredis.FakeRedis(server=fake, decode_responses=True)
+    server, url = start_server()
+    with open("config.yaml") as f:
+        simulator = LoadSimulator.from_config(yaml.safe_load(f), seed=args.seed)
+    events = list(itertools.islice(simulator.events(args.events * 4), args.events))
+    runs = [
+        ("POST /event", lambda s: single(s, url, events[:args.single_events]), min(args.single_events, args.events)),
+        (f"POST /events json x{args.batch_size}", lambda s: bulk(s, url, events, args.batch_size, False), args.events),
+        (f"POST /events ndjson x{args.batch_size}", lambda s: bulk(s, url, events, args.batch_size, True), args.events),
+    ]
+    try:
+        print(f"{'mode':<28}{'events':>10}{'seconds':>10}{'events/sec':>12}")
+        for name, fn, count in runs:
+            client.delete(api.main.EVENT_QUEUE)
+            with requests.Session() as session:
+                start = time.perf_counter()
+                fn(session)
+                elapsed = time.perf_counter() - start
+            assert client.llen(api.main.EVENT_QUEUE) == count
+            print(f"{name:<28}{count:>10}{elapsed:>10.2f}{count / elapsed:>12.0f}")
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
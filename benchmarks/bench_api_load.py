@@ -0,0 +1,127 @@
+"""Requests/sec and tail latency of the API under concurrent load.
+
+    python -m benchmarks.bench_api_load --requests 5000 --concurrency 1 16 64 256
+
+Serves api.main.app with uvicorn in a child process, backed by fakeredis
+seeded with --history records, and drives it with httpx.AsyncClient from this
+process: --concurrency clients issue requests back to back, cycling through
+POST /event, GET /history?limit=50 and GET /status (or one --endpoint).
+--redis-latency adds a simulated network round trip to every Redis command,
+which is where a blocking handler would sit on a threadpool slot.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+import httpx
+
+from benchmarks.bench_api_events import free_port
+
+ENDPOINTS = {
+    "event": ("POST", "/event", {"json": {"job_id": 1, "status": "fail", "details": {"source": "Disk", "description": "full"}}}),
+    "history": ("GET", "/history", {"params": {"limit": 50}}),
+    "status": ("GET", "/status", {}),
+}
+
+
+def serve(port, history, redis_latency):
+    # Child process: seed fakeredis, point the API's client factory at it and run uvicorn
+    import fakeredis
+    import redis.asyncio as aioredis
+    import uvicorn
+
+    import api.main
+    from history.store import write_records
+
+    class LatentFakeRedis(fakeredis.FakeAsyncRedis):
+        async def execute_command(self, *args, **options):
+            await asyncio.sleep(redis_latency)
+            return await super().execute_command(*args, **options)
+
+    server = fakeredis.FakeServer()
+    seed = fakeredis.FakeRedis(server=server, decode_responses=True)
+    for start in range(0, history, 10000):
+        write_records(seed, [
+            {"event": {"job_id": i % 100, "status": "fail", "event_type": "job_issue"}, "actions": [], "outcomes": []}
+            for i in range(start, min(start + 10000, history))
+        ])
+    factory = LatentFakeRedis if redis_latency else fakeredis.FakeAsyncRedis
+    # Same blocking pool and limits as api.main.create_redis
+    api.main.create_redis = lambda: factory(
+        server=server, decode_responses=True, connection_pool_class=aioredis.BlockingConnectionPool,
+        max_connections=api.main.REDIS_MAX_CONNECTIONS, timeout=api.main.REDIS_POOL_TIMEOUT,
+    )
+    uvicorn.run(api.main.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def wait_ready(url, timeout=300):
+    # Seeding a large history takes a while before uvicorn starts listening
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as http:
+        while time.monotonic() < deadline:
+            try:
+                if (await http.get("/health")).json()["status"] == "ok":
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.1)
+    raise RuntimeError("API did not start")
+
+
+async def load(url, total, concurrency, endpoints):
+    latencies = []
+    issued = 0
+
+    async def client(http):
+        nonlocal issued
+        while issued < total:
+            method, path, kwargs = endpoints[issued % len(endpoints)]
+            issued += 1
+            start = time.perf_counter()
+            response = await http.request(method, path, **kwargs)
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return elapsed, latencies
+
+
+def percentile(values, q):
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64, 256])
+    parser.add_argument("--endpoint", choices=["all", *ENDPOINTS], default="all")
+    parser.add_argument("--history", type=int, default=20000, help="history records seeded into fakeredis")
+    parser.add_argument("--redis-latency", type=float, default=0.0005, help="seconds added to each Redis command")
+    args = parser.parse_args()
+
+    endpoints = list(ENDPOINTS.values()) if args.endpoint == "all" else [ENDPOINTS[args.endpoint]]
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    server = multiprocessing.Process(target=serve, args=(port, args.history, args.redis_latency), daemon=True)
+    server.start()
+    try:
+        asyncio.run(wait_ready(url))
+        print(f"{'concurrency':>11}{'requests':>10}{'req/sec':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for concurrency in args.concurrency:
+            elapsed, latencies = asyncio.run(load(url, args.requests, concurrency, endpoints))
+            print(f"{concurrency:>11}{len(latencies):>10}{len(latencies) / elapsed:>10.0f}"
+                  + "".join(f"{percentile(latencies, q) * 1000:>9.1f}" for q in (0.5, 0.95, 0.99))
+                  + f"{latencies[-1] * 1000:>9.1f}")
+    finally:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    main()
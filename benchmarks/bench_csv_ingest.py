@@ -0,0 +1,91 @@
+"""Per-row CSV ingestion vs agentic.csv_ingest bulk mode.
+
+    python -m benchmarks.bench_csv_ingest --rows 1000000
+
+Writes a synthetic Kaggle-style export, then measures rows/minute for:
+  * per-row: DictReader + map_status + one RPUSH per row (the shape of
+    tests/post_kaggle_events.py without the HTTP hop), sampled on --legacy-rows
+  * bulk parse: read, map, filter and encode only (client=None)
+  * bulk + redis: the same, pushing pipelined multi-value RPUSHes
+Bulk modes run with the csv module and, when installed, pandas. Redis is an
+in-process fakeredis unless --redis-url is given.
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from itertools import islice
+
+import fakeredis
+import redis
+
+from agentic.csv_ingest import ingest_csv, pd
+from agentic.kaggle_csv_sensor import row_to_event
+from agentic.records import dumps
+
+LEVELS = ["Informações"] * 6 + ["Aviso"] * 2 + ["Erro", "Debug", "Trace", "Crítico", "Alerta"]
+
+
+def write_csv(path, rows, seed):
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Nível", "Data e Hora", "Fonte", "Identificação do Evento", "Categoria da Tarefa", "Description1"])
+        for i in range(rows):
+            writer.writerow([
+                rng.choice(LEVELS), f"19/07/2024 12:{i % 60:02d}:{i % 59:02d}", f"Microsoft-Windows-Source{i % 40}",
+                str(1000 + i % 9000), "Nenhum", f"The service entered the stopped state ({i})",
+            ])
+
+
+def per_row(path, client, limit):
+    with open(path, encoding="utf-8") as f:
+        for index, row in enumerate(islice(csv.DictReader(f), limit), 1):
+            client.rpush("bench:events", dumps(row_to_event(row, index)))
+    return limit
+
+
+def timed(fn):
+    start = time.perf_counter()
+    rows = fn()
+    return rows, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--legacy-rows", type=int, default=20000)
+    parser.add_argument("--chunk-size", type=int, default=50000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--redis-url", help="push to a real Redis (its current database is flushed)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "eventos.csv")
+    write_csv(path, args.rows, args.seed)
+
+    def new_client():
+        client = redis.Redis.from_url(args.redis_url) if args.redis_url else fakeredis.FakeRedis()
+        client.flushdb()
+        return client
+
+    runs = [("per-row", lambda: per_row(path, new_client(), min(args.legacy_rows, args.rows)))]
+    for engine, use_pandas in (("csv", False), ("pandas", True)):
+        if use_pandas and pd is None:
+            print("pandas not installed: skipping the pandas engine")
+            continue
+        ingest = lambda client, use_pandas=use_pandas: ingest_csv(
+            path, client, chunk_size=args.chunk_size, batch_size=args.batch_size, use_pandas=use_pandas)["rows"]
+        runs.append((f"bulk parse ({engine})", lambda ingest=ingest: ingest(None)))
+        runs.append((f"bulk + redis ({engine})", lambda ingest=ingest: ingest(new_client())))
+
+    print(f"{'mode':<24}{'rows':>10}{'seconds':>10}{'rows/min':>14}")
+    for name, fn in runs:
+        rows, elapsed = timed(fn)
+        print(f"{name:<24}{rows:>10}{elapsed:>10.2f}{rows / elapsed * 60:>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Load test for POST /feedback event lookup: linear history scan vs the event id index.
+
+    python -m benchmarks.bench_feedback_lookup --sizes 10000 1000000 --lookups 200
+
+For each history size, fills both the old agentic:history list and the
+history.store indexes, then times looking up random events the way
+submit_feedback used to (LRANGE + decode until the job_id matches) and via
+find_event. The linear scan is only sampled a few times at large sizes.
+Runs against fakeredis unless --redis-url is given.
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+
+import fakeredis
+import redis
+
+from history.store import write_records, find_event
+
+LEGACY_LIST = "bench:history"
+
+
+def make_record(i):
+    return {
+        "event": {"job_id": i, "status": "fail", "event_type": "job_issue", "event_id": f"evt-{i}",
+                  "details": {"source": f"Source{i % 7}", "description": f"synthetic failure {i}"}},
+        "actions": [{"type": "notify", "params": {"message": "check it", "escalation": False}}],
+        "outcomes": [None],
+    }
+
+
+def fill(client, n, chunk=10000):
+    for start in range(0, n, chunk):
+        records = [make_record(i) for i in range(start, min(n, start + chunk))]
+        pipe = client.pipeline(transaction=False)
+        pipe.rpush(LEGACY_LIST, *[json.dumps(r) for r in records])
+        write_records(client, records, pipe=pipe)
+        pipe.execute()
+
+
+def legacy_lookup(client, job_id):
+    # The pre-index submit_feedback: load everything, decode until the first match
+    for item in client.lrange(LEGACY_LIST, 0, -1):
+        record = json.loads(item)
+        if str(record['event'].get('job_id')) == str(job_id):
+            return record['event']
+    return None
+
+
+def latencies(fn, keys):
+    samples = []
+    for key in keys:
+        start = time.perf_counter()
+        assert fn(key) is not None
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 1000000])
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--legacy-lookups", type=int, default=3)
+    parser.add_argument("--redis-url", help="run against a real Redis (its current database is flushed)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    print(f"{'records':>10}{'lookup':>10}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for size in args.sizes:
+        client = redis.Redis.from_url(args.redis_url) if args.redis_url else fakeredis.FakeRedis()
+        client.flushdb()
+        fill(client, size)
+        targets = [rng.randrange(size) for _ in range(args.lookups)]
+        rows = [
+            ("linear", latencies(lambda i: legacy_lookup(client, i), targets[:args.legacy_lookups])),
+            ("index", latencies(lambda i: find_event(client, f"evt-{i}"), targets)),
+        ]
+        for name, samples in rows:
+            samples.sort()
+            p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+            print(f"{size:>10}{name:>10}{statistics.median(samples):>10.2f}{p99:>10.2f}{samples[-1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
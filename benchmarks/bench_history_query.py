@@ -0,0 +1,76 @@
+"""Full LRANGE scan of agentic:history vs an indexed /history page as history grows.
+
+    python -m benchmarks.bench_history_query --sizes 1000 10000 100000 --limit 100
+
+For each size, writes that many records both as a plain list (the old layout)
+and through history.store.write_records, then times fetching one page: the
+newest records, a job_id filter and a status + escalation filter.
+Runs against fakeredis, so absolute numbers understate network costs.
+"""
+import argparse
+import json
+import time
+
+import fakeredis
+
+from history.store import write_records, query_history
+
+LEGACY_LIST = "bench:history"
+
+
+def make_record(i):
+    return {
+        "event": {"job_id": i % 1000, "status": ("fail", "warning", "escalate")[i % 3], "event_type": "job_issue",
+                  "details": {"source": f"Source{i % 7}", "description": f"synthetic failure {i}"}},
+        "actions": [{"type": "notify", "params": {"message": "check it", "escalation": i % 3 == 2}}],
+        "outcomes": [None],
+    }
+
+
+def fill(client, n, chunk=5000):
+    for start in range(0, n, chunk):
+        records = [make_record(i) for i in range(start, min(n, start + chunk))]
+        pipe = client.pipeline(transaction=False)
+        pipe.rpush(LEGACY_LIST, *[json.dumps(r) for r in records])
+        write_records(client, records, pipe=pipe)
+        pipe.execute()
+
+
+def legacy_page(client, limit, **filters):
+    # What GET /history used to do, plus the filtering a client had to do itself
+    records = [json.loads(item) for item in client.lrange(LEGACY_LIST, 0, -1)]
+    matching = [r for r in reversed(records) if all(str(r["event"].get(k)) == str(v) for k, v in filters.items())]
+    return matching[:limit]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'records':>10}{'query':>22}{'lrange ms':>12}{'indexed ms':>12}")
+    for size in args.sizes:
+        client = fakeredis.FakeRedis(decode_responses=True)
+        fill(client, size)
+        queries = [
+            ("newest", {}, {}),
+            ("job_id=7", {"job_id": 7}, {"job_id": 7}),
+            ("status+escalated", {"status": "escalate"}, {"status": "escalate", "escalated": True}),
+        ]
+        for name, legacy_filters, filters in queries:
+            legacy = timed(lambda: legacy_page(client, args.limit, **legacy_filters), 1 if size > 10000 else args.repeat)
+            indexed = timed(lambda: query_history(client, limit=args.limit, **filters), args.repeat)
+            print(f"{size:>10}{name:>22}{legacy:>12.1f}{indexed:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
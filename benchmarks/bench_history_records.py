@@ -0,0 +1,68 @@
+"""Bytes per history record and serialize throughput: nested dicts + json vs HistoryEntry + orjson.
+
+    python -m benchmarks.bench_history_records --records 50000
+
+"before" is the old Memory record (every action embeds the whole event) encoded
+with json.dumps; "after" is agentic.records.HistoryEntry, whose actions carry
+the event_id instead, encoded with agentic.records.dumps (orjson when installed).
+Throughput covers building the record from the reasoning output plus encoding,
+and decoding it again.
+"""
+import argparse
+import json
+import time
+
+from agentic.records import HistoryEntry, dumps, loads, orjson
+
+
+def make_parts(i):
+    event = {
+        "job_id": i,
+        "status": ("fail", "warning", "escalate")[i % 3],
+        "event_type": "job_issue",
+        "event_id": f"{i:032x}",
+        "details": {
+            "timestamp": "2024-07-19T12:00:00Z",
+            "source": f"Source{i % 7}",
+            "description": f"Disk full on /dev/sda{i % 4}: write failed after {i % 100} retries",
+        },
+    }
+    actions = [
+        {"type": "notify", "params": {"job": event, "escalation": i % 3 == 2}},
+        {"type": "remediate", "params": {"job": event, "remediation": "clear_temp_files"}},
+    ]
+    return event, actions, [None, None]
+
+
+def before(parts):
+    event, actions, outcomes = parts
+    return json.dumps({"event": event, "actions": actions, "outcomes": outcomes}).encode("utf-8")
+
+
+def after(parts):
+    return dumps(HistoryEntry.from_parts(*parts).to_dict())
+
+
+def timed(fn, items):
+    start = time.perf_counter()
+    results = [fn(item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000)
+    args = parser.parse_args()
+
+    parts = [make_parts(i) for i in range(args.records)]
+    print(f"serializer: {'orjson ' + orjson.__version__ if orjson is not None else 'json (orjson not installed)'}")
+    print(f"{'format':<8}{'bytes/record':>14}{'encode rec/s':>14}{'decode rec/s':>14}")
+    for name, encode, decode in (("before", before, json.loads), ("after", after, loads)):
+        encode_time, payloads = timed(encode, parts)
+        decode_time, _ = timed(decode, payloads)
+        size = sum(len(p) for p in payloads) / len(payloads)
+        print(f"{name:<8}{size:>14.0f}{args.records / encode_time:>14.0f}{args.records / decode_time:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
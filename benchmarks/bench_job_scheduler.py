@@ -0,0 +1,110 @@
+"""Makespan and resolution latency: previous polling JobAgent.monitor vs the scheduler.
+
+    python -m benchmarks.bench_job_scheduler --time-scale 0.01
+
+Runs the 15 jobs in config.yaml and a synthetic --jobs config (types and
+durations drawn like the real ones, --storm-types with a per-type limit of
+--type-limit). Jobs sleep expected_duration * --time-scale seconds, and
+restart_service still sleeps its real 0.5s. The previous monitor ran every
+pending job in turn, resolved issues inline and slept --poll-interval between
+passes. It is only run on the synthetic config with --serial, since it takes
+roughly the sum of all job durations.
+"""
+import argparse
+import contextlib
+import io
+import random
+import statistics
+import time
+
+import yaml
+
+from agent.orchestrator import JobAgent
+from jobsim.simulator import SimulatedJob, create_jobs_from_config
+
+
+def serial_monitor(agent, poll_interval):
+    # The previous JobAgent.monitor: one job at a time, resolution inline, a fixed sleep between passes
+    start = time.monotonic()
+    while True:
+        for job in agent.jobs:
+            if job.status == "pending":
+                job.run()
+                agent.runs += 1
+                if job.status in agent.config['resolution']:
+                    agent.handle_issue(job)
+                    agent.resolution_latencies.append(time.time() - job.end_time)
+        if all(job.status != "pending" for job in agent.jobs):
+            break
+        time.sleep(poll_interval)
+    agent.makespan = time.monotonic() - start
+    return agent.makespan
+
+
+def synthetic_jobs(count, base_jobs, seed):
+    rng = random.Random(seed)
+    return [{
+        "id": f"job{i}",
+        "expected_duration": rng.randint(5, 20),
+        "type": rng.choice(base_jobs)["type"],
+    } for i in range(count)]
+
+
+def run(config, jobs_cfg, scheduled, poll_interval, seed):
+    random.seed(seed)
+    agent = JobAgent(create_jobs_from_config(jobs_cfg), config, llm_client=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        makespan = agent.monitor() if scheduled else serial_monitor(agent, poll_interval)
+    latencies = sorted(agent.resolution_latencies) or [0.0]
+    return {
+        "jobs": len(jobs_cfg),
+        "runs": agent.runs,
+        "makespan s": makespan,
+        "resolved": len(agent.resolution_latencies),
+        "res p50 ms": statistics.median(latencies) * 1000,
+        "res p95 ms": latencies[int(len(latencies) * 0.95)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--time-scale", type=float, default=0.01, help="real seconds per unit of expected_duration")
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="sleep between passes of the previous monitor")
+    parser.add_argument("--jobs", type=int, default=10000, help="jobs in the synthetic config")
+    parser.add_argument("--synthetic-time-scale", type=float, default=0.001)
+    parser.add_argument("--max-workers", type=int, default=256, help="scheduler.max_workers for the synthetic config")
+    parser.add_argument("--resolution-workers", type=int, default=256)
+    parser.add_argument("--storm-types", nargs="*", default=["backup", "export"])
+    parser.add_argument("--type-limit", type=int, default=16)
+    parser.add_argument("--serial", action="store_true", help="also run the previous monitor on the synthetic config")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+    columns = ["jobs", "runs", "makespan s", "resolved", "res p50 ms", "res p95 ms"]
+    print(f"{'run':<24}" + "".join(f"{name:>12}" for name in columns))
+
+    def report(name, row):
+        print(f"{name:<24}" + "".join(
+            f"{row[c]:>12.1f}" if isinstance(row[c], float) else f"{row[c]:>12}" for c in columns))
+
+    SimulatedJob.time_scale = args.time_scale
+    report("config serial", run(config, config["jobs"], False, args.poll_interval, args.seed))
+    report("config scheduled", run(config, config["jobs"], True, args.poll_interval, args.seed))
+
+    SimulatedJob.time_scale = args.synthetic_time_scale
+    synthetic = dict(config, scheduler={
+        "max_workers": args.max_workers,
+        "resolution_workers": args.resolution_workers,
+        "type_limits": {job_type: args.type_limit for job_type in args.storm_types},
+    })
+    jobs_cfg = synthetic_jobs(args.jobs, config["jobs"], args.seed)
+    if args.serial:
+        report(f"{args.jobs} serial", run(synthetic, jobs_cfg, False, args.poll_interval, args.seed))
+    report(f"{args.jobs} scheduled", run(synthetic, jobs_cfg, True, args.poll_interval, args.seed))
+
+
+if __name__ == "__main__":
+    main()
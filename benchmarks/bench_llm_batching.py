@@ -0,0 +1,84 @@
+"""Per-event vs batched LLM classification against a local stub chat-completions server.
+
+    python -m benchmarks.bench_llm_batching --events 64 --batch-size 8
+
+Reports wall time, model round trips and prompt characters sent for
+LLMReasoningModule.decide (one request per event) and decide_batch.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import fakeredis
+import yaml
+
+import feedback.store
+from agentic.reasoning_llm import LLMReasoningModule
+from benchmarks.stub_llm_server import StubLLMServer
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+
+def write_config(endpoint):
+    # config.yaml pointed at the stub server
+    with open(CONFIG_PATH) as f:
+        config = yaml.safe_load(f)
+    config["llm"]["endpoint"] = endpoint
+    path = os.path.join(tempfile.mkdtemp(), "config.yaml")
+    with open(path, "w") as f:
+        yaml.safe_dump(config, f)
+    return path
+
+
+def make_events(n):
+    return [{
+        "job_id": i,
+        "status": "fail",
+        "event_type": "job_issue",
+        "details": {"timestamp": "2024-07-19T12:00:00Z", "source": f"Source{i % 7}", "description": f"Failure number {i}"},
+    } for i in range(n)]
+
+
+def build_module(config_path, batch_size):
+    module = LLMReasoningModule(config_path)
+    module.cache = None  # measure model traffic, not cache hits
+    module.batch_size = batch_size
+    return module
+
+
+def measure(server, fn):
+    server.requests = server.prompt_chars = 0
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start, server.requests, server.prompt_chars
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--overhead", type=float, default=0.05, help="stub seconds per request")
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())  # keep llm_analysis.log out of the tree
+    feedback.store.r = fakeredis.FakeRedis()
+    server = StubLLMServer(overhead=args.overhead).start()
+    events = make_events(args.events)
+    config_path = write_config(server.endpoint)
+    try:
+        per_event = build_module(config_path, 1)
+        batched = build_module(config_path, args.batch_size)
+        rows = [
+            ("per-event", measure(server, lambda: [per_event.decide(e, {}) for e in events])),
+            (f"batch={args.batch_size}", measure(server, lambda: batched.decide_batch(events, {}))),
+        ]
+    finally:
+        server.stop()
+    print(f"{'mode':<12}{'seconds':>10}{'events/sec':>12}{'requests':>10}{'prompt chars':>14}")
+    for name, (elapsed, requests, chars) in rows:
+        print(f"{name:<12}{elapsed:>10.2f}{args.events / elapsed:>12.1f}{requests:>10}{chars:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Per-event cost of logging and console output in the worker, synchronous vs queued.
+
+    python -m benchmarks.bench_logging --events 4096 --rounds 5
+
+Replays simulated events through agentic_worker.main.process_batch with every
+event reaching the (stub) LLM, so each one writes an llm_analysis.log line,
+runs the notifier and (at DEBUG) the per-event debug lines. Modes:
+
+  sync          rich console, FileHandler / StreamHandler on the calling thread, DEBUG
+                (how the worker logged before agentic.log)
+  queued        plain log records through the QueueHandler, background writer, DEBUG
+  queued INFO   as queued at the worker's default level: the debug lines are skipped
+
+"critical path" is the process_batch time per event; "drain" is the time the
+background writer still needed afterwards (agentic.log.flush). Output goes to
+files in a temporary LOG_DIR, never to the terminal.
+"""
+import argparse
+import itertools
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+import yaml
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=4096)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # Before anything creates the log files
+    directory = os.environ["LOG_DIR"] = tempfile.mkdtemp()
+    from rich.console import Console
+
+    import agentic.log
+    import notifications.notifier as notifier
+    from benchmarks.suite import reasoning_module, worker_module
+    from jobsim.load import LoadSimulator
+
+    with open("config.yaml") as f:
+        simulator = LoadSimulator.from_config(yaml.safe_load(f), seed=args.seed)
+    events = list(itertools.islice(simulator.events(args.events * 4), args.events))
+    payloads = [json.dumps(event) for event in events]
+    worker = worker_module(events)
+    worker.agent.reasoning_module = reasoning_module(fast_path=False, cache=False)
+
+    console_out = open(os.path.join(directory, "console.out"), "w", encoding="utf-8")
+    notifier.console = Console(file=console_out, force_terminal=True, width=120)
+    agentic.log.configure_logging(stream=console_out)
+    root = logging.getLogger()
+    file_loggers = [logging.getLogger(name) for name in ("llm_analysis", "escalation")]
+    queued = {logger.name: logger.handlers[:] for logger in [root] + file_loggers}
+    # Synchronous equivalents: the handlers write on the thread that logs
+    sync = {root.name: [logging.StreamHandler(console_out)]}
+    for logger in file_loggers:
+        handler = logging.FileHandler(os.path.join(directory, f"{logger.name}.sync.log"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter('%(asctime)s | %(message)s'))
+        sync[logger.name] = [handler]
+
+    modes = {
+        "sync": (True, sync, logging.DEBUG),
+        "queued": (False, queued, logging.DEBUG),
+        "queued INFO": (False, queued, logging.INFO),
+    }
+    timings = {mode: [] for mode in modes}
+    drains = {mode: [] for mode in modes}
+    for mode in itertools.islice(itertools.cycle(modes), len(modes) * (args.rounds + 1)):
+        rich, handlers, level = modes[mode]
+        notifier.rich_console = rich
+        for logger in [root] + file_loggers:
+            logger.handlers[:] = handlers[logger.name]
+        root.setLevel(level)
+        start = time.perf_counter()
+        for first in range(0, len(payloads), args.batch):
+            worker.process_batch(payloads[first:first + args.batch])
+        timings[mode].append((time.perf_counter() - start) / len(payloads))
+        start = time.perf_counter()
+        agentic.log.flush()
+        drains[mode].append((time.perf_counter() - start) / len(payloads))
+
+    # The first round of each mode warms caches and is dropped
+    baseline = statistics.median(timings["sync"][1:])
+    print(f"{'mode':<14}{'critical path':>16}{'drain':>14}{'vs sync':>10}")
+    for mode in modes:
+        per_event = statistics.median(timings[mode][1:])
+        drain = statistics.median(drains[mode][1:])
+        print(f"{mode:<14}{per_event * 1e6:>11.1f} us/ev{drain * 1e6:>9.1f} us/ev{per_event / baseline - 1:>+10.1%}")
+    agentic.log.stop()
+    console_out.close()
+
+
+if __name__ == "__main__":
+    main()
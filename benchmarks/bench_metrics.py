@@ -0,0 +1,104 @@
+"""Cost of the pipeline metrics: per call, per event in the worker and per flush.
+
+    python -m benchmarks.bench_metrics --events 4096 --rounds 7
+
+Times Metrics.observe / inc / timer on their own. Then it replays simulated
+events through agentic_worker.main.process_batch (stub LLM, fakeredis, as in
+benchmarks.suite), alternating rounds with metrics on and off, and reports
+the median per-event time of each. Finally it times one flush of every stage
+to fakeredis, which the worker does every WORKER_METRICS_INTERVAL.
+"""
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import statistics
+import time
+
+import fakeredis
+import yaml
+
+from agentic.metrics import STAGES, Metrics, metrics
+from benchmarks.suite import worker_module
+from jobsim.load import LoadSimulator
+
+
+def per_call(fn, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) / calls
+
+
+def micro(calls):
+    probe = Metrics()
+
+    def timed():
+        with probe.timer("decide"):
+            pass
+
+    costs = {
+        "observe": per_call(lambda: probe.observe("decide", 0.003), calls),
+        "inc": per_call(lambda: probe.inc("events_processed_total"), calls),
+        "timer": per_call(timed, calls),
+    }
+    probe.enabled = False
+    costs["timer (off)"] = per_call(timed, calls)
+    return costs
+
+
+def replay(events, batch, rounds):
+    worker = worker_module(events)
+    now = time.time()
+    payloads = [json.dumps(dict(event, enqueued_at=now)) for event in events]
+    timings = {True: [], False: []}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for enabled in itertools.islice(itertools.cycle((False, True)), 2 * rounds + 2):
+            metrics.enabled = enabled
+            start = time.perf_counter()
+            for first in range(0, len(payloads), batch):
+                worker.process_batch(payloads[first:first + batch])
+            timings[enabled].append((time.perf_counter() - start) / len(payloads))
+    metrics.enabled = True
+    # The first round of each mode warms caches and is dropped
+    return statistics.median(timings[False][1:]), statistics.median(timings[True][1:])
+
+
+def flush_cost(flushes):
+    client = fakeredis.FakeRedis(decode_responses=True)
+    probe = Metrics()
+    elapsed = 0.0
+    for _ in range(flushes):
+        for stage in STAGES:
+            for seconds in (0.0004, 0.003, 0.04, 0.7):
+                probe.observe(stage, seconds)
+        probe.inc("events_processed_total", 100)
+        start = time.perf_counter()
+        probe.flush(client)
+        elapsed += time.perf_counter() - start
+    return elapsed / flushes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--events", type=int, default=4096)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for name, seconds in micro(args.calls).items():
+        print(f"{name:<16}{seconds * 1e9:>10.0f} ns/call")
+    with open("config.yaml") as f:
+        simulator = LoadSimulator.from_config(yaml.safe_load(f), seed=args.seed)
+    events = list(itertools.islice(simulator.events(args.events * 4), args.events))
+    off, on = replay(events, args.batch, args.rounds)
+    print(f"\nprocess_batch   metrics off {off * 1e6:>8.1f} us/event")
+    print(f"process_batch   metrics on  {on * 1e6:>8.1f} us/event  ({on - off:+.2e} s, {on / off - 1:+.1%})")
+    print(f"\nflush of {len(STAGES)} stages {flush_cost(200) * 1000:>8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Linear find_remediation_action scan vs the compiled rule index.
+
+    python -m benchmarks.bench_remediation_rules --rules 1000 --events 100000
+
+Generates synthetic rules spread over sources/statuses with description
+substrings, checks both matchers agree on every event and reports events/sec.
+"""
+import argparse
+import random
+import time
+
+from remediation.engine import CompiledRules, find_remediation_action
+
+STATUSES = ["fail", "warning", "escalate", "stuck"]
+WORDS = ["disk", "full", "crash", "timeout", "retry", "quota", "denied", "overheat", "network", "update"]
+
+
+def make_rules(n, sources, rng):
+    rules = []
+    for i in range(n):
+        match = {"event_type": "job_issue", "source": rng.choice(sources)}
+        if rng.random() < 0.7:
+            match["status"] = rng.choice(STATUSES)
+        match["description_contains"] = f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+        rules.append({"match": match, "action": f"action_{i}"})
+    return rules
+
+
+def make_events(n, sources, rng):
+    return [{
+        "job_id": i,
+        "status": rng.choice(STATUSES),
+        "event_type": "job_issue",
+        "details": {
+            "source": rng.choice(sources),
+            "description": " ".join(rng.choice(WORDS).upper() for _ in range(6)),
+        },
+    } for i in range(n)]
+
+
+def timed(fn, events):
+    start = time.perf_counter()
+    results = [fn(event) for event in events]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--sources", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    sources = [f"Source{i}" for i in range(args.sources)]
+    rules = make_rules(args.rules, sources, rng)
+    events = make_events(args.events, sources, rng)
+
+    start = time.perf_counter()
+    compiled = CompiledRules(rules)
+    compile_time = time.perf_counter() - start
+    linear_time, linear = timed(lambda e: find_remediation_action(e, rules), events)
+    compiled_time, indexed = timed(compiled.match, events)
+    assert linear == indexed, "compiled matcher disagrees with the linear scan"
+
+    matched = sum(1 for r in indexed if r is not None)
+    print(f"{args.rules} rules x {args.events} events, {matched} matched, compile {compile_time * 1000:.1f} ms")
+    print(f"{'matcher':<10}{'seconds':>10}{'events/sec':>14}")
+    print(f"{'linear':<10}{linear_time:>10.2f}{args.events / linear_time:>14.0f}")
+    print(f"{'compiled':<10}{compiled_time:>10.2f}{args.events / compiled_time:>14.0f}")
+    print(f"speedup: {linear_time / compiled_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Downstream work with and without the worker's suppression window.
+
+    python -m benchmarks.bench_suppression --events 20000 --rate 50 --window 60
+
+Replays a noisy stream through agentic_worker.main.process_batch: --rate
+events per second on a virtual clock, drawn from --failures distinct failures
+with a Zipf-like skew (a few failures fire most of the time, as a stuck job or
+a flapping source does). Reasoning is the rule-based module and the effector
+only counts calls, so the table shows the work suppression removes: decisions,
+effector calls, history records written and Redis commands sent.
+"""
+import argparse
+import contextlib
+import io
+import json
+import random
+import time
+
+import fakeredis
+
+import agentic_worker.main as worker
+from agentic.base import Effector
+from agentic.memory import Memory
+from agentic.reasoning_simple import SimpleReasoningModule
+from agentic.suppression import EventSuppressor
+from history.store import count_records
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingReasoning(SimpleReasoningModule):
+    def __init__(self):
+        self.calls = 0
+
+    def decide(self, event, context):
+        self.calls += 1
+        return super().decide(event, context)
+
+
+class CountingEffector(Effector):
+    def __init__(self):
+        self.calls = 0
+
+    def execute(self, action, params):
+        self.calls += 1
+
+
+class CommandCounter:
+    # Wraps a redis client and counts the commands it sends, pipelined or not
+    def __init__(self, client):
+        self.client = client
+        self.commands = 0
+
+    def pipeline(self, *args, **kwargs):
+        pipe = self.client.pipeline(*args, **kwargs)
+        execute = pipe.execute
+
+        def counted():
+            self.commands += len(pipe.command_stack)
+            return execute()
+
+        pipe.execute = counted
+        return pipe
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if not callable(attr):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.commands += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+def make_stream(events, failures, seed):
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(failures)]
+    picks = rng.choices(range(failures), weights=weights, k=events)
+    return [json.dumps({
+        "job_id": failure % 50,
+        "status": "fail",
+        "event_type": "job_issue",
+        "event_id": f"evt-{i}",
+        "details": {"source": f"Source{failure % 7}", "description": f"failure {failure}"},
+    }) for i, failure in enumerate(picks)]
+
+
+def replay(payloads, rate, batch, window):
+    clock = VirtualClock()
+    client = CommandCounter(fakeredis.FakeRedis(decode_responses=True))
+    reasoning, effector = CountingReasoning(), CountingEffector()
+    worker.redis_client = client
+    worker.agent.memory = Memory(max_records=1000)
+    worker.agent.reasoning_module = reasoning
+    worker.agent.effectors = [effector]
+    worker.agent.suppressor = EventSuppressor(window_seconds=window, clock=clock) if window else None
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for first in range(0, len(payloads), batch):
+            clock.now = first / rate
+            worker.process_batch(payloads[first:first + batch])
+    elapsed = time.perf_counter() - start
+    stats = worker.agent.suppressor.stats() if worker.agent.suppressor else {"suppression_ratio": 0.0}
+    return {
+        "ratio": stats["suppression_ratio"],
+        "decisions": reasoning.calls,
+        "effector calls": effector.calls,
+        "records": count_records(client.client),
+        "redis cmds": client.commands,
+        "seconds": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--rate", type=float, default=50, help="events per virtual second")
+    parser.add_argument("--failures", type=int, default=500, help="distinct failures in the stream")
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--window", type=float, nargs="+", default=[0, 10, 60, 300], help="suppression windows (0 = off)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    payloads = make_stream(args.events, args.failures, args.seed)
+    print(f"{args.events} events over {args.events / args.rate:.0f}s, {args.failures} distinct failures")
+    columns = ["ratio", "decisions", "effector calls", "records", "redis cmds", "seconds"]
+    print(f"{'window':>8}" + "".join(f"{name:>16}" for name in columns))
+    for window in args.window:
+        row = replay(payloads, args.rate, args.batch, window)
+        print(f"{window:>8g}" + "".join(
+            f"{row[name]:>16.2f}" if isinstance(row[name], float) else f"{row[name]:>16}" for name in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Measure worker throughput as WORKER_CONCURRENCY grows, against a stub LLM.
+
+The stub replaces the model call with a fixed sleep, Redis is an in-process
+fakeredis, and console output is silenced:
+
+    python -m benchmarks.bench_worker_concurrency --events 64 --latency 0.05
+
+Throughput should scale roughly linearly until the concurrency reaches
+llm.max_concurrency (the cap on outstanding model calls).
+"""
+import argparse
+import contextlib
+import io
+import json
+import threading
+import time
+
+import fakeredis
+
+import feedback.store
+import agentic_worker.main as worker
+from agentic_worker.dispatcher import KeyedDispatcher
+from notifications import notifier
+
+
+def install_stubs(latency, llm_slots):
+    server = fakeredis.FakeServer()
+    worker.redis_client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    worker.agent.suppressor = None  # every level replays the same payloads
+    feedback.store.r = fakeredis.FakeRedis(server=server)
+    client = worker.agent.reasoning_module.llm_client
+    client._slots = threading.BoundedSemaphore(llm_slots)
+
+    def fake_complete(prompt):
+        time.sleep(latency)
+        return "notify the on-call team"
+
+    client._complete = fake_complete
+    notifier.console.quiet = True
+
+
+def make_payloads(n, jobs):
+    return [json.dumps({
+        "job_id": i % jobs,
+        "status": "fail",
+        "event_type": "job_issue",
+        "details": {"source": "Bench", "description": f"event {i}"},
+    }) for i in range(n)]
+
+
+def run(concurrency, payloads):
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        if concurrency == 1:
+            worker.process_batch(payloads)
+        else:
+            dispatcher = KeyedDispatcher(max_workers=concurrency)
+            worker.dispatch_batch(payloads, dispatcher)
+            dispatcher.shutdown()
+        return len(payloads) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=64)
+    parser.add_argument("--jobs", type=int, default=64, help="distinct job_ids (ordering keys)")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub LLM seconds per call")
+    parser.add_argument("--levels", default="1,2,4,8,16")
+    args = parser.parse_args()
+
+    levels = [int(x) for x in args.levels.split(",")]
+    install_stubs(args.latency, max(levels))
+    payloads = make_payloads(args.events, args.jobs)
+    baseline = None
+    print(f"{'concurrency':<14}{'events/sec':>12}{'speedup':>10}")
+    for level in levels:
+        rate = run(level, payloads)
+        baseline = baseline or rate
+        print(f"{level:<14}{rate:>12.1f}{rate / baseline:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Compare the legacy lpop + sleep(1) worker loop with the blocking, batched EventQueue.
+
+Runs against an in-process fakeredis server, so no Redis or LLM is needed:
+
+    python -m benchmarks.bench_worker_consumer --events 20000 --bursts 10
+
+Two phases per mode:
+  * drain: the queue is pre-filled and we measure events/sec until it is empty
+  * bursty: a producer pushes bursts separated by idle gaps and we measure the
+    queue-to-decision latency (p50/p99) seen by each event
+"""
+import argparse
+import json
+import threading
+import time
+
+import fakeredis
+
+from agentic_worker.event_queue import EventQueue
+
+QUEUE = "bench:events"
+
+
+def make_event(i):
+    return json.dumps({
+        "job_id": i,
+        "status": "fail",
+        "event_type": "job_issue",
+        "details": {"source": "Bench", "description": f"synthetic event {i}"},
+        "enqueued_at": time.perf_counter(),
+    })
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class Sink:
+    # Stand-in for process_event: records queue-to-decision latency
+    def __init__(self):
+        self.latencies = []
+        self.count = 0
+
+    def __call__(self, payload):
+        event = json.loads(payload)
+        self.latencies.append(time.perf_counter() - event["enqueued_at"])
+        self.count += 1
+
+
+def run_poll(client, sink, stop):
+    # The original worker loop
+    while not stop.is_set():
+        payload = client.lpop(QUEUE)
+        if payload:
+            sink(payload)
+        else:
+            time.sleep(1)
+
+
+def run_blocking(client, sink, stop, max_batch, max_wait):
+    queue = EventQueue(client, QUEUE, max_batch=max_batch, max_wait=max_wait)
+    while not stop.is_set():
+        for payload in queue.fetch():
+            sink(payload)
+
+
+def start_consumer(mode, client, sink, stop, args):
+    if mode == "poll":
+        target, extra = run_poll, ()
+    else:
+        target, extra = run_blocking, (args.max_batch, args.max_wait)
+    thread = threading.Thread(target=target, args=(client, sink, stop) + extra, daemon=True)
+    thread.start()
+    return thread
+
+
+def drain_phase(mode, server, args):
+    producer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    consumer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    producer.delete(QUEUE)
+    pipe = producer.pipeline(transaction=False)
+    for i in range(args.events):
+        pipe.rpush(QUEUE, make_event(i))
+    pipe.execute()
+    sink, stop = Sink(), threading.Event()
+    start = time.perf_counter()
+    thread = start_consumer(mode, consumer, sink, stop, args)
+    while sink.count < args.events:
+        time.sleep(0.01)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    thread.join(timeout=2)
+    return args.events / elapsed
+
+
+def bursty_phase(mode, server, args):
+    producer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    consumer = fakeredis.FakeRedis(server=server, decode_responses=True)
+    producer.delete(QUEUE)
+    sink, stop = Sink(), threading.Event()
+    thread = start_consumer(mode, consumer, sink, stop, args)
+    total = 0
+    for burst in range(args.bursts):
+        time.sleep(args.gap)
+        producer.rpush(QUEUE, *[make_event(total + i) for i in range(args.burst_size)])
+        total += args.burst_size
+    deadline = time.time() + 5
+    while sink.count < total and time.time() < deadline:
+        time.sleep(0.01)
+    stop.set()
+    thread.join(timeout=2)
+    return percentile(sink.latencies, 50), percentile(sink.latencies, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--bursts", type=int, default=8)
+    parser.add_argument("--burst-size", type=int, default=50)
+    parser.add_argument("--gap", type=float, default=0.7, help="idle seconds between bursts")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait", type=float, default=1.0)
+    args = parser.parse_args()
+
+    server = fakeredis.FakeServer()
+    print(f"{'mode':<10}{'events/sec':>14}{'p50 ms':>12}{'p99 ms':>12}")
+    for mode in ("poll", "blocking"):
+        rate = drain_phase(mode, server, args)
+        p50, p99 = bursty_phase(mode, server, args)
+        print(f"{mode:<10}{rate:>14.0f}{p50 * 1000:>12.1f}{p99 * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
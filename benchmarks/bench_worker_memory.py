@@ -0,0 +1,76 @@
+"""Worker heap over a long replay: unbounded history vs the retention policy.
+
+    python -m benchmarks.bench_worker_memory --events 50000 --checkpoints 5
+
+Replays synthetic events through agentic_worker.main.process_batch with the
+rule-based reasoning module and an in-process fakeredis, so the Redis history
+is part of the traced Python heap too. At one event per second, 50k events is
+about 14 hours of traffic (scale --events up for multi-day runs). Modes:
+  * unbounded: Memory() and no retention (the old behaviour)
+  * bounded: Memory(max_records) plus apply_retention into a temp archive
+"""
+import argparse
+import contextlib
+import json
+import os
+import tempfile
+import tracemalloc
+
+import fakeredis
+
+import agentic_worker.main as worker
+from agentic.memory import Memory
+from agentic.reasoning_simple import SimpleReasoningModule
+from history.archive import SegmentArchive, apply_retention
+from history.store import count_records
+
+
+def make_payload(i):
+    return json.dumps({
+        "job_id": i % 500,
+        "status": ("fail", "warning", "escalate")[i % 3],
+        "event_type": "job_issue",
+        "details": {"source": f"Source{i % 7}", "description": f"synthetic failure {i}"},
+    })
+
+
+def replay(args, bounded):
+    worker.redis_client = fakeredis.FakeRedis(decode_responses=True)
+    worker.agent.memory = Memory(max_records=args.memory_records) if bounded else Memory()
+    worker.agent.reasoning_module = SimpleReasoningModule()
+    worker.agent.effectors = []
+    archive = SegmentArchive(tempfile.mkdtemp())
+    every = max(1, args.events // args.checkpoints)
+    next_checkpoint = every
+    samples = []
+    tracemalloc.start()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for start in range(0, args.events, args.batch):
+            worker.process_batch([make_payload(i) for i in range(start, start + args.batch)])
+            done = start + args.batch
+            if done >= next_checkpoint:
+                next_checkpoint += every
+                if bounded:
+                    apply_retention(worker.redis_client, archive, max_records=args.redis_records)
+                samples.append((done, tracemalloc.get_traced_memory()[0], count_records(worker.redis_client)))
+    tracemalloc.stop()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--checkpoints", type=int, default=5)
+    parser.add_argument("--batch", type=int, default=32)
+    parser.add_argument("--memory-records", type=int, default=1000)
+    parser.add_argument("--redis-records", type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'mode':<10}{'events':>10}{'heap MB':>10}{'redis records':>15}")
+    for name, bounded in (("unbounded", False), ("bounded", True)):
+        for done, heap, records in replay(args, bounded):
+            print(f"{name:<10}{done:>10}{heap / 1e6:>10.1f}{records:>15}")
+
+
+if __name__ == "__main__":
+    main()
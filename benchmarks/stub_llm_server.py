@@ -0,0 +1,101 @@
+"""Minimal OpenAI-compatible chat completions server for benchmarks and tests.
+
+Simulates model cost as a fixed per-request overhead plus a prefill cost per
+prompt character, and can inject failures. Batch prompts (the ones asking for
+a JSON object) are answered with a label for every "Event N:" block.
+
+    python -m benchmarks.stub_llm_server --port 1234 --overhead 0.05
+"""
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+EVENT_BLOCK = re.compile(r"^Event (\d+):", re.MULTILINE)
+
+
+class StubLLMServer:
+    def __init__(self, host="127.0.0.1", port=0, overhead=0.05, per_char=0.00002, fail_every=0, reply="notify the owner"):
+        self.overhead = overhead
+        self.per_char = per_char
+        self.fail_every = fail_every
+        self.fail_next = 0  # fail this many upcoming requests
+        self.reply = reply
+        self.requests = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def _answer(self, prompt):
+        numbers = EVENT_BLOCK.findall(prompt)
+        if numbers and "JSON object" in prompt:
+            return json.dumps({n: "notify" for n in numbers})
+        return self.reply
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # headers and body go out in separate writes on keep-alive connections
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                prompt = "".join(m.get("content", "") for m in body.get("messages", []))
+                with stub._lock:
+                    stub.requests += 1
+                    stub.prompt_chars += len(prompt)
+                    failing = stub.fail_next > 0 or (stub.fail_every and stub.requests % stub.fail_every == 0)
+                    stub.fail_next = max(0, stub.fail_next - 1)
+                time.sleep(stub.overhead + stub.per_char * len(prompt))
+                if failing:
+                    self._send(500, {"error": {"message": "injected failure"}})
+                    return
+                self._send(200, {"choices": [{"message": {"role": "assistant", "content": stub._answer(prompt)}}]})
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=1234)
+    parser.add_argument("--overhead", type=float, default=0.05)
+    parser.add_argument("--per-char", type=float, default=0.00002)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+    server = StubLLMServer(port=args.port, overhead=args.overhead, per_char=args.per_char, fail_every=args.fail_every)
+    print(f"Stub LLM listening on {server.endpoint}")
+    server.httpd.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+"""Benchmark suite for the event pipeline, with JSON results for regression checks.
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --compare baseline.json --threshold 0.2
+    python -m benchmarks.suite -k api --repeat 10
+
+Every case runs a fixed batch of operations: one warmup round, then --repeat
+timed rounds. It reports the median time per operation and operations per
+second. Events come from the jobsim.load simulator, so every run sees the same
+input. Redis is an in-process fakeredis and the LLM is a stub that answers
+instantly, so the numbers measure this code, not the network or the model. The
+API cases call the ASGI app directly, without a socket: routing, validation,
+handlers and the fake Redis are all timed.
+
+--output writes the results and the environment (git commit, Python, CPU count)
+as JSON. --compare reads an earlier file and exits with status 1 if any case's
+median time per operation grew by more than --threshold.
+"""
+import argparse
+import asyncio
+import contextlib
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import fakeredis
+import yaml
+
+from jobsim.load import LoadSimulator
+
+CASES = {}
+
+
+def case(name, ops):
+    # Register fn(events) -> callable that performs `ops` operations per call
+    def register(fn):
+        CASES[name] = (fn, ops)
+        return fn
+    return register
+
+
+def stub_llm(module):
+    # Answers instantly with a fixed suggestion; everything around the HTTP call still runs
+    module.llm_client._complete = lambda prompt: "Restart the service and notify the on-call engineer."
+    return module
+
+
+def reasoning_module(fast_path=True, cache=True):
+    import feedback.store
+    from agentic.reasoning_llm import LLMReasoningModule
+    feedback.store.r = fakeredis.FakeRedis()  # feedback lookups for the prompt
+    module = stub_llm(LLMReasoningModule())
+    if not fast_path:
+        module.fast_path = module.fast_path._replace(enabled=False)
+    if not cache:
+        module.cache = None
+    return module
+
+
+@case("remediation.find_remediation_action", ops=10000)
+def bench_find_remediation_action(events):
+    from remediation.engine import find_remediation_action, load_remediation_rules
+    rules = load_remediation_rules()
+    batch = events[:10000]
+    return lambda: [find_remediation_action(event, rules) for event in batch]
+
+
+@case("remediation.compiled_rules", ops=10000)
+def bench_compiled_rules(events):
+    from remediation.engine import compile_remediation_rules, find_remediation_action, load_remediation_rules
+    rules = compile_remediation_rules(load_remediation_rules())
+    batch = events[:10000]
+    return lambda: [find_remediation_action(event, rules) for event in batch]
+
+
+@case("csv.map_status", ops=10000)
+def bench_map_status(events):
+    from agentic.kaggle_csv_sensor import map_status
+    levels = list(itertools.islice(itertools.cycle(
+        ["Erro", "Aviso", "Informações", "Crítico", "Debug", "Alerta", "Trace", "Fatal", "Emergência", "Outro"]), 10000))
+    return lambda: [map_status(level) for level in levels]
+
+
+@case("reasoning.decide.llm", ops=1000)
+def bench_decide_llm(events):
+    # Every event reaches the (stub) LLM: feedback lookup, prompt, logging and parsing
+    module = reasoning_module(fast_path=False, cache=False)
+    batch = events[:1000]
+    return lambda: [module.decide(event, {}) for event in batch]
+
+
+@case("reasoning.decide.cached", ops=1000)
+def bench_decide_cached(events):
+    # Configured fast path and decision cache, warmed by the warmup round
+    module = reasoning_module()
+    batch = events[:1000]
+    return lambda: [module.decide(event, {}) for event in batch]
+
+
+def worker_module(events):
+    import agentic_worker.main as worker
+    from agentic.memory import Memory
+    worker.redis_client = fakeredis.FakeRedis(decode_responses=True)
+    worker.agent.memory = Memory(max_records=1000)
+    worker.agent.reasoning_module = reasoning_module()
+    worker.agent.suppressor = None  # every event takes the full path
+    return worker
+
+
+@case("worker.process_event", ops=1000)
+def bench_process_event(events):
+    worker = worker_module(events)
+    batch = events[:1000]
+    return lambda: [worker.process_event(event) for event in batch]
+
+
+@case("worker.process_batch", ops=1024)
+def bench_process_batch(events):
+    worker = worker_module(events)
+    payloads = [json.dumps(event) for event in events[:1024]]
+    return lambda: [worker.process_batch(payloads[start:start + 32]) for start in range(0, len(payloads), 32)]
+
+
+async def asgi_request(app, method, path, query="", body=None):
+    # One request straight through the ASGI app; returns (status, body bytes)
+    payload = b"" if body is None else json.dumps(body).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": query.encode(),
+        "headers": [(b"host", b"bench"), (b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())],
+        "client": ("127.0.0.1", 50000), "server": ("bench", 80),
+    }
+    received = False
+    response = {}
+
+    async def receive():
+        nonlocal received
+        if received:
+            return {"type": "http.disconnect"}
+        received = True
+        return {"type": "http.request", "body": payload, "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"] = response.get("body", b"") + message.get("body", b"")
+
+    await app(scope, receive, send)
+    return response["status"], response.get("body", b"")
+
+
+def api_app(events, history=10000):
+    # api.main.app over a fakeredis server seeded with `history` records of the simulated events
+    import api.main
+    import feedback.store
+    from history.store import write_records
+    server = fakeredis.FakeServer()
+    seed = fakeredis.FakeRedis(server=server, decode_responses=True)
+    records = [{"event": event, "actions": [{"type": "notify", "params": {}}], "outcomes": [None]} for event in events[:history]]
+    for start in range(0, len(records), 5000):
+        write_records(seed, records[start:start + 5000])
+    api.main.app.state.redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    feedback.store.r = fakeredis.FakeRedis(server=server)
+    return api.main.app
+
+
+def api_case(app, requests):
+    # Run the requests in order on one event loop; every response must be a 200
+    def run():
+        async def go():
+            for method, path, query, body in requests:
+                status, content = await asgi_request(app, method, path, query, body)
+                if status != 200:
+                    raise RuntimeError(f"{method} {path}?{query} returned {status}: {content[:200]!r}")
+        asyncio.run(go())
+    return run
+
+
+@case("api.post_event", ops=1000)
+def bench_post_event(events):
+    fields = ("job_id", "status", "event_type", "details", "event_id")
+    return api_case(api_app(events, history=0), [("POST", "/event", "", {k: event[k] for k in fields}) for event in events[:1000]])
+
+
+@case("api.get_history", ops=200)
+def bench_get_history(events):
+    pages = [("GET", "/history", "limit=100", None)] * 100 + [("GET", "/history", "limit=100&status=stuck", None)] * 100
+    return api_case(api_app(events), pages)
+
+
+@case("api.post_feedback", ops=500)
+def bench_post_feedback(events):
+    return api_case(api_app(events), [("POST", "/feedback", "", {"event_id": event["event_id"], "user": "bench", "rating": 4, "comment": "ok"})
+                     for event in events[:500]])
+
+
+def measure(run, ops, repeat):
+    run()  # warmup: imports, caches, lazily built indexes
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        rounds.append(time.perf_counter() - start)
+    median = statistics.median(rounds)
+    return {
+        "ops": ops,
+        "rounds": [round(r, 6) for r in rounds],
+        "median_s": median,
+        "min_s": min(rounds),
+        "stdev_s": statistics.stdev(rounds) if len(rounds) > 1 else 0.0,
+        "us_per_op": median / ops * 1e6,
+        "ops_per_sec": ops / median,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    # Cases whose median us/op grew by more than threshold (a fraction) against the baseline
+    regressions = []
+    print(f"\n{'case':<40}{'baseline us':>14}{'current us':>14}{'change':>10}")
+    for name, current in results.items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<40}{'-':>14}{current['us_per_op']:>14.2f}{'new':>10}")
+            continue
+        change = current["us_per_op"] / before["us_per_op"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        print(f"{name:<40}{before['us_per_op']:>14.2f}{current['us_per_op']:>14.2f}{change:>+10.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", help="results JSON of an earlier run to check against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown per case before failing --compare")
+    args = parser.parse_args()
+
+    names = [name for name in CASES if not args.pattern or args.pattern in name]
+    if args.list:
+        print("\n".join(names))
+        return
+    with open("config.yaml") as f:
+        simulator = LoadSimulator.from_config(yaml.safe_load(f), seed=args.seed)
+    events = list(itertools.islice(simulator.events(100000), 20000))
+
+    results = {}
+    print(f"{'case':<40}{'ops':>8}{'median ms':>12}{'us/op':>10}{'ops/sec':>12}")
+    for name in names:
+        setup, ops = CASES[name]
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = measure(setup(events), ops, args.repeat)
+        results[name] = result
+        print(f"{name:<40}{ops:>8}{result['median_s'] * 1000:>12.2f}{result['us_per_op']:>10.2f}{result['ops_per_sec']:>12.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"suite": "autoremedy", "environment": environment(), "repeat": args.repeat, "seed": args.seed,
+                       "results": results}, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,13 +6,25 @@ r = redis.Redis()
 
 def event_hash(event):
     # Use relevant fields for hash (customize as needed)
-    key = f"{event.get('event_type')}|{event.get('details', {}).get('source')}|{event.get('details', {}).get('description')}"
+    details = event.get('details') or {}  # the API queues events without details as "details": null
+    key = f"{event.get('event_type')}|{details.get('source')}|{details.get('description')}"
     return hashlib.sha256(key.encode('utf-8')).hexdigest()
 
-def store_feedback(event, action, feedback, comment=None):
-    key = f"feedback:event:{event_hash(event)}"
+def decision_cache_key(hash_value):
+    # Shared LLM decision cache entries for one event hash (see agentic.decision_cache)
+    return f"decision_cache:{hash_value}"
+
+def store_feedback(event, action, feedback, comment=None, hash_value=None):
+    # hash_value may be passed when already known (e.g. from the history event index)
+    if hash_value is None:
+        hash_value = event_hash(event)
+    key = f"feedback:event:{hash_value}"
     entry = {"action": action, "feedback": feedback, "comment": comment}
-    r.rpush(key, json.dumps(entry))
+    pipe = r.pipeline()
+    pipe.rpush(key, json.dumps(entry))
+    # New feedback changes the prompt, so cached decisions for this event are stale
+    pipe.delete(decision_cache_key(hash_value))
+    pipe.execute()
 
 def get_feedback(event):
     key = f"feedback:event:{event_hash(event)}"
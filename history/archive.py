@@ -0,0 +1,196 @@
+import gzip
+import json
+import os
+import re
+import struct
+import threading
+import time
+import uuid
+
+import redis
+
+from agentic.records import dumps, loads
+from history.store import (
+    MAX_SCAN, count_records, is_escalated, oldest_records, record_matches, remove_records,
+)
+
+RETENTION_LOCK = "agentic:history:retention_lock"
+
+SEGMENT_MAGIC = b"AHSEG001"
+FOOTER_LENGTH = struct.Struct(">Q")
+SEGMENT_NAME = re.compile(r"^history-(\d+)-(\d+)\.seg$")
+
+
+class SegmentArchive:
+    """Append-only archive of history records evicted from Redis.
+
+    Every append writes one immutable segment file named after its record id
+    range. A segment is a run of independently gzipped JSONL blocks followed by
+    a JSON footer (then its length and a magic trailer) that lists each block's
+    offset, length, id range, processed_at range, statuses and whether it holds
+    escalations, so a query only decompresses blocks that can match.
+    """
+
+    def __init__(self, directory, block_size=1000):
+        self.directory = directory
+        self.block_size = block_size
+        self._footers = {}  # path -> footer; segments never change once written
+        self._lock = threading.Lock()
+
+    def append(self, records):
+        if not records:
+            return None
+        records = sorted(records, key=lambda r: r['id'])
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"history-{records[0]['id']:012d}-{records[-1]['id']:012d}.seg")
+        blocks = []
+        with open(path + ".tmp", "wb") as f:
+            for start in range(0, len(records), self.block_size):
+                block = records[start:start + self.block_size]
+                data = gzip.compress(b"".join(dumps(r) + b"\n" for r in block))
+                times = [r.get('processed_at', 0) for r in block]
+                blocks.append({
+                    'offset': f.tell(),
+                    'length': len(data),
+                    'first_id': block[0]['id'],
+                    'last_id': block[-1]['id'],
+                    'min_time': min(times),
+                    'max_time': max(times),
+                    'statuses': sorted({str((r.get('event') or {}).get('status')) for r in block}),
+                    'escalated': any(is_escalated(r) for r in block),
+                })
+                f.write(data)
+            footer = json.dumps({'count': len(records), 'blocks': blocks}).encode("utf-8")
+            f.write(footer + FOOTER_LENGTH.pack(len(footer)) + SEGMENT_MAGIC)
+            f.flush()
+            os.fsync(f.fileno())
+        # Readers only ever see complete segments
+        os.replace(path + ".tmp", path)
+        return path
+
+    def segments(self):
+        # [(first id, last id, path)] oldest first
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        found = []
+        for name in names:
+            m = SEGMENT_NAME.match(name)
+            if m:
+                found.append((int(m.group(1)), int(m.group(2)), os.path.join(self.directory, name)))
+        return sorted(found)
+
+    def footer(self, path):
+        with self._lock:
+            cached = self._footers.get(path)
+        if cached is not None:
+            return cached
+        trailer = FOOTER_LENGTH.size + len(SEGMENT_MAGIC)
+        with open(path, "rb") as f:
+            f.seek(-trailer, os.SEEK_END)
+            tail = f.read(trailer)
+            if tail[FOOTER_LENGTH.size:] != SEGMENT_MAGIC:
+                raise ValueError(f"Not a history segment: {path}")
+            (length,) = FOOTER_LENGTH.unpack(tail[:FOOTER_LENGTH.size])
+            f.seek(-(trailer + length), os.SEEK_END)
+            footer = json.loads(f.read(length))
+        with self._lock:
+            self._footers[path] = footer
+        return footer
+
+    def read_block(self, path, block):
+        with open(path, "rb") as f:
+            f.seek(block['offset'])
+            data = gzip.decompress(f.read(block['length']))
+        return [loads(line) for line in data.splitlines() if line]
+
+    def query(self, limit=100, cursor=None, job_id=None, status=None, escalated=None, since=None, until=None, max_scan=MAX_SCAN):
+        # Same contract as history.store.query_history, over the archived (older) records
+        records = []
+        scanned = 0
+        for first_id, _, path in reversed(self.segments()):
+            if cursor is not None and first_id >= cursor:
+                continue
+            for block in reversed(self.footer(path)['blocks']):
+                if ((cursor is not None and block['first_id'] >= cursor) or
+                        (since is not None and block['max_time'] < since) or
+                        (until is not None and block['min_time'] > until) or
+                        (status is not None and str(status) not in block['statuses']) or
+                        (escalated and not block['escalated'])):
+                    continue
+                if scanned >= max_scan:
+                    return records, block['last_id'] + 1
+                rows = self.read_block(path, block)
+                scanned += len(rows)
+                for record in reversed(rows):
+                    if cursor is not None and record['id'] >= cursor:
+                        continue
+                    if record_matches(record, job_id, status, escalated, since, until):
+                        records.append(record)
+                        if len(records) == limit:
+                            return records, record['id']
+        return records, None
+
+
+def _holds_lock(client, token, renew_ttl=None):
+    # Check-and-set under WATCH: only touch the lock while it still holds this run's token, so a run that
+    # outlived lock_ttl never extends or deletes the lock another worker has taken since
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch(RETENTION_LOCK)
+            if pipe.get(RETENTION_LOCK) not in (token, token.encode()):
+                pipe.unwatch()
+                return False
+            pipe.multi()
+            if renew_ttl is None:
+                pipe.delete(RETENTION_LOCK)
+            else:
+                pipe.expire(RETENTION_LOCK, renew_ttl)
+            pipe.execute()
+            return True
+        except redis.WatchError:
+            return False
+
+
+def apply_retention(client, archive, max_records=None, max_age=None, chunk=10000, now=None, lock_ttl=600):
+    """Move the oldest history records out of Redis into the archive.
+
+    Records beyond max_records, and records whose processed_at is more than
+    max_age seconds old, are evicted oldest id first, chunk records (one
+    segment) at a time. Each chunk is written to the archive before it is
+    deleted from Redis. A Redis lock keeps concurrent workers from archiving
+    the same records; it is renewed for every chunk, and a run that finds it
+    has lost the lock stops. Returns the number of records evicted.
+    """
+    if not max_records and not max_age:
+        return 0
+    token = f"{os.getpid()}:{uuid.uuid4().hex}"
+    if not client.set(RETENTION_LOCK, token, nx=True, ex=lock_ttl):
+        return 0
+    try:
+        cutoff = (time.time() if now is None else now) - max_age if max_age else None
+        evicted = 0
+        while True:
+            if evicted and not _holds_lock(client, token, renew_ttl=lock_ttl):
+                return evicted
+            entries = oldest_records(client, chunk)
+            over = count_records(client) - max_records if max_records else 0
+            expired = 0
+            if cutoff is not None:
+                for _, record in entries:
+                    if record is not None and record.get('processed_at', 0) >= cutoff:
+                        break
+                    expired += 1
+            take = min(len(entries), max(over, expired))
+            if take <= 0:
+                return evicted
+            entries = entries[:take]
+            if archive is not None:
+                archive.append([record for _, record in entries if record is not None])
+            remove_records(client, entries)
+            evicted += take
+            if take < chunk:
+                return evicted
+    finally:
+        _holds_lock(client, token)
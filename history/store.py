@@ -0,0 +1,273 @@
+import time
+
+from agentic.records import HistoryEntry, dumps, loads
+from feedback.store import event_hash
+
+# History records live in one hash keyed by a sequential record id; the sorted
+# sets below index those ids so /history can page and filter without loading
+# the whole history. Index scores are record ids (newest = highest), except
+# TIME_INDEX which is scored by processed_at for time-range lookups.
+HISTORY_PREFIX = "agentic:history"
+SEQ_KEY = f"{HISTORY_PREFIX}:seq"
+RECORDS_KEY = f"{HISTORY_PREFIX}:records"
+ALL_INDEX = f"{HISTORY_PREFIX}:ids"
+TIME_INDEX = f"{HISTORY_PREFIX}:by_time"
+ESCALATED_INDEX = f"{HISTORY_PREFIX}:escalated"
+# Hash: event id -> {"id": record id, "event_hash": feedback key hash}
+EVENT_INDEX = f"{HISTORY_PREFIX}:events"
+
+# Index entries examined per query before returning a partial page with a cursor
+MAX_SCAN = 5000
+# Index entries read per round trip while scanning, whatever the page limit
+SCAN_CHUNK = 500
+
+def job_index(job_id):
+    return f"{HISTORY_PREFIX}:job:{job_id}"
+
+def status_index(status):
+    return f"{HISTORY_PREFIX}:status:{status}"
+
+def is_escalated(record):
+    return any((action.get('params') or {}).get('escalation') is True for action in record.get('actions') or [])
+
+def record_matches(record, job_id=None, status=None, escalated=None, since=None, until=None):
+    event = record.get('event') or {}
+    return (
+        (job_id is None or str(event.get('job_id')) == str(job_id)) and
+        (status is None or event.get('status') == status) and
+        (escalated is None or is_escalated(record) == escalated) and
+        (since is None or record.get('processed_at', 0) >= since) and
+        (until is None or record.get('processed_at', 0) <= until)
+    )
+
+def write_records(client, records, pipe=None):
+    # Assign ids to a batch of records (HistoryEntry or record dicts) and queue the record + index writes.
+    # With pipe given the writes join it (and land on its execute); otherwise they are sent here.
+    # The event id is the one the API assigned on submission, or a fresh one for events queued directly.
+    if not records:
+        return []
+    last_id = client.incrby(SEQ_KEY, len(records))
+    own_pipe = pipe is None
+    if own_pipe:
+        pipe = client.pipeline(transaction=False)
+    now = time.time()
+    stored = []
+    entries = []
+    for record_id, entry in enumerate(records, last_id - len(records) + 1):
+        if not isinstance(entry, HistoryEntry):
+            entry = HistoryEntry.from_dict(entry)
+        entry.id = record_id
+        entries.append(entry)
+        if entry.processed_at is None:
+            entry.processed_at = now
+        record = entry.to_dict()
+        event = record['event']
+        pipe.hset(RECORDS_KEY, record_id, dumps(record))
+        pipe.hset(EVENT_INDEX, entry.event_id, dumps({'id': record_id, 'event_hash': event_hash(event)}))
+        pipe.zadd(ALL_INDEX, {record_id: record_id})
+        pipe.zadd(TIME_INDEX, {record_id: entry.processed_at})
+        if event.get('job_id') is not None:
+            pipe.zadd(job_index(event['job_id']), {record_id: record_id})
+        if event.get('status') is not None:
+            pipe.zadd(status_index(event['status']), {record_id: record_id})
+        if entry.is_escalated():
+            pipe.zadd(ESCALATED_INDEX, {record_id: record_id})
+        stored.append(record)
+    if own_pipe:
+        try:
+            pipe.execute()
+        except Exception:
+            # Nothing is stored under these ids, so callers must not treat the entries as written
+            for entry in entries:
+                entry.id = None
+            raise
+    return stored
+
+def write_occurrences(client, updates):
+    # Fold suppressed events into their leader's stored record: updates is [(HistoryEntry, suppressed event ids)].
+    # The record is rewritten with its new occurrence count and each suppressed event id resolves to it,
+    # so feedback on any of them lands on the decision that covered it. Leaders not written yet are skipped.
+    pipe = client.pipeline(transaction=False)
+    for entry, event_ids in updates:
+        if entry.id is None:
+            continue
+        record = entry.to_dict()
+        pipe.hset(RECORDS_KEY, entry.id, dumps(record))
+        if event_ids:
+            indexed = dumps({'id': entry.id, 'event_hash': event_hash(record['event'])})
+            pipe.hset(EVENT_INDEX, mapping={event_id: indexed for event_id in event_ids})
+    pipe.execute()
+
+# The read paths below are written once as generators of Redis commands: each
+# yields (method name, args, kwargs) and is sent the reply. _run drives one
+# with a blocking client (worker, tools) and _run_async with a redis.asyncio
+# client (the API), so both share the same scan and decoding logic.
+
+def _command(name, *args, **kwargs):
+    return name, args, kwargs
+
+def _run(client, steps):
+    reply = None
+    try:
+        while True:
+            name, args, kwargs = steps.send(reply)
+            reply = getattr(client, name)(*args, **kwargs)
+    except StopIteration as stop:
+        return stop.value
+
+async def _run_async(client, steps):
+    reply = None
+    try:
+        while True:
+            name, args, kwargs = steps.send(reply)
+            reply = await getattr(client, name)(*args, **kwargs)
+    except StopIteration as stop:
+        return stop.value
+
+def _get_record_steps(record_id):
+    raw = yield _command('hget', RECORDS_KEY, record_id)
+    return loads(raw) if raw is not None else None
+
+def _find_event_steps(event_id):
+    raw = yield _command('hget', EVENT_INDEX, event_id)
+    if raw is None:
+        return None
+    entry = loads(raw)
+    record = yield from _get_record_steps(entry['id'])
+    return (record, entry['event_hash']) if record is not None else None
+
+def _latest_for_job_steps(job_id):
+    ids = yield _command('zrevrange', job_index(job_id), 0, 0)
+    if not ids:
+        return None
+    return (yield from _get_record_steps(ids[0]))
+
+def get_record(client, record_id):
+    return _run(client, _get_record_steps(record_id))
+
+def find_event(client, event_id):
+    # Constant-time lookup of (record, event_hash) by event id; None when the id is unknown
+    return _run(client, _find_event_steps(event_id))
+
+async def find_event_async(client, event_id):
+    return await _run_async(client, _find_event_steps(event_id))
+
+def latest_for_job(client, job_id):
+    return _run(client, _latest_for_job_steps(job_id))
+
+async def latest_for_job_async(client, job_id):
+    return await _run_async(client, _latest_for_job_steps(job_id))
+
+def count_records(client):
+    return client.zcard(ALL_INDEX)
+
+async def count_records_async(client):
+    return await client.zcard(ALL_INDEX)
+
+def oldest_records(client, count):
+    # [(record id, record or None)] for the oldest count ids; None marks an index entry without a record
+    ids = client.zrange(ALL_INDEX, 0, count - 1)
+    if not ids:
+        return []
+    return [(int(record_id), loads(raw) if raw is not None else None)
+            for record_id, raw in zip(ids, client.hmget(RECORDS_KEY, ids))]
+
+def remove_records(client, entries):
+    # Delete records and every index entry pointing at them; entries as returned by oldest_records
+    event_ids = [record['event_id'] for _, record in entries if record and record.get('event_id')]
+    indexed = dict(zip(event_ids, client.hmget(EVENT_INDEX, event_ids))) if event_ids else {}
+    pipe = client.pipeline(transaction=False)
+    for record_id, record in entries:
+        pipe.hdel(RECORDS_KEY, record_id)
+        pipe.zrem(ALL_INDEX, record_id)
+        pipe.zrem(TIME_INDEX, record_id)
+        if record is None:
+            continue
+        event = record.get('event') or {}
+        if event.get('job_id') is not None:
+            pipe.zrem(job_index(event['job_id']), record_id)
+        if event.get('status') is not None:
+            pipe.zrem(status_index(event['status']), record_id)
+        pipe.zrem(ESCALATED_INDEX, record_id)
+        raw = indexed.get(record.get('event_id'))
+        # A redelivered event may point at a newer record; leave that mapping alone
+        if raw is not None and loads(raw)['id'] == record_id:
+            pipe.hdel(EVENT_INDEX, record['event_id'])
+    pipe.execute()
+
+def _id_bounds_steps(since, until):
+    # Translate a processed_at range into a record id range (ids grow with write time)
+    low, high = '-inf', '+inf'
+    if since is not None:
+        first = yield _command('zrangebyscore', TIME_INDEX, since, '+inf', start=0, num=1)
+        if not first:
+            return None
+        low = int(first[0])
+    if until is not None:
+        last = yield _command('zrevrangebyscore', TIME_INDEX, until, '-inf', start=0, num=1)
+        if not last:
+            return None
+        high = int(last[0])
+    return low, high
+
+def _query_steps(limit, cursor, job_id, status, escalated, since, until, max_scan):
+    bounds = yield from _id_bounds_steps(since, until)
+    if bounds is None:
+        return [], None
+    low, high = bounds
+    if cursor is not None:
+        high = cursor - 1 if high == '+inf' else min(high, cursor - 1)
+
+    indexes = [index for index, wanted in (
+        (job_index(job_id), job_id is not None),
+        (status_index(status), status is not None),
+        (ESCALATED_INDEX, escalated),
+    ) if wanted]
+    if not indexes:
+        index = ALL_INDEX
+    elif len(indexes) == 1:
+        index = indexes[0]
+    else:
+        # Drive the scan from whichever filter index has the fewest entries in range
+        sizes = []
+        for candidate in indexes:
+            sizes.append((yield _command('zcount', candidate, low, high)))
+        index = indexes[sizes.index(min(sizes))]
+
+    records = []
+    scanned = 0
+    while scanned < max_scan:
+        # Fixed-size chunks: a sparse filter with a small limit still reads many entries per round trip
+        page = min(SCAN_CHUNK, max_scan - scanned)
+        ids = yield _command('zrevrangebyscore', index, high, low, start=0, num=page)
+        if not ids:
+            return records, None
+        for raw in (yield _command('hmget', RECORDS_KEY, ids)):
+            scanned += 1
+            if raw is None:
+                continue  # record removed since it was indexed
+            record = loads(raw)
+            if record_matches(record, job_id, status, escalated, since, until):
+                records.append(record)
+                if len(records) == limit:
+                    return records, record['id']
+        high = int(ids[-1]) - 1
+        if len(ids) < page:
+            return records, None
+    return records, high + 1
+
+def query_history(client, limit=100, cursor=None, job_id=None, status=None, escalated=None, since=None, until=None, max_scan=MAX_SCAN):
+    """Newest-first page of history records matching every given filter.
+
+    Returns (records, next_cursor). Pass next_cursor back as cursor for the
+    next page; it is None once there is nothing older left. The filter index
+    (job_id, status or escalated) with the fewest entries in range drives the
+    scan and the other filters are checked on the decoded records, so a query reads at most
+    max_scan index entries whatever the size of the history; a sparse filter
+    can therefore return a short page with a cursor to continue from.
+    """
+    return _run(client, _query_steps(limit, cursor, job_id, status, escalated, since, until, max_scan))
+
+async def query_history_async(client, limit=100, cursor=None, job_id=None, status=None, escalated=None, since=None, until=None, max_scan=MAX_SCAN):
+    # query_history for a redis.asyncio client
+    return await _run_async(client, _query_steps(limit, cursor, job_id, status, escalated, since, until, max_scan))
@@ -0,0 +1,212 @@
+"""Seeded, virtual-clock job load generator for worker and API benchmarks.
+
+    python -m jobsim.load --jobs 1000000 --rate 500
+    python -m jobsim.load --jobs 100000 --redis   # push to agentic:events
+
+Nothing sleeps. Jobs arrive as a Poisson process of --rate jobs per virtual
+second and take their type's duration. Each job comes from one of --sources
+sources, with a skew (a few sources run most of the jobs). Each run draws its
+outcome (success, failed, stuck, slow) from its type's distribution. A failed
+or stuck job is retried, up to max_retries times. Failure storms hit one source
+at a time: they start at storm_rate per virtual hour and last storm_duration
+virtual seconds, and while one is on, the failed and stuck weights of every job
+from that source are multiplied by storm_multiplier. Failures therefore come in
+bursts and are correlated per source.
+
+A non-success run emits one event in the shape the worker consumes, in
+virtual-time order. Event ids and outcomes depend only on the seed and the
+settings, so a run can be repeated exactly.
+"""
+import argparse
+import bisect
+import heapq
+import itertools
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List
+
+from agentic.records import dumps
+
+EVENT_QUEUE = "agentic:events"
+OUTCOMES = ("success", "failed", "stuck", "slow")
+STATUS = {"success": "success", "failed": "fail", "stuck": "stuck", "slow": "slow"}  # statuses the worker knows
+DEFAULT_OUTCOMES = {"success": 0.7, "failed": 0.15, "stuck": 0.1, "slow": 0.05}  # as SimulatedJob.run
+RETRY_OUTCOMES = ("failed", "stuck")
+
+
+@dataclass(slots=True)
+class JobType:
+    name: str
+    expected_duration: float
+    outcomes: Dict[str, float]
+
+
+@dataclass(slots=True)
+class JobRun:
+    job_id: int  # EventIn.job_id is an int
+    job_type: str
+    source: str
+    attempt: int  # 0 for the first run, n for the nth retry
+    outcome: str
+    start: float  # virtual seconds
+    end: float
+    storm: bool  # started while a storm was on for its source
+
+
+class LoadSimulator:
+    """Generates job runs and events on a virtual clock; see the module docstring."""
+
+    def __init__(self, job_types: List[JobType], rate: float = 100.0, sources: int = 20, seed: int = 0,
+                 storm_rate: float = 12.0, storm_duration: float = 120.0, storm_multiplier: float = 10.0,
+                 max_retries: int = 2, retry_delay: float = 1.0, include_success: bool = False):
+        if not job_types:
+            raise ValueError("at least one job type is required")
+        self.job_types = job_types
+        self.rate = rate
+        self.sources = [f"Source{i}" for i in range(sources)]
+        self.seed = seed
+        self.storm_rate = storm_rate  # storms per virtual hour, across all sources
+        self.storm_duration = storm_duration
+        self.storm_multiplier = storm_multiplier
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay  # virtual seconds between a failed run and its retry
+        self.include_success = include_success
+        self.stats = {}
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any], **overrides) -> "LoadSimulator":
+        # Job types from config['jobs'] (one per distinct type), settings and per-type outcomes from config['simulation']
+        simulation = dict(config.get('simulation') or {})
+        outcomes = simulation.pop('outcomes', None) or {}
+        storms = simulation.pop('storms', None) or {}
+        default = outcomes.get('default', DEFAULT_OUTCOMES)
+        job_types = {}
+        for job in config.get('jobs', []):
+            job_types.setdefault(job['type'], JobType(job['type'], job['expected_duration'], outcomes.get(job['type'], default)))
+        settings = {**simulation, **{f"storm_{k}": v for k, v in storms.items()}, **overrides}
+        return cls(list(job_types.values()), **settings)
+
+    def runs(self, jobs: int) -> Iterator[JobRun]:
+        """Yield the runs of ``jobs`` jobs (retries included) in order of their end time."""
+        rng = random.Random(self.seed)
+        source_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(self.sources))))
+        type_weights = [[t.outcomes.get(o, 0.0) for o in OUTCOMES] for t in self.job_types]
+        stats = self.stats = {"jobs": 0, "runs": 0, "storms": 0, "storm_runs": 0}
+        storms = {}  # source -> (start, end) of its latest storm
+        next_storm = rng.expovariate(self.storm_rate / 3600) if self.storm_rate > 0 else float("inf")
+        pending = []  # heap of (end, seq, type index, run)
+        seq = itertools.count()
+
+        def start(job_id, type_index, source, attempt, at):
+            nonlocal next_storm
+            while next_storm <= at:
+                # Storms are drawn in start order as the clock passes them; the source skew applies
+                hit = self.sources[bisect.bisect(source_weights, rng.random() * source_weights[-1])]
+                storms[hit] = (next_storm, next_storm + self.storm_duration)
+                stats["storms"] += 1
+                next_storm += rng.expovariate(self.storm_rate / 3600)
+            job_type = self.job_types[type_index]
+            weights = type_weights[type_index]
+            storm_start, storm_end = storms.get(source, (0.0, 0.0))
+            storm = storm_start <= at < storm_end
+            if storm:
+                weights = [w * self.storm_multiplier if o in RETRY_OUTCOMES else w for o, w in zip(OUTCOMES, weights)]
+            outcome = rng.choices(OUTCOMES, weights)[0]
+            duration = job_type.expected_duration
+            if outcome == "slow":
+                duration *= rng.uniform(1.5, 2.5)
+            elif outcome == "stuck":
+                duration *= rng.uniform(2.5, 5.0)
+            stats["runs"] += 1
+            stats["storm_runs"] += storm
+            run = JobRun(job_id, job_type.name, source, attempt, outcome, at, at + duration, storm)
+            heapq.heappush(pending, (run.end, next(seq), type_index, run))
+
+        arrival = rng.expovariate(self.rate)
+        while stats["jobs"] < jobs or pending:
+            if stats["jobs"] < jobs and (not pending or arrival <= pending[0][0]):
+                type_index = rng.randrange(len(self.job_types))
+                source = self.sources[bisect.bisect(source_weights, rng.random() * source_weights[-1])]
+                stats["jobs"] += 1
+                start(stats["jobs"], type_index, source, 0, arrival)
+                arrival += rng.expovariate(self.rate)
+                continue
+            _, _, type_index, run = heapq.heappop(pending)
+            if run.outcome in RETRY_OUTCOMES and run.attempt < self.max_retries:
+                start(run.job_id, type_index, run.source, run.attempt + 1, run.end + self.retry_delay)
+            yield run
+
+    def events(self, jobs: int) -> Iterator[Dict[str, Any]]:
+        """Yield the worker events for the runs of ``jobs`` jobs."""
+        ids = itertools.count(1)
+        for run in self.runs(jobs):
+            if run.outcome == "success" and not self.include_success:
+                continue
+            yield {
+                "job_id": run.job_id,
+                "status": STATUS[run.outcome],
+                "event_type": "job_issue",
+                "event_id": f"sim{self.seed}-{next(ids)}",
+                "details": {
+                    "timestamp": round(run.end, 3),
+                    "source": run.source,
+                    "description": f"{run.job_type} job {run.outcome}",
+                    "attempt": run.attempt,
+                },
+            }
+
+    def payloads(self, jobs: int) -> Iterator[bytes]:
+        # Events encoded as the API queues them
+        return map(dumps, self.events(jobs))
+
+    def push(self, client, jobs: int, queue: str = EVENT_QUEUE, batch_size: int = 1000) -> Dict[str, int]:
+        """RPUSH the events of ``jobs`` jobs onto ``queue``, ``batch_size`` per command; returns the stats."""
+        batch = []
+        pushed = 0
+        for payload in self.payloads(jobs):
+            batch.append(payload)
+            if len(batch) == batch_size:
+                client.rpush(queue, *batch)
+                pushed += len(batch)
+                batch = []
+        if batch:
+            client.rpush(queue, *batch)
+            pushed += len(batch)
+        return dict(self.stats, events=pushed)
+
+
+def main():
+    import redis
+    import yaml
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", default="config.yaml")
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--rate", type=float, help="jobs per virtual second (default: simulation.rate in the config)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--redis", action="store_true", help="push the events to the agentic:events queue")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+    overrides = {k: v for k, v in (("rate", args.rate), ("seed", args.seed)) if v is not None}
+    simulator = LoadSimulator.from_config(config, **overrides)
+    started = time.perf_counter()
+    if args.redis:
+        client = redis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"), port=int(os.getenv("REDIS_PORT", 6379)), db=int(os.getenv("REDIS_DB", 0)),
+        )
+        stats = simulator.push(client, args.jobs, batch_size=args.batch_size)
+    else:
+        events = sum(1 for _ in simulator.payloads(args.jobs))
+        stats = dict(simulator.stats, events=events)
+    elapsed = time.perf_counter() - started
+    print(f"{stats['jobs']} jobs, {stats['runs']} runs ({stats['storm_runs']} in {stats['storms']} storms), "
+          f"{stats['events']} events in {elapsed:.1f}s ({stats['events'] / elapsed:,.0f} events/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import random
 import time
 
 class SimulatedJob:
+    time_scale = 0.1  # real seconds slept per unit of expected_duration
+
     def __init__(self, job_id, expected_duration, job_type):
         self.job_id = job_id
         self.expected_duration = expected_duration
@@ -26,7 +28,7 @@ class SimulatedJob:
             duration *= random.uniform(1.5, 2.5)
         elif outcome == "stuck":
             duration *= random.uniform(2.5, 5.0)
-        time.sleep(duration / 10)  # Simulate time passing (scaled down)
+        time.sleep(duration * self.time_scale)  # Simulate time passing (scaled down)
         self.end_time = time.time()
         self.log = f"Job {self.job_id} finished with status: {self.status}"
         return self.status
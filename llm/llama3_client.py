@@ -1,39 +1,249 @@
-import openai
-import os
-import logging
+import json
+import random
+import threading
+import time
+from concurrent.futures import Future
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from llm.circuit_breaker import CircuitBreaker
+from agentic.metrics import metrics
+from agentic.log import file_logger
+
+LLM_ERROR_PREFIX = "[LLM Error]"
+
+BATCH_LABELS = ("escalate", "notify", "remediate")
+DEFAULT_BATCH_PROMPT = (
+    "Classify each numbered event below as one of: escalate, notify, remediate. "
+    "Respond with only a JSON object mapping each event number to its label, "
+    "for example {\"1\": \"notify\", \"2\": \"escalate\"}."
+)
+
+def parse_batch_response(text, count):
+    # Map event index (0-based) -> label for every well-formed entry in a batch reply
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        raise ValueError("no JSON object in batch response")
+    data = json.loads(text[start:end + 1])
+    if not isinstance(data, dict):
+        raise ValueError("batch response is not a JSON object")
+    labels = {}
+    for key, value in data.items():
+        try:
+            index = int(key) - 1
+        except (TypeError, ValueError):
+            continue
+        label = str(value).strip().lower()
+        if 0 <= index < count and label in BATCH_LABELS:
+            labels[index] = label
+    if not labels:
+        raise ValueError("no usable labels in batch response")
+    return labels
+
+class LLMError(Exception):
+    pass
+
+class LLMUnavailableError(LLMError):
+    # The model could not be reached (timeouts, connection errors, 5xx) or the circuit is open
+    pass
+
+class CircuitOpenError(LLMUnavailableError):
+    # Rejected by the circuit breaker without sending a request
+    pass
+
+def is_llm_error(response):
+    return response is None or response.startswith(LLM_ERROR_PREFIX)
+
+# One keep-alive connection pool per endpoint, shared by every client in the process
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def get_session(endpoint, pool_size):
+    with _sessions_lock:
+        session = _sessions.get(endpoint)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Authorization": "Bearer lm-studio"})  # Dummy key for LM Studio
+            _sessions[endpoint] = session
+        return session
 
 class Llama3Client:
     def __init__(self, config):
         self.api_base = config['llm']['endpoint']
         self.model = config['llm']['model']
         self.prompt_template = config['llm']['log_analysis_prompt']
-        openai.api_key = "lm-studio"  # Dummy key for LM Studio
-        openai.api_base = self.api_base
-        # Setup LLM log file
-        os.makedirs('logs', exist_ok=True)
-        self.llm_logger = logging.getLogger("llm_analysis")
-        handler = logging.FileHandler("logs/llm_analysis.log", encoding="utf-8")
-        handler.setFormatter(logging.Formatter('%(asctime)s | %(message)s'))
-        if not self.llm_logger.handlers:
-            self.llm_logger.addHandler(handler)
-        self.llm_logger.setLevel(logging.INFO)
+        self.batch_prompt = config['llm'].get('batch_prompt', DEFAULT_BATCH_PROMPT)
+        self.batch_fallbacks = 0
+        # Cap outstanding model calls when the worker runs events concurrently
+        max_concurrency = config['llm'].get('max_concurrency', 4)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        # HTTP transport: pooled keep-alive session, (connect, read) timeouts and bounded retries
+        self.url = f"{self.api_base.rstrip('/')}/chat/completions"
+        self.session = get_session(self.api_base, max_concurrency)
+        self.timeout = (config['llm'].get('connect_timeout', 3), config['llm'].get('read_timeout', 60))
+        self.max_retries = config['llm'].get('max_retries', 2)
+        self.backoff_base = config['llm'].get('backoff_base', 0.5)
+        self.backoff_max = config['llm'].get('backoff_max', 8)
+        self.breaker = CircuitBreaker(
+            failure_threshold=config['llm'].get('circuit_failure_threshold', 5),
+            reset_timeout=config['llm'].get('circuit_reset_timeout', 30),
+        )
+        # Single-flight: concurrent callers with the same prompt share one outstanding request
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.coalesced = 0
+        # LLM log file (logs/llm_analysis.log), written by the background log thread
+        self.llm_logger = file_logger("llm_analysis", "llm_analysis.log")
+
+    def prepare_settings(self, llm_config):
+        # Validate reloadable settings and return a callable that applies them all at once.
+        # The endpoint, model and connection pool are fixed for the life of the client.
+        prompt_template = llm_config['log_analysis_prompt']
+        batch_prompt = llm_config.get('batch_prompt', DEFAULT_BATCH_PROMPT)
+        timeout = (float(llm_config.get('connect_timeout', 3)), float(llm_config.get('read_timeout', 60)))
+        max_retries = int(llm_config.get('max_retries', 2))
+        backoff = (float(llm_config.get('backoff_base', 0.5)), float(llm_config.get('backoff_max', 8)))
+        failure_threshold = int(llm_config.get('circuit_failure_threshold', 5))
+        reset_timeout = float(llm_config.get('circuit_reset_timeout', 30))
+        if not isinstance(prompt_template, str) or not isinstance(batch_prompt, str):
+            raise ValueError("llm prompts must be strings")
+        if min(timeout) <= 0 or max_retries < 0 or failure_threshold < 1:
+            raise ValueError("llm timeouts must be positive, retries >= 0 and circuit_failure_threshold >= 1")
+
+        def apply():
+            self.prompt_template = prompt_template
+            self.batch_prompt = batch_prompt
+            self.timeout = timeout
+            self.max_retries = max_retries
+            self.backoff_base, self.backoff_max = backoff
+            self.breaker.failure_threshold = failure_threshold
+            self.breaker.reset_timeout = reset_timeout
+        return apply
 
     def log_llm_result(self, job_id, log_text, llm_response):
-        self.llm_logger.info(f"{job_id} | {log_text} | {llm_response}")
+        self.llm_logger.info("llm result", extra={"fields": {"job_id": job_id, "log_text": log_text, "response": llm_response}})
+
+    def _backoff(self, attempt):
+        # Full jitter: sleep a random time up to the exponential cap
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _complete(self, prompt):
+        if not self.breaker.allow():
+            raise CircuitOpenError("circuit open, model marked unavailable")
+        payload = {"model": self.model, "messages": [{"role": "user", "content": prompt}]}
+        # Every exit past allow() records an outcome; otherwise a failed half-open trial would keep the circuit shut
+        model_up = False
+        try:
+            last_error = None
+            for attempt in range(self.max_retries + 1):
+                if attempt:
+                    time.sleep(self._backoff(attempt - 1))
+                try:
+                    response = self.session.post(self.url, json=payload, timeout=self.timeout)
+                    if response.status_code == 429 or response.status_code >= 500:
+                        last_error = LLMError(f"HTTP {response.status_code}")
+                        continue
+                    if response.status_code >= 400:
+                        # The model is up but rejected the request; retrying won't help and the circuit stays closed
+                        model_up = True
+                        raise LLMError(f"HTTP {response.status_code}: {response.text[:200]}")
+                    content = response.json()['choices'][0]['message']['content']
+                except requests.RequestException as e:
+                    # Connection errors, timeouts, broken or undecodable bodies
+                    last_error = e
+                    continue
+                model_up = True
+                return content
+            raise LLMUnavailableError(f"{self.max_retries + 1} attempts failed: {last_error}")
+        finally:
+            if model_up:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+
+    def _complete_once(self, prompt, key):
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+        if leader:
+            try:
+                with self._slots:
+                    start = time.perf_counter()
+                    try:
+                        future.set_result(self._complete(prompt))
+                    except CircuitOpenError:
+                        # Nothing was sent: kept out of the request, error and latency figures
+                        metrics.inc("llm_rejected_total")
+                        raise
+                    except Exception:
+                        metrics.inc("llm_requests_total")
+                        metrics.inc("llm_errors_total")
+                        metrics.observe("llm_call", time.perf_counter() - start)
+                        raise
+                    metrics.inc("llm_requests_total")
+                    metrics.observe("llm_call", time.perf_counter() - start)
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._inflight_lock:
+                    del self._inflight[key]
+        return future.result()
 
-    def analyze_log(self, log_text, job_id=None):
+    def analyze_log(self, log_text, job_id=None, coalesce_key=None):
+        # coalesce_key lets callers share a request across prompts that differ only in
+        # fields the answer doesn't depend on (e.g. job id); defaults to the prompt itself
         prompt = f"{self.prompt_template}\n{log_text}"
         try:
-            response = openai.ChatCompletion.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            llm_response = response['choices'][0]['message']['content']
+            llm_response = self._complete_once(prompt, coalesce_key or prompt)
             if job_id:
                 self.log_llm_result(job_id, log_text, llm_response)
             return llm_response
         except Exception as e:
-            err_msg = f"[LLM Error] {e}"
+            err_msg = f"{LLM_ERROR_PREFIX} {e}"
             if job_id:
                 self.log_llm_result(job_id, log_text, err_msg)
-            return err_msg 
\ No newline at end of file
+            return err_msg
+
+    def analyze_logs(self, log_texts, job_ids=None):
+        # Classify several events in one request; events the reply doesn't cover fall back to analyze_log.
+        # If the request itself fails every event gets the error, for the caller's rule-based fallback:
+        # retrying one request per event would only multiply requests to a model that is down.
+        job_ids = job_ids or [None] * len(log_texts)
+        if len(log_texts) == 1:
+            return [self.analyze_log(log_texts[0], job_id=job_ids[0])]
+        blocks = "\n\n".join(f"Event {i}:\n{text}" for i, text in enumerate(log_texts, 1))
+        prompt = f"{self.batch_prompt}\n\n{blocks}"
+        try:
+            reply = self._complete_once(prompt, prompt)
+        except Exception as e:
+            self.llm_logger.info("llm batch error", extra={"fields": {"batch": len(log_texts), "error": str(e)}})
+            err_msg = f"{LLM_ERROR_PREFIX} {e}"
+            for log_text, job_id in zip(log_texts, job_ids):
+                if job_id:
+                    self.log_llm_result(job_id, log_text, err_msg)
+            return [err_msg] * len(log_texts)
+        try:
+            labels = parse_batch_response(reply, len(log_texts))
+        except ValueError as e:
+            self.llm_logger.info("llm batch error", extra={"fields": {"batch": len(log_texts), "error": str(e)}})
+            labels = {}
+        results = []
+        for index, (log_text, job_id) in enumerate(zip(log_texts, job_ids)):
+            label = labels.get(index)
+            if label is None:
+                self.batch_fallbacks += 1
+                results.append(self.analyze_log(log_text, job_id=job_id))
+                continue
+            if job_id:
+                self.log_llm_result(job_id, log_text, label)
+            results.append(label)
+        return results
@@ -1,20 +1,18 @@
 from rich.console import Console
 from agentic.base import Effector
+from agentic.log import file_logger
 from typing import Any, Dict
 import logging
 import os
 
 console = Console()
+# Rich console rendering of notifications. The worker turns it off (WORKER_RICH_CONSOLE=0) and the
+# same messages go to the "notifications" logger instead, written by the background log thread.
+rich_console = os.getenv("RICH_CONSOLE", "1") == "1"
 
-# Ensure logs directory exists
-os.makedirs('logs', exist_ok=True)
-escalation_logger = logging.getLogger('escalation')
-if not escalation_logger.hasHandlers():
-    fh = logging.FileHandler('logs/escalation.log', encoding="utf-8")
-    formatter = logging.Formatter('%(asctime)s %(message)s')
-    fh.setFormatter(formatter)
-    escalation_logger.addHandler(fh)
-    escalation_logger.setLevel(logging.INFO)
+log = logging.getLogger('notifications')
+# logs/escalation.log
+escalation_logger = file_logger('escalation', 'escalation.log')
 
 class NotifierEffector(Effector):
     def execute(self, action: str, params: Dict[str, Any]) -> Any:
@@ -23,14 +21,27 @@ class NotifierEffector(Effector):
         remediation = params.get('remediation')
         if action == 'notify':
             if escalation:
-                console.print(f"[bold red]ESCALATION: Manual intervention required for job {job['job_id']}![/bold red]")
-                print(f"[DEBUG] Escalation logging triggered for job {job['job_id']}")
-                escalation_logger.info(f"ESCALATED EVENT: {job}")
-                print(f"*** ESCALATION TRIGGERED ***: {job}")
-            else:
+                if rich_console:
+                    console.print(f"[bold red]ESCALATION: Manual intervention required for job {job['job_id']}![/bold red]")
+                else:
+                    log.warning("ESCALATION: Manual intervention required for job %s", job['job_id'])
+                log.debug("Escalation logging triggered for job %s", job['job_id'])
+                escalation_logger.info("ESCALATED EVENT", extra={"fields": {"job": job}})
+            elif rich_console:
                 console.print(f"[yellow]Notification: Issue detected and handled for job {job['job_id']} (status: {job['status']})[/yellow]")
+            else:
+                log.info("Notification: Issue detected and handled for job %s (status: %s)", job['job_id'], job['status'])
         elif action == 'remediate':
-            console.print(f"[green]Remediation action: {remediation} for job {job['job_id']} (status: {job['status']})[/green]")
-            print(f"[DEBUG] Remediation action triggered: {remediation} for job {job['job_id']}")
+            if rich_console:
+                console.print(f"[green]Remediation action: {remediation} for job {job['job_id']} (status: {job['status']})[/green]")
+            else:
+                log.info("Remediation action: %s for job %s (status: %s)", remediation, job['job_id'], job['status'])
+            log.debug("Remediation action triggered: %s for job %s", remediation, job['job_id'])
+        elif rich_console:
+            console.print(f"[red]Unknown action: {action}[/red]")
         else:
-            console.print(f"[red]Unknown action: {action}[/red]") 
\ No newline at end of file
+            log.error("Unknown action: %s", action)
+
+def notify(job, config, escalation=False):
+    # Used by the legacy script (agent/orchestrator.py); config['notifications']['channels'] only has console today
+    NotifierEffector().execute('notify', {'job': {'job_id': job.job_id, 'status': job.status}, 'escalation': escalation})
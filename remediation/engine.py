@@ -1,20 +1,102 @@
 import yaml
 import os
+import re
+import heapq
+from itertools import product
+
+INDEX_FIELDS = ("event_type", "status", "source")
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(__file__), 'remediation.yaml')
 
 def load_remediation_rules(path=None):
     if path is None:
-        path = os.path.join(os.path.dirname(__file__), 'remediation.yaml')
+        path = DEFAULT_RULES_PATH
     with open(path, 'r') as f:
         return yaml.safe_load(f)["remediation_rules"]
 
+def _by_priority(rules):
+    # Higher priority first; equal priorities keep file order (sorted is stable)
+    return sorted(rules, key=lambda rule: -rule.get("priority", 0))
+
+def _rule_matches(rule, event):
+    match = rule["match"]
+    description = event.get("details", {}).get("description") or ""
+    return (
+        (match.get("event_type") is None or event.get("event_type") == match["event_type"]) and
+        (match.get("status") is None or event.get("status") == match["status"]) and
+        (match.get("source") is None or event.get("details", {}).get("source") == match["source"]) and
+        (match.get("description_contains") is None or match["description_contains"].lower() in description.lower()) and
+        (match.get("description_regex") is None or re.search(match["description_regex"], description, re.IGNORECASE) is not None)
+    )
+
+class CompiledRules:
+    """Remediation rules compiled once into an index for fast first-match lookups.
+
+    Rules are bucketed by their (event_type, status, source) constraints, with
+    None standing for "any". A lookup visits at most the 8 buckets an event can
+    fall into, merges them in priority order and checks the description
+    constraints against a description lowered once per event. Candidate lists
+    per (event_type, status, source) are memoized. Results are identical to
+    scanning the rules in priority order with find_remediation_action.
+    """
+
+    MAX_MEMO = 4096
+
+    def __init__(self, rules):
+        self.rules = rules
+        self._buckets = {}
+        for rank, rule in enumerate(_by_priority(rules)):
+            match = rule.get("match")
+            if not isinstance(match, dict) or "action" not in rule:
+                raise ValueError(f"Remediation rule needs a 'match' mapping and an 'action': {rule!r}")
+            needle = match.get("description_contains")
+            pattern = match.get("description_regex")
+            try:
+                regex = re.compile(pattern, re.IGNORECASE) if pattern is not None else None
+            except re.error as e:
+                raise ValueError(f"Invalid description_regex {pattern!r}: {e}") from e
+            key = tuple(match.get(field) for field in INDEX_FIELDS)
+            entry = (rank, needle.lower() if needle is not None else None, regex, rule["action"])
+            self._buckets.setdefault(key, []).append(entry)
+        self._memo = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def _candidates(self, key):
+        candidates = self._memo.get(key)
+        if candidates is None:
+            keys = dict.fromkeys(product(*((value, None) for value in key)))
+            candidates = list(heapq.merge(*(self._buckets[k] for k in keys if k in self._buckets)))
+            if len(self._memo) < self.MAX_MEMO:
+                self._memo[key] = candidates
+        return candidates
+
+    def match(self, event):
+        details = event.get("details", {})
+        try:
+            candidates = self._candidates((event.get("event_type"), event.get("status"), details.get("source")))
+        except TypeError:
+            # Unhashable field values can't use the index; fall back to a scan
+            return find_remediation_action(event, self.rules)
+        lowered = None
+        for _, needle, regex, action in candidates:
+            if needle is not None:
+                if lowered is None:
+                    lowered = (details.get("description") or "").lower()
+                if needle not in lowered:
+                    continue
+            if regex is not None and regex.search(details.get("description") or "") is None:
+                continue
+            return action
+        return None
+
+def compile_remediation_rules(rules):
+    return CompiledRules(rules)
+
 def find_remediation_action(event, rules):
-    for rule in rules:
-        match = rule["match"]
-        if (
-            (match.get("event_type") is None or event.get("event_type") == match["event_type"]) and
-            (match.get("status") is None or event.get("status") == match["status"]) and
-            (match.get("source") is None or event.get("details", {}).get("source") == match["source"]) and
-            (match.get("description_contains") is None or match["description_contains"].lower() in event.get("details", {}).get("description", "").lower())
-        ):
+    if isinstance(rules, CompiledRules):
+        return rules.match(event)
+    for rule in _by_priority(rules):
+        if _rule_matches(rule, event):
             return rule["action"]
-    return None 
\ No newline at end of file
+    return None
@@ -0,0 +1,98 @@
+import time
+
+import pytest
+
+import agentic.agent
+from agentic.agent import Agent
+from agentic.base import Effector, Sensor
+from agentic.reasoning_simple import SimpleReasoningModule
+
+class QueueSensor(Sensor):
+    def __init__(self, events, delay=0.0):
+        self.events = list(events)
+        self.delay = delay
+    def get_event(self):
+        if self.delay:
+            time.sleep(self.delay)
+        return self.events.pop(0) if self.events else None
+
+class SleepyEffector(Effector):
+    def __init__(self, delay, timeout=None, fail=False):
+        self.delay = delay
+        self.timeout = timeout
+        self.fail = fail
+        self.calls = 0
+    def execute(self, action, params):
+        time.sleep(self.delay)
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("pager down")
+        return f"{action} done"
+
+def event(job_id):
+    return {"job_id": job_id, "status": "fail", "event_type": "job_issue"}
+
+def test_slow_sensor_does_not_hold_up_the_others():
+    slow = QueueSensor([event(99)], delay=0.4)
+    fast = QueueSensor([event(i) for i in range(5)])
+    agent = Agent([slow, fast], [], SimpleReasoningModule())
+    start = time.monotonic()
+    processed = sum(agent.run_once() for _ in range(5))
+    assert processed == 5 and time.monotonic() - start < 0.3
+    assert [r.event.job_id for r in agent.memory.get_history()] == [0, 1, 2, 3, 4]
+    time.sleep(0.4)
+    agent.run_once()
+    assert agent.memory.get_history()[-1].event.job_id == 99
+    agent.close()
+
+def test_effectors_run_concurrently_with_timeouts():
+    effectors = [SleepyEffector(0.2), SleepyEffector(0.2), SleepyEffector(1.0, timeout=0.1)]
+    agent = Agent([QueueSensor([event(1)])], effectors, SimpleReasoningModule())
+    start = time.monotonic()
+    agent.run_once()
+    assert time.monotonic() - start < 0.5
+    outcomes = agent.memory.get_history()[0].outcomes
+    assert outcomes[:2] == ["notify done", "notify done"]
+    assert outcomes[2] == {"error": "timeout", "effector": "SleepyEffector", "action": "notify", "timeout": 0.1}
+    agent.close()
+
+def test_effector_timeouts_count_from_when_the_call_starts():
+    # Both calls share one thread: the second waits 0.15 s for it, then runs within its own 0.25 s
+    effectors = [SleepyEffector(0.15, timeout=0.25), SleepyEffector(0.15, timeout=0.25)]
+    agent = Agent([], effectors, SimpleReasoningModule(), max_effector_workers=1)
+    assert agent.execute_actions([{"type": "notify"}]) == ["notify done", "notify done"]
+    agent.close()
+
+def test_hung_effectors_do_not_starve_later_events():
+    hung, quick = SleepyEffector(0.6, timeout=0.05), SleepyEffector(0.0, timeout=0.2)
+    agent = Agent([], [hung], SimpleReasoningModule(), max_effector_workers=1)
+    assert agent.execute_actions([{"type": "notify"}])[0]["error"] == "timeout"
+    agent.effectors = [quick]
+    start = time.monotonic()
+    assert agent.execute_actions([{"type": "notify"}]) == ["notify done"]
+    assert time.monotonic() - start < 0.2 and agent.retired_pools == 1
+    agent.close()
+
+def test_effector_errors_propagate_after_the_other_calls():
+    ok, failing = SleepyEffector(0.05), SleepyEffector(0.0, fail=True)
+    agent = Agent([QueueSensor([event(1)])], [failing, ok], SimpleReasoningModule())
+    with pytest.raises(RuntimeError, match="pager down"):
+        agent.run_once()
+    assert ok.calls == 1 and agent.memory.get_history() == []
+    agent.close()
+
+def test_run_forever_polls_back_to_back_and_backs_off_when_idle(monkeypatch):
+    sleeps = []
+    class Stop(Exception):
+        pass
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 5:
+            raise Stop
+    monkeypatch.setattr(agentic.agent.time, "sleep", fake_sleep)
+    agent = Agent([QueueSensor([event(i) for i in range(3)])], [], SimpleReasoningModule())
+    with pytest.raises(Stop):
+        agent.run_forever(poll_interval=0.3, min_interval=0.05)
+    assert len(agent.memory.get_history()) == 3
+    assert sleeps == [0.05, 0.1, 0.2, 0.3, 0.3]
+    agent.close()
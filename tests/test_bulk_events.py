@@ -0,0 +1,58 @@
+import json
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+import api.main
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def client(server):
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+@pytest.fixture
+def http(server, monkeypatch):
+    monkeypatch.setattr(api.main, "create_redis", lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    with TestClient(api.main.app) as http:
+        yield http
+
+def queued(client):
+    return [json.loads(item) for item in client.lrange(api.main.EVENT_QUEUE, 0, -1)]
+
+def test_json_array_is_queued_in_order_with_event_ids(client, http):
+    events = [{"job_id": i, "status": "fail"} for i in range(2500)]
+    body = http.post("/events", json=events).json()
+    assert body["submitted"] == 2500 and body["errors"] == []
+    stored = queued(client)
+    assert [e["job_id"] for e in stored] == list(range(2500))
+    assert [e["event_id"] for e in stored] == body["event_ids"]
+    assert stored[0]["event_type"] == "job_issue"
+
+def test_ndjson_with_per_item_errors(client, http):
+    lines = [
+        json.dumps({"job_id": 1, "status": "fail", "event_id": "mine"}),
+        "",
+        "{not json",
+        json.dumps({"job_id": "abc", "status": "fail"}),
+        json.dumps({"status": "warning"}),
+        json.dumps([1, 2]),
+        json.dumps({"job_id": 2, "status": "warning", "details": {"source": "Disk"}}),
+    ]
+    response = http.post("/events", content="\n".join(lines), headers={"Content-Type": "application/x-ndjson"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["submitted"] == 2 and body["event_ids"][0] == "mine"
+    assert [error["index"] for error in body["errors"]] == [2, 3, 4, 5]
+    assert "job_id" in body["errors"][1]["error"] and "job_id" in body["errors"][2]["error"]
+    assert [e["job_id"] for e in queued(client)] == [1, 2]
+
+def test_rejects_bad_bodies(client, http, monkeypatch):
+    assert http.post("/events", content="[1, ", headers={"Content-Type": "application/json"}).status_code == 400
+    assert http.post("/events", json={"job_id": 1, "status": "fail"}).json()["errors"] == []
+    monkeypatch.setattr(api.main, "MAX_BULK_EVENTS", 3)
+    assert http.post("/events", json=[{"job_id": i, "status": "fail"} for i in range(4)]).status_code == 413
+    assert http.post("/events", json=[]).json()["submitted"] == 0
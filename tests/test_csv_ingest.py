@@ -0,0 +1,51 @@
+import csv
+import json
+
+import fakeredis
+import pytest
+
+from agentic.csv_ingest import SKIP_STATUSES, ingest_csv, map_statuses
+from agentic.kaggle_csv_sensor import KaggleCSVSensor, map_status
+
+LEVELS = ["Erro", "Aviso", "Informações", "Crítico", "Debug", "Trace", "Alerta", "Fatal", "Outro"]
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "eventos.csv"
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Nível", "Data e Hora", "Fonte", "Identificação do Evento", "Description1"])
+        for i in range(250):
+            writer.writerow([LEVELS[i % len(LEVELS)], f"2024-07-19 12:{i % 60:02d}", f"Source{i % 4}", str(i), f"event, \"{i}\""])
+    return str(path)
+
+def test_map_statuses_matches_map_status():
+    assert map_statuses(LEVELS * 3) == [map_status(level) for level in LEVELS * 3]
+
+@pytest.mark.parametrize("use_pandas", [False, True])
+def test_bulk_ingest_queues_what_the_sensor_would_emit(csv_path, use_pandas):
+    if use_pandas:
+        pytest.importorskip("pandas")
+    client = fakeredis.FakeRedis()
+    stats = ingest_csv(csv_path, client, queue="q", chunk_size=64, batch_size=10, use_pandas=use_pandas)
+    expected = [e for e in KaggleCSVSensor(csv_path).events() if e["status"] not in SKIP_STATUSES]
+    assert [json.loads(p) for p in client.lrange("q", 0, -1)] == expected
+    assert stats == {"rows": 250, "queued": len(expected), "skipped": 250 - len(expected)}
+    assert stats["skipped"] > 0
+
+def test_missing_job_id_column_uses_row_numbers(tmp_path):
+    path = tmp_path / "eventos.csv"
+    path.write_text("Nível,Fonte\nErro,A\nInformações,B\n\nErro,C\n", encoding="utf-8")
+    client = fakeredis.FakeRedis()
+    ingest_csv(str(path), client, queue="q", chunk_size=2, use_pandas=False)
+    events = [json.loads(p) for p in client.lrange("q", 0, -1)]
+    assert [(e["job_id"], e["details"]["source"], e["details"]["description"]) for e in events] == [(1, "A", ""), (3, "C", "")]
+    assert events == [e for e in KaggleCSVSensor(str(path)).events() if e["status"] == "fail"]
+
+def test_a_chunk_of_blank_lines_does_not_end_ingestion(tmp_path):
+    path = tmp_path / "eventos.csv"
+    path.write_text("Nível,Fonte\nErro,A\nErro,B\n\n\nErro,C\nErro,D\n", encoding="utf-8")
+    client = fakeredis.FakeRedis()
+    stats = ingest_csv(str(path), client, queue="q", chunk_size=2, use_pandas=False)
+    assert stats["queued"] == 4
+    assert [json.loads(p)["details"]["source"] for p in client.lrange("q", 0, -1)] == ["A", "B", "C", "D"]
@@ -0,0 +1,78 @@
+import pytest
+
+from agentic.decision_cache import DecisionCache, RedisDecisionTier, decision_key, feedback_version
+
+EVENT = {
+    "job_id": 1,
+    "status": "fail",
+    "event_type": "job_issue",
+    "details": {
+        "timestamp": "2024-07-19T12:00:00Z",
+        "source": "DiskMonitor",
+        "description": "Disk full on /dev/sda1",
+    },
+}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def test_decision_key_ignores_job_id_timestamp_and_formatting():
+    other = {
+        "job_id": 2,
+        "status": "FAIL",
+        "event_type": "job_issue",
+        "details": {"timestamp": "later", "source": "diskmonitor", "description": "  disk FULL on   /dev/sda1 "},
+    }
+    assert decision_key(EVENT) == decision_key(other)
+    changed = dict(EVENT, status="warning")
+    assert decision_key(EVENT) != decision_key(changed)
+
+def test_hit_miss_and_lru_eviction():
+    cache = DecisionCache(max_entries=2)
+    version = feedback_version(EVENT, [])
+    assert cache.get("a", version) is None
+    cache.put("a", version, "notify")
+    cache.put("b", version, "notify")
+    assert cache.get("a", version) == "notify"
+    cache.put("c", version, "escalate")  # evicts b, the least recently used
+    assert cache.get("b", version) is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["evictions"] == 1
+    assert stats["saved_llm_calls"] == 1
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = DecisionCache(ttl_seconds=10, clock=clock)
+    version = feedback_version(EVENT, [])
+    cache.put("a", version, "notify")
+    clock.now = 9
+    assert cache.get("a", version) == "notify"
+    clock.now = 11
+    assert cache.get("a", version) is None
+    assert cache.stats()["evictions"] == 1
+
+def test_new_feedback_invalidates_entry():
+    cache = DecisionCache()
+    cache.put("a", feedback_version(EVENT, []), "notify")
+    newer = feedback_version(EVENT, [{"action": "notify", "feedback": 1}])
+    assert cache.get("a", newer) is None
+    assert cache.stats()["invalidations"] == 1
+
+def test_shared_tier_promotes_and_store_feedback_invalidates(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    import feedback.store
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(feedback.store, "r", client)
+    version = feedback_version(EVENT, [])
+    key = decision_key(EVENT)
+    DecisionCache(shared=RedisDecisionTier(client)).put(key, version, "escalate")
+    # A second worker with a cold local tier hits the shared tier
+    other = DecisionCache(shared=RedisDecisionTier(client))
+    assert other.get(key, version) == "escalate"
+    assert other.stats()["shared_hits"] == 1
+    feedback.store.store_feedback(EVENT, "notify", 1, "wrong call")
+    fresh = DecisionCache(shared=RedisDecisionTier(client))
+    assert fresh.get(key, version) is None
@@ -0,0 +1,49 @@
+import threading
+import time
+
+from agentic_worker.dispatcher import KeyedDispatcher
+
+def test_same_key_runs_in_submission_order():
+    dispatcher = KeyedDispatcher(max_workers=4)
+    seen = []
+    def task(i):
+        # Earlier tasks sleep longer so any reordering would show up
+        time.sleep(0.01 * (5 - i))
+        seen.append(i)
+    for i in range(5):
+        dispatcher.submit("job-1", task, i)
+    dispatcher.shutdown()
+    assert seen == [0, 1, 2, 3, 4]
+
+def test_different_keys_run_concurrently():
+    dispatcher = KeyedDispatcher(max_workers=4)
+    start = time.perf_counter()
+    futures = [dispatcher.submit(f"job-{i}", time.sleep, 0.1) for i in range(4)]
+    for f in futures:
+        f.result()
+    assert time.perf_counter() - start < 0.3
+    dispatcher.shutdown()
+
+def test_submit_blocks_when_pending_limit_reached():
+    dispatcher = KeyedDispatcher(max_workers=1, max_pending=1)
+    release = threading.Event()
+    dispatcher.submit("a", release.wait)
+    submitted = threading.Event()
+    def second():
+        dispatcher.submit("b", lambda: None)
+        submitted.set()
+    threading.Thread(target=second, daemon=True).start()
+    assert not submitted.wait(0.1)
+    release.set()
+    assert submitted.wait(1)
+    dispatcher.shutdown()
+
+def test_exceptions_are_captured_and_chain_continues():
+    dispatcher = KeyedDispatcher(max_workers=2)
+    def boom():
+        raise RuntimeError("boom")
+    failed = dispatcher.submit("k", boom)
+    ok = dispatcher.submit("k", lambda: 42)
+    assert ok.result(timeout=1) == 42
+    assert isinstance(failed.exception(timeout=1), RuntimeError)
+    dispatcher.shutdown()
@@ -0,0 +1,33 @@
+import json
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from agentic_worker.event_queue import EventQueue
+
+QUEUE = "test:events"
+
+def make_client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+def test_fetch_drains_up_to_max_batch():
+    client = make_client()
+    client.rpush(QUEUE, *[json.dumps({"job_id": i}) for i in range(10)])
+    queue = EventQueue(client, QUEUE, max_batch=4, max_wait=0.1)
+    batch = queue.fetch()
+    assert [json.loads(p)["job_id"] for p in batch] == [0, 1, 2, 3]
+    assert client.llen(QUEUE) == 6
+
+def test_fetch_returns_partial_batch():
+    client = make_client()
+    client.rpush(QUEUE, "a", "b")
+    queue = EventQueue(client, QUEUE, max_batch=8, max_wait=0.1)
+    assert queue.fetch() == ["a", "b"]
+
+def test_fetch_times_out_on_empty_queue():
+    queue = EventQueue(make_client(), QUEUE, max_batch=8, max_wait=0.05)
+    assert queue.fetch() == []
+
+def test_max_batch_must_be_positive():
+    with pytest.raises(ValueError):
+        EventQueue(make_client(), QUEUE, max_batch=0)
@@ -0,0 +1,125 @@
+import threading
+
+import fakeredis
+import pytest
+
+from agentic.memory import Memory
+from history.archive import SegmentArchive, apply_retention, RETENTION_LOCK
+from history.store import (
+    write_records, query_history, count_records, find_event, ALL_INDEX, EVENT_INDEX, job_index,
+)
+
+def make_record(i):
+    return {
+        "event": {"job_id": i % 5, "status": "fail" if i % 2 else "warning", "event_type": "job_issue", "event_id": f"evt-{i}"},
+        "actions": [{"type": "notify", "params": {"message": "m", "escalation": i % 10 == 0}}],
+        "outcomes": [],
+        "processed_at": 1000.0 + i,
+    }
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def client(server):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    write_records(client, [make_record(i) for i in range(50)])
+    return client
+
+@pytest.fixture
+def archive(tmp_path):
+    return SegmentArchive(str(tmp_path / "archive"), block_size=4)
+
+def test_segment_round_trip_and_block_pruning(archive, monkeypatch):
+    archive.append([dict(make_record(i), id=i + 1) for i in range(10)])
+    (first, last, path), = archive.segments()
+    assert (first, last) == (1, 10)
+    footer = archive.footer(path)
+    assert footer['count'] == 10 and [b['first_id'] for b in footer['blocks']] == [1, 5, 9]
+
+    records, cursor = archive.query(limit=3)
+    assert [r["id"] for r in records] == [10, 9, 8] and cursor == 8
+    records, cursor = archive.query(limit=10, cursor=cursor)
+    assert [r["id"] for r in records] == list(range(7, 0, -1)) and cursor is None
+
+    reads = []
+    read_block = archive.read_block
+    monkeypatch.setattr(archive, "read_block", lambda p, b: reads.append(b['first_id']) or read_block(p, b))
+    records, _ = archive.query(since=1004.5, until=1006)
+    assert [r["id"] for r in records] == [7, 6]
+    assert reads == [5]
+
+def test_retention_moves_oldest_records_to_archive(client, archive):
+    assert apply_retention(client, archive, max_records=20, chunk=7) == 30
+    assert count_records(client) == 20
+    assert [int(i) for i in client.zrange(ALL_INDEX, 0, 0)] == [31]
+    assert not [int(i) for i in client.zrange(job_index(0), 0, -1) if int(i) <= 30]
+    assert find_event(client, "evt-0") is None and find_event(client, "evt-49") is not None
+    assert client.hlen(EVENT_INDEX) == 20
+    assert [s[:2] for s in archive.segments()] == [(1, 7), (8, 14), (15, 21), (22, 28), (29, 30)]
+    records, _ = archive.query(limit=100)
+    assert [r["id"] for r in records] == list(range(30, 0, -1))
+    assert apply_retention(client, archive, max_records=20) == 0
+
+def test_retention_by_age(client, archive):
+    assert apply_retention(client, archive, max_age=10, now=1049.5) == 40
+    assert [int(i) for i in client.zrange(ALL_INDEX, 0, 0)] == [41]
+
+def test_retention_skips_while_another_worker_holds_the_lock(client, archive):
+    client.set(RETENTION_LOCK, "other")
+    assert apply_retention(client, archive, max_records=10) == 0
+    assert count_records(client) == 50
+
+def test_retention_that_outlives_its_lock_stops_and_leaves_the_new_holder_alone(client, archive):
+    class LockStealingArchive:
+        # As if lock_ttl ran out during the first chunk and another worker took the lock
+        def append(self, records):
+            client.set(RETENTION_LOCK, "other")
+            return archive.append(records)
+    assert apply_retention(client, LockStealingArchive(), max_records=10, chunk=10) == 10
+    assert client.get(RETENTION_LOCK) == "other"
+    assert count_records(client) == 40
+
+def test_history_endpoint_continues_into_archive(client, server, archive, monkeypatch):
+    from fastapi.testclient import TestClient
+    import api.main
+
+    apply_retention(client, archive, max_records=20)
+    monkeypatch.setattr(api.main, "create_redis", lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(api.main, "archive", archive)
+    with TestClient(api.main.app) as http:
+        body = http.get("/history", params={"limit": 25, "status": "warning"}).json()
+        assert [r["id"] for r in body["records"]] == list(range(49, 0, -2))
+        body = http.get("/history", params={"limit": 5, "cursor": 23}).json()
+    assert [r["id"] for r in body["records"]] == [22, 21, 20, 19, 18] and body["next_cursor"] == 18
+    assert query_history(client, cursor=23) == ([], None)
+
+def test_memory_is_bounded_by_count_and_age():
+    now = [0.0]
+    memory = Memory(max_records=3, max_age=10, clock=lambda: now[0])
+    for i in range(5):
+        memory.record({"job_id": i}, [], [])
+        now[0] += 4
+    assert [r.event.job_id for r in memory.get_history()] == [3, 4]
+    memory.history[-1].feedback = {"rating": 1}
+    assert memory.get_history()[-1].feedback == {"rating": 1}
+    unbounded = Memory()
+    for i in range(5):
+        unbounded.record({"job_id": i}, [], [])
+    assert len(unbounded.get_history()) == 5
+
+def test_memory_record_returns_the_callers_entry_under_concurrency():
+    memory = Memory(max_records=50)
+    mismatches = []
+    def record(thread):
+        for i in range(500):
+            event_id = f"{thread}-{i}"
+            if memory.record({"job_id": thread, "event_id": event_id}, [], []).event_id != event_id:
+                mismatches.append(event_id)
+    threads = [threading.Thread(target=record, args=(t,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert mismatches == [] and len(memory.get_history()) == 50
\ No newline at end of file
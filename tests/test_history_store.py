@@ -0,0 +1,162 @@
+import json
+
+import fakeredis
+import pytest
+
+from history.store import (
+    write_records, query_history, find_event, latest_for_job, count_records, get_record,
+    query_history_async, find_event_async, latest_for_job_async, count_records_async,
+)
+
+def make_record(job_id, status="fail", escalation=False, processed_at=None):
+    record = {
+        "event": {"job_id": job_id, "status": status, "event_type": "job_issue"},
+        "actions": [{"type": "notify", "params": {"message": "m", "escalation": escalation}}],
+        "outcomes": [],
+    }
+    if processed_at is not None:
+        record["processed_at"] = processed_at
+    return record
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+@pytest.fixture
+def client(server):
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    write_records(client, [
+        make_record(i % 5, status="fail" if i % 2 else "warning", escalation=i % 10 == 0, processed_at=1000.0 + i)
+        for i in range(50)
+    ])
+    return client
+
+def test_write_assigns_sequential_ids(client):
+    stored = write_records(client, [make_record(7), make_record(8)])
+    assert [r["id"] for r in stored] == [51, 52]
+    assert count_records(client) == 52
+    assert get_record(client, 51)["event"]["job_id"] == 7
+
+def test_pages_newest_first_until_exhausted(client):
+    seen = []
+    cursor = None
+    while True:
+        records, cursor = query_history(client, limit=20, cursor=cursor)
+        seen.extend(r["id"] for r in records)
+        if cursor is None:
+            break
+    assert seen == list(range(50, 0, -1))
+
+def test_filters_combine(client):
+    records, _ = query_history(client, limit=100, job_id="3", status="fail")
+    assert records and all(r["event"]["job_id"] == 3 and r["event"]["status"] == "fail" for r in records)
+    assert len(records) == 5
+
+    records, _ = query_history(client, limit=100, escalated=True)
+    assert [r["id"] for r in records] == [41, 31, 21, 11, 1]
+    records, _ = query_history(client, limit=100, escalated=False, job_id=0)
+    assert [r["id"] for r in records] == [46, 36, 26, 16, 6]
+
+def test_time_range(client):
+    records, cursor = query_history(client, limit=100, since=1010, until=1014.5)
+    assert [r["processed_at"] for r in records] == [1014.0, 1013.0, 1012.0, 1011.0, 1010.0]
+    assert cursor is None
+    assert query_history(client, since=5000) == ([], None)
+
+def test_sparse_filter_returns_cursor_after_max_scan(client):
+    records, cursor = query_history(client, limit=10, status="warning", escalated=False, max_scan=12)
+    assert [r["id"] for r in records] == [49, 47, 45, 43, 39, 37, 35, 33, 29, 27]
+    assert cursor == 27
+    records, cursor = query_history(client, limit=10, job_id=0, status="warning", max_scan=6)
+    assert [r["id"] for r in records] == [41, 31, 21]
+    assert cursor == 21
+    records, cursor = query_history(client, limit=10, job_id=0, status="warning", cursor=cursor)
+    assert [r["id"] for r in records] == [11, 1]
+    assert cursor is None
+
+def test_smallest_filter_index_drives_the_scan(client):
+    # 5 escalated records against 25 warnings: the escalated index is read, not the status one
+    records, cursor = query_history(client, limit=10, status="warning", escalated=True, max_scan=3)
+    assert [r["id"] for r in records] == [41, 31, 21]
+    assert cursor == 21
+
+class CountingClient:
+    def __init__(self, client):
+        self.client, self.calls = client, []
+
+    def __getattr__(self, name):
+        self.calls.append(name)
+        return getattr(self.client, name)
+
+def test_small_limit_scans_in_chunks(client):
+    write_records(client, [make_record(1, escalation=True) for _ in range(1200)])
+    counting = CountingClient(client)
+    records, cursor = query_history(counting, limit=2, escalated=False, job_id=1)
+    assert [r["id"] for r in records] == [47, 42]
+    # 1210 job 1 entries: a few chunked round trips, not one per two entries
+    assert counting.calls.count("zrevrangebyscore") == 3
+
+def test_latest_for_job(client):
+    assert latest_for_job(client, 4)["id"] == 50
+    assert latest_for_job(client, 99) is None
+
+def test_history_endpoint_pages_with_cursor(client, server, monkeypatch):
+    from fastapi.testclient import TestClient
+    import api.main
+
+    monkeypatch.setattr(api.main, "create_redis", lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    with TestClient(api.main.app) as http:
+        body = http.get("/history", params={"limit": 3, "job_id": 2}).json()
+        assert [r["id"] for r in body["records"]] == [48, 43, 38]
+        body = http.get("/history", params={"limit": 3, "job_id": 2, "cursor": body["next_cursor"]}).json()
+        assert [r["id"] for r in body["records"]] == [33, 28, 23]
+        assert http.get("/history", params={"limit": 0}).status_code == 422
+
+def test_event_index_maps_event_id_to_record_and_hash(client):
+    from feedback.store import event_hash
+
+    submitted = dict(make_record(9)["event"], event_id="abc123")
+    stored = write_records(client, [{"event": submitted, "actions": [], "outcomes": []}, make_record(9)])
+    assert stored[0]["event_id"] == "abc123"
+    assert stored[1]["event_id"] and stored[1]["event_id"] != "abc123"
+    record, hash_value = find_event(client, "abc123")
+    assert record["id"] == stored[0]["id"]
+    assert hash_value == event_hash(submitted)
+    assert find_event(client, "missing") is None
+
+def test_feedback_endpoint_uses_event_id(client, server, monkeypatch):
+    from fastapi.testclient import TestClient
+    import api.main
+    import feedback.store
+
+    monkeypatch.setattr(api.main, "create_redis", lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    monkeypatch.setattr(feedback.store, "r", client)
+    with TestClient(api.main.app) as http:
+        event_id = http.post("/event", json={"job_id": 4, "status": "fail"}).json()["event_id"]
+        queued = json.loads(client.lpop("agentic:events"))
+        assert queued["event_id"] == event_id
+        # Same job_id as the newest record, but feedback must land on the submitted event
+        write_records(client, [{"event": dict(queued, details={"source": "Disk", "description": "full"}), "actions": [], "outcomes": []}])
+        write_records(client, [make_record(4)])
+        body = {"event_id": event_id, "user": "tester", "rating": 1}
+        assert http.post("/feedback", json=body).status_code == 200
+        assert feedback.store.get_feedback(dict(queued, details={"source": "Disk", "description": "full"}))[-1]["feedback"] == 1
+        # A job_id still works, and unknown ids are a 404
+        assert http.post("/feedback", json=dict(body, event_id="4")).status_code == 200
+        assert http.post("/feedback", json=dict(body, event_id="nope")).status_code == 404
+
+def test_async_reads_match_blocking_reads(client, server):
+    import asyncio
+
+    write_records(client, [{"event": {"job_id": 3, "status": "fail", "event_id": "e1"}, "actions": [], "outcomes": []}])
+    aclient = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    filters = [{}, {"job_id": 2}, {"status": "warning", "escalated": True}, {"since": 1010, "until": 1020}, {"cursor": 30, "max_scan": 7}]
+
+    async def reads():
+        pages = [await query_history_async(aclient, limit=4, **f) for f in filters]
+        return pages, await find_event_async(aclient, "e1"), await latest_for_job_async(aclient, 3), await count_records_async(aclient)
+
+    pages, found, latest, count = asyncio.run(reads())
+    assert pages == [query_history(client, limit=4, **f) for f in filters]
+    assert found == find_event(client, "e1") and found[0]["id"] == 51
+    assert latest == latest_for_job(client, 3) and count == 51
@@ -0,0 +1,93 @@
+import logging
+import os
+import shutil
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import feedback.store
+from agentic.hot_reload import FileWatcher
+from agentic.reasoning_llm import LLMReasoningModule
+from remediation.engine import DEFAULT_RULES_PATH
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+EVENT = {
+    "job_id": 1,
+    "status": "fail",
+    "event_type": "job_issue",
+    "details": {"source": "Queue", "description": "Backlog too large"},
+}
+
+NEW_RULES = """remediation_rules:
+  - match:
+      source: "Queue"
+      description_contains: "backlog"
+    action: "clear_queue"
+"""
+
+def touch(path, content):
+    with open(path, "w") as f:
+        f.write(content)
+    # Make sure the mtime moves even on coarse-grained filesystems
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+@pytest.fixture
+def reasoning(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(feedback.store, "r", fakeredis.FakeRedis())
+    shutil.copy(os.path.join(ROOT, "config.yaml"), tmp_path / "config.yaml")
+    shutil.copy(DEFAULT_RULES_PATH, tmp_path / "remediation.yaml")
+    return LLMReasoningModule(str(tmp_path / "config.yaml"), rules_path=str(tmp_path / "remediation.yaml"))
+
+def test_watcher_swaps_rules_on_change(reasoning):
+    watcher = FileWatcher({reasoning.rules_path: reasoning.reload_rules})
+    assert watcher.check() == []
+    touch(reasoning.rules_path, NEW_RULES)
+    assert watcher.check() == [reasoning.rules_path]
+    assert reasoning.decide(EVENT, {})[0]["params"]["remediation"] == "clear_queue"
+
+def test_invalid_rules_keep_previous_set(reasoning, caplog):
+    watcher = FileWatcher({reasoning.rules_path: reasoning.reload_rules})
+    previous = reasoning.remediation_rules
+    touch(reasoning.rules_path, "remediation_rules:\n  - match:\n      description_regex: '('\n    action: x\n")
+    caplog.set_level(logging.INFO, logger="agentic.hot_reload")
+    assert watcher.check() == []
+    assert watcher.failures == 1
+    assert [record.levelname for record in caplog.records] == ["WARNING"]
+    assert caplog.records[0].getMessage().startswith(f"Rejected {reasoning.rules_path}")
+    assert reasoning.remediation_rules is previous
+    # The broken file is not retried until it changes again
+    assert watcher.check() == [] and watcher.failures == 1
+
+def test_config_reload_updates_fast_path_and_llm_settings(reasoning):
+    with open(reasoning.config_path) as f:
+        config = f.read()
+    touch(reasoning.config_path, config.replace("read_timeout: 60", "read_timeout: 5").replace("decision: notify", "decision: escalate"))
+    reasoning.reload_config()
+    assert reasoning.llm_client.timeout[1] == 5
+    assert reasoning.fast_path.rules[0]["decision"] == "escalate"
+
+def test_invalid_config_is_rejected_atomically(reasoning):
+    previous_fast_path, previous_timeout = reasoning.fast_path, reasoning.llm_client.timeout
+    with open(reasoning.config_path) as f:
+        config = f.read()
+    # Valid LLM change plus an invalid fast path decision: nothing may be applied
+    touch(reasoning.config_path, config.replace("read_timeout: 60", "read_timeout: 5").replace("decision: notify", "decision: reboot"))
+    with pytest.raises(ValueError):
+        reasoning.reload_config()
+    assert reasoning.fast_path is previous_fast_path
+    assert reasoning.llm_client.timeout == previous_timeout
+
+@pytest.mark.parametrize("max_entries", ["null", "-1", "lots", "2.5"])
+def test_invalid_cache_limits_are_rejected_atomically(reasoning, max_entries):
+    previous_fast_path, previous_timeout = reasoning.fast_path, reasoning.llm_client.timeout
+    with open(reasoning.config_path) as f:
+        config = f.read()
+    touch(reasoning.config_path, config.replace("read_timeout: 60", "read_timeout: 5").replace("max_entries: 10000", f"max_entries: {max_entries}"))
+    with pytest.raises(ValueError, match="max_entries"):
+        reasoning.reload_config()
+    assert reasoning.fast_path is previous_fast_path
+    assert reasoning.llm_client.timeout == previous_timeout
+    assert reasoning.cache.max_entries == 10000
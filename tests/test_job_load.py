@@ -0,0 +1,61 @@
+import time
+from collections import Counter
+
+import fakeredis
+import yaml
+
+from agentic.records import loads
+from jobsim.load import JobType, LoadSimulator
+
+def simulator(**kwargs):
+    job_types = [JobType("etl", 10, {"success": 0.7, "failed": 0.2, "stuck": 0.1}), JobType("backup", 20, {"failed": 1.0})]
+    return LoadSimulator(job_types, **kwargs)
+
+def test_same_seed_gives_the_same_events():
+    assert list(simulator(seed=7).events(2000)) == list(simulator(seed=7).events(2000))
+    assert list(simulator(seed=7).events(2000)) != list(simulator(seed=8).events(2000))
+
+def test_runs_are_in_virtual_time_order_without_sleeping():
+    start = time.perf_counter()
+    runs = list(simulator(rate=50).runs(20000))
+    assert time.perf_counter() - start < 5
+    ends = [run.end for run in runs]
+    assert ends == sorted(ends) and ends[-1] > 20000 / 50 * 0.9
+
+def test_outcomes_follow_each_type_and_failures_are_retried():
+    sim = simulator(storm_rate=0, max_retries=2)
+    runs = list(sim.runs(5000))
+    outcomes = {name: Counter(run.outcome for run in runs if run.job_type == name and run.attempt == 0) for name in ("etl", "backup")}
+    assert set(outcomes["backup"]) == {"failed"} and "slow" not in outcomes["etl"]
+    assert 0.6 < outcomes["etl"]["success"] / sum(outcomes["etl"].values()) < 0.8
+    # every backup fails, so each one runs 1 + max_retries times
+    backup_jobs = sum(outcomes["backup"].values())
+    assert sum(1 for run in runs if run.job_type == "backup") == 3 * backup_jobs
+    assert sim.stats["jobs"] == 5000 and sim.stats["runs"] == len(runs)
+
+def test_storms_raise_failures_on_their_source():
+    sim = simulator(rate=10, storm_rate=60, storm_duration=60, storm_multiplier=20)
+    runs = [run for run in sim.runs(20000) if run.job_type == "etl" and run.attempt == 0]
+    def failure_rate(selected):
+        return sum(run.outcome != "success" for run in selected) / len(selected)
+    stormy = [run for run in runs if run.storm]
+    calm = [run for run in runs if not run.storm]
+    assert sim.stats["storms"] > 10 and stormy
+    assert failure_rate(stormy) > 0.8 > 0.4 > failure_rate(calm)
+
+def test_push_queues_worker_events():
+    client = fakeredis.FakeRedis()
+    stats = simulator(seed=1).push(client, 500, queue="test:events", batch_size=64)
+    queued = [loads(p) for p in client.lrange("test:events", 0, -1)]
+    assert stats["events"] == len(queued) > 0 and stats["jobs"] == 500
+    assert queued == list(simulator(seed=1).events(500))
+    assert {event["status"] for event in queued} <= {"fail", "stuck", "slow"}
+
+def test_from_config_reads_job_types_and_settings():
+    with open("config.yaml") as f:
+        config = yaml.safe_load(f)
+    sim = LoadSimulator.from_config(config, rate=5)
+    assert len(sim.job_types) == len({job["type"] for job in config["jobs"]})
+    assert sim.rate == 5 and sim.storm_duration == config["simulation"]["storms"]["duration"]
+    backup = next(t for t in sim.job_types if t.name == "backup")
+    assert backup.outcomes == config["simulation"]["outcomes"]["backup"]
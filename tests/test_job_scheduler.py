@@ -0,0 +1,70 @@
+import threading
+import time
+from collections import Counter
+
+from agent.orchestrator import JobAgent
+from jobsim.simulator import SimulatedJob
+
+RESOLUTION = {"failed": ["retry", "clear_temp_files", "escalate"], "stuck": ["restart_service", "clear_queue", "escalate"]}
+
+class ScriptedJob(SimulatedJob):
+    # Finishes with the given statuses in turn instead of random ones and records how many jobs of its type overlap
+    lock = threading.Lock()
+    running = Counter()
+    peak = Counter()
+
+    def __init__(self, job_id, job_type, outcomes, duration=0.05):
+        super().__init__(job_id, duration, job_type)
+        self.outcomes = list(outcomes)
+
+    def run(self):
+        with self.lock:
+            self.running[self.job_type] += 1
+            self.peak[self.job_type] = max(self.peak[self.job_type], self.running[self.job_type])
+        self.start_time = time.time()
+        time.sleep(self.expected_duration)
+        self.status = self.outcomes.pop(0)
+        self.end_time = time.time()
+        with self.lock:
+            self.running[self.job_type] -= 1
+        return self.status
+
+def make_agent(jobs, **scheduler):
+    config = {"resolution": RESOLUTION, "notifications": {"channels": ["console"]}, "scheduler": scheduler}
+    return JobAgent(jobs, config, llm_client=None)
+
+def test_jobs_run_concurrently_within_type_limits():
+    ScriptedJob.peak.clear()
+    jobs = [ScriptedJob(f"etl{i}", "etl", ["success"]) for i in range(4)]
+    jobs += [ScriptedJob(f"backup{i}", "backup", ["success"]) for i in range(3)]
+    agent = make_agent(jobs, max_workers=8, type_limits={"backup": 1})
+    makespan = agent.monitor()
+    assert all(job.status == "success" for job in jobs)
+    assert ScriptedJob.peak["etl"] == 4 and ScriptedJob.peak["backup"] == 1
+    # Three backups in a row bound the makespan, well under running all seven in turn
+    assert 0.15 <= makespan < 0.3
+    assert agent.runs == 7 and agent.resolution_latencies == []
+
+def test_default_type_limit_applies_to_unlisted_types():
+    ScriptedJob.peak.clear()
+    jobs = [ScriptedJob(f"sync{i}", "sync", ["success"]) for i in range(4)]
+    agent = make_agent(jobs, max_workers=8, default_type_limit=2)
+    agent.monitor()
+    assert ScriptedJob.peak["sync"] == 2
+
+def test_failed_job_is_resolved_and_rerun():
+    failing = ScriptedJob("job1", "etl", ["failed", "success"])
+    agent = make_agent([failing, ScriptedJob("job2", "etl", ["success"])])
+    agent.monitor()
+    # retry put the job back to pending, escalate then ran, and the rerun succeeded
+    assert failing.status == "success" and failing.retries == 1
+    assert agent.runs == 3 and len(agent.resolution_latencies) == 1
+
+def test_job_that_raises_does_not_stall_the_scheduler():
+    class BrokenJob(ScriptedJob):
+        def run(self):
+            raise RuntimeError("boom")
+    ok = ScriptedJob("job2", "etl", ["success"])
+    agent = make_agent([BrokenJob("job1", "etl", []), ok])
+    agent.monitor()
+    assert ok.status == "success" and agent.runs == 2
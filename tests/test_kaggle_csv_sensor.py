@@ -0,0 +1,88 @@
+import csv
+import tracemalloc
+
+import pytest
+
+from agentic.kaggle_csv_sensor import KaggleCSVSensor, map_status
+
+HEADER = ["Nível", "Data e Hora", "Fonte", "Identificação do Evento", "Description1"]
+LEVELS = ["Erro", "Aviso", "Informações", "Crítico"]
+
+def write_rows(path, rows, header=True, mode="w"):
+    with open(path, mode, encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(HEADER)
+        writer.writerows(rows)
+
+def make_rows(start, count):
+    return [[LEVELS[i % 4], f"2024-07-19 12:{i % 60:02d}", f"Source{i % 3}", str(i), f"event {i}"] for i in range(start, start + count)]
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "eventos.csv"
+    write_rows(path, make_rows(0, 10))
+    return str(path)
+
+def test_reads_rows_lazily_as_events(csv_path):
+    with KaggleCSVSensor(csv_path) as sensor:
+        events = list(sensor.events())
+        assert sensor.get_event() is None
+    assert [e["job_id"] for e in events] == [str(i) for i in range(10)]
+    assert events[0] == {
+        "job_id": "0",
+        "status": "fail",
+        "event_type": "job_issue",
+        "details": {"timestamp": "2024-07-19 12:00", "source": "Source0", "description": "event 0"},
+    }
+    assert events[3]["status"] == "escalate" and events[3]["escalate"] is True
+    assert [map_status(level) for level in LEVELS] == ["fail", "warning", "success", "escalate"]
+
+def test_quoted_newlines_and_missing_trailing_newline(tmp_path):
+    path = tmp_path / "eventos.csv"
+    path.write_bytes("Nível,Fonte,Description1\nErro,Disk,\"line one\nline \"\"two\"\"\"\n\nAviso,Net,last".encode("utf-8"))
+    events = list(KaggleCSVSensor(str(path)).events())
+    assert [e["details"]["description"] for e in events] == ['line one\nline "two"', "last"]
+    assert [e["job_id"] for e in events] == [1, 2]
+
+def test_checkpoint_resumes_after_restart(csv_path, tmp_path):
+    checkpoint = str(tmp_path / "sensor.json")
+    sensor = KaggleCSVSensor(csv_path, checkpoint_path=checkpoint, checkpoint_every=3)
+    first = [sensor.get_event()["job_id"] for _ in range(4)]
+    # Simulate a crash: only the checkpoint written after the third event survives
+    resumed = KaggleCSVSensor(csv_path, checkpoint_path=checkpoint)
+    assert [e["job_id"] for e in resumed.events()] == [str(i) for i in range(3, 10)]
+    assert first == ["0", "1", "2", "3"]
+    resumed.close()
+    assert list(KaggleCSVSensor(csv_path, checkpoint_path=checkpoint).events()) == []
+
+def test_batches(csv_path):
+    sizes = [len(batch) for batch in KaggleCSVSensor(csv_path).batches(4)]
+    assert sizes == [4, 4, 2]
+
+def test_follow_tails_appended_rows_and_waits_for_partial_lines(csv_path):
+    sensor = KaggleCSVSensor(csv_path, follow=True)
+    assert len(sensor.get_events(100)) == 10
+    assert sensor.get_event() is None
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("Erro,2024-07-19 13:00,Source9,42,half wri")
+    assert sensor.get_event() is None
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("tten\n")
+    assert sensor.get_event()["details"]["description"] == "half written"
+    write_rows(csv_path, make_rows(100, 1))  # truncated and rewritten
+    assert sensor.get_event() is None
+    assert sensor.get_event()["job_id"] == "100"
+
+def test_peak_memory_does_not_grow_with_file_size(tmp_path):
+    def peak(rows):
+        path = tmp_path / f"rows{rows}.csv"
+        write_rows(path, make_rows(0, rows))
+        tracemalloc.start()
+        for _ in KaggleCSVSensor(str(path)).events():
+            pass
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak_bytes
+    small, large = peak(1000), peak(50000)
+    assert large < small * 2
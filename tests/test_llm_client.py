@@ -0,0 +1,190 @@
+import threading
+import time
+import pytest
+
+from llm.circuit_breaker import CircuitBreaker
+from llm.llama3_client import Llama3Client, parse_batch_response
+
+CONFIG = {
+    "llm": {
+        "endpoint": "http://localhost:1234/v1",
+        "model": "llama-3",
+        "log_analysis_prompt": "Analyze this log and suggest resolution steps:",
+        "max_concurrency": 4,
+    }
+}
+
+class CountingEndpoint:
+    # Stub for the model call: counts requests and holds each one open briefly
+    def __init__(self, latency=0.1, fail=False):
+        self.latency = latency
+        self.fail = fail
+        self.calls = 0
+        self.lock = threading.Lock()
+    def __call__(self, prompt):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.latency)
+        if self.fail:
+            raise RuntimeError("model down")
+        return f"notify: {prompt[-10:]}"
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return Llama3Client(CONFIG)
+
+def burst(client, log_texts):
+    results = [None] * len(log_texts)
+    def call(i):
+        results[i] = client.analyze_log(log_texts[i])
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(log_texts))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+def test_identical_concurrent_prompts_share_one_request(client):
+    endpoint = CountingEndpoint()
+    client._complete = endpoint
+    results = burst(client, ["Disk full on /dev/sda1"] * 20)
+    assert endpoint.calls == 1
+    assert len(set(results)) == 1 and results[0].startswith("notify")
+    assert client.coalesced == 19
+
+def test_distinct_prompts_are_not_coalesced(client):
+    endpoint = CountingEndpoint(latency=0.01)
+    client._complete = endpoint
+    burst(client, [f"error {i}" for i in range(5)])
+    assert endpoint.calls == 5
+
+def test_errors_are_shared_and_not_retained(client):
+    endpoint = CountingEndpoint(fail=True)
+    client._complete = endpoint
+    results = burst(client, ["same"] * 5)
+    assert endpoint.calls == 1
+    assert all(r.startswith("[LLM Error]") for r in results)
+    # The failed flight is cleared, so the next caller tries again
+    client.analyze_log("same")
+    assert endpoint.calls == 2
+
+def test_coalesce_key_shares_request_across_prompts(client):
+    endpoint = CountingEndpoint()
+    client._complete = endpoint
+    results = [None] * 2
+    def call(i):
+        results[i] = client.analyze_log(f"Job ID: {i}\nDisk full", coalesce_key="disk-full")
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert endpoint.calls == 1
+    assert results[0] == results[1]
+
+def test_parse_batch_response_tolerates_surrounding_text():
+    labels = parse_batch_response('Sure! {"1": "Notify", "2": "escalate", "3": "reboot", "9": "notify"} done', 3)
+    assert labels == {0: "notify", 1: "escalate"}
+    with pytest.raises(ValueError):
+        parse_batch_response("I think event 1 should be escalated", 2)
+
+def test_analyze_logs_classifies_batch_in_one_call(client):
+    prompts = []
+    def complete(prompt):
+        prompts.append(prompt)
+        return '{"1": "notify", "2": "escalate", "3": "remediate"}'
+    client._complete = complete
+    results = client.analyze_logs(["a", "b", "c"], job_ids=[1, 2, 3])
+    assert results == ["notify", "escalate", "remediate"]
+    assert len(prompts) == 1 and "Event 3:\nc" in prompts[0]
+
+def test_analyze_logs_falls_back_per_event(client):
+    prompts = []
+    def complete(prompt):
+        prompts.append(prompt)
+        if len(prompts) == 1:
+            return '{"2": "escalate"}'  # batch reply misses event 1
+        return "notify the owner"
+    client._complete = complete
+    assert client.analyze_logs(["a", "b"]) == ["notify the owner", "escalate"]
+    assert len(prompts) == 2 and client.batch_fallbacks == 1
+
+@pytest.fixture
+def stub_server():
+    from benchmarks.stub_llm_server import StubLLMServer
+    server = StubLLMServer(overhead=0).start()
+    yield server
+    server.stop()
+
+def http_client(server, **overrides):
+    config = {"llm": dict(CONFIG["llm"], endpoint=server.endpoint, backoff_base=0.01, backoff_max=0.02, **overrides)}
+    return Llama3Client(config)
+
+def test_http_round_trip_reuses_pooled_session(client, stub_server):
+    llm = http_client(stub_server)
+    assert llm.analyze_log("Disk full") == "notify the owner"
+    assert llm.analyze_log("Disk full again") == "notify the owner"
+    assert http_client(stub_server).session is llm.session
+    assert stub_server.requests == 2
+
+def test_retries_transient_failures(client, stub_server):
+    llm = http_client(stub_server, max_retries=2)
+    stub_server.fail_next = 2
+    assert llm.analyze_log("Disk full") == "notify the owner"
+    assert stub_server.requests == 3
+
+def test_read_timeout_gives_up_after_retries(client, stub_server):
+    stub_server.overhead = 0.3
+    llm = http_client(stub_server, read_timeout=0.05, max_retries=1)
+    start = time.perf_counter()
+    assert llm.analyze_log("slow").startswith("[LLM Error]")
+    assert time.perf_counter() - start < 0.3 * 2
+
+def test_circuit_opens_and_short_circuits(client, stub_server):
+    llm = http_client(stub_server, max_retries=0, circuit_failure_threshold=2, circuit_reset_timeout=60)
+    stub_server.fail_every = 1
+    llm.analyze_log("a")
+    llm.analyze_log("b")
+    assert llm.breaker.state == "open"
+    assert "circuit open" in llm.analyze_log("c")
+    assert stub_server.requests == 2
+
+class BrokenSession:
+    # Session whose responses fail while the body is read or parsed
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+    def post(self, url, json=None, timeout=None):
+        self.calls += 1
+        raise self.error
+
+class GarbledSession:
+    def post(self, url, json=None, timeout=None):
+        class Response:
+            status_code = 200
+            def json(self):
+                return {"unexpected": True}
+        return Response()
+
+def test_half_open_trial_failures_reopen_the_circuit(client):
+    import requests
+    client.max_retries = 1
+    client.backoff_base = client.backoff_max = 0
+    client.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    client.session = BrokenSession(requests.exceptions.ChunkedEncodingError("connection broken"))
+    assert client.analyze_log("a").startswith("[LLM Error]")
+    assert client.session.calls == 2 and client.breaker.state == "open"
+    client.session = GarbledSession()
+    assert client.analyze_log("b").startswith("[LLM Error]")  # half-open trial with an unparseable body
+    assert client.breaker.state == "open"
+    client.session = BrokenSession(requests.exceptions.ContentDecodingError("bad gzip"))
+    assert client.analyze_log("c").startswith("[LLM Error]")
+    assert client.session.calls == 2  # the circuit let the next trial through instead of staying shut
+
+def test_analyze_logs_does_not_retry_per_event_when_the_model_is_down(client, stub_server):
+    llm = http_client(stub_server, max_retries=2)
+    stub_server.fail_every = 1
+    results = llm.analyze_logs([f"event {i}" for i in range(8)], job_ids=list(range(1, 9)))
+    assert len(results) == 8 and all(result.startswith("[LLM Error]") for result in results)
+    assert stub_server.requests == 3 and llm.batch_fallbacks == 0
@@ -0,0 +1,63 @@
+import io
+import json
+import logging
+
+import pytest
+
+import notifications.notifier as notifier
+from agentic.log import configure_logging, file_logger, flush
+
+@pytest.fixture
+def root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield root
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+def test_file_logger_writes_json_lines_in_the_background(tmp_path):
+    logger = file_logger("test_log.file", "test.log", directory=tmp_path)
+    assert file_logger("test_log.file", "other.log", directory=tmp_path) is logger
+    logger.info("llm result", extra={"fields": {"job_id": 7, "response": "notify"}})
+    logger.debug("below the level")
+    assert flush(timeout=5)
+    lines = (tmp_path / "test.log").read_text(encoding="utf-8").splitlines()
+    assert len(lines) == 1
+    entry = json.loads(lines[0])
+    assert entry["msg"] == "llm result" and entry["job_id"] == 7 and entry["response"] == "notify"
+    assert entry["level"] == "INFO" and entry["logger"] == "test_log.file" and entry["ts"] > 0
+    assert not (tmp_path / "other.log").exists()
+
+def test_console_is_level_gated_and_skips_file_loggers(root_logger, tmp_path):
+    stream = io.StringIO()
+    configure_logging(level="INFO", stream=stream)
+    quiet = file_logger("test_log.quiet", "quiet.log", directory=tmp_path)
+    logging.getLogger("agentic_worker").debug("Processing event: %s", {"job_id": 1})
+    logging.getLogger("agentic_worker").error("Error processing event: %s", "boom")
+    quiet.info("file only")
+    assert flush(timeout=5)
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [(line["level"], line["msg"]) for line in lines] == [("ERROR", "Error processing event: boom")]
+    root_logger.setLevel(logging.DEBUG)
+    logging.getLogger("agentic_worker").debug("Processing event: %s", {"job_id": 1})
+    assert flush(timeout=5)
+    assert "Processing event" in stream.getvalue().splitlines()[-1]
+
+def test_notifier_without_rich_console_only_logs(monkeypatch, tmp_path, capsys, caplog):
+    monkeypatch.setattr(notifier, "rich_console", False)
+    monkeypatch.setattr(notifier, "escalation_logger", file_logger("test_log.escalation", "escalation.log", directory=tmp_path))
+    caplog.set_level(logging.INFO, logger="notifications")
+    effector = notifier.NotifierEffector()
+    job = {"job_id": 3, "status": "fail"}
+    effector.execute("notify", {"job": job, "escalation": True})
+    effector.execute("notify", {"job": job})
+    effector.execute("remediate", {"job": job, "remediation": "restart"})
+    assert capsys.readouterr().out == ""
+    assert [record.getMessage() for record in caplog.records] == [
+        "ESCALATION: Manual intervention required for job 3",
+        "Notification: Issue detected and handled for job 3 (status: fail)",
+        "Remediation action: restart for job 3 (status: fail)",
+    ]
+    assert flush(timeout=5)
+    entry = json.loads((tmp_path / "escalation.log").read_text(encoding="utf-8"))
+    assert entry["msg"] == "ESCALATED EVENT" and entry["job"] == job
@@ -0,0 +1,137 @@
+import json
+import time
+
+import fakeredis
+import pytest
+from fastapi.testclient import TestClient
+
+import api.main
+from agentic.memory import Memory
+from agentic.metrics import METRICS_KEY, Metrics, render_prometheus
+from agentic.reasoning_simple import SimpleReasoningModule
+from history.store import query_history
+
+def test_flush_adds_increments_and_renders_cumulative_buckets():
+    client = fakeredis.FakeRedis(decode_responses=True)
+    metrics = Metrics(buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.5):
+        metrics.observe("decide", seconds)
+    metrics.inc("llm_requests_total", 3)
+    metrics.flush(client)
+    metrics.observe("decide", 0.001)
+    metrics.inc("llm_requests_total")
+    metrics.flush(client)
+    assert metrics.flush(client) == 0  # nothing new
+    text = render_prometheus(client.hgetall(METRICS_KEY), buckets=(0.01, 0.1), gauges=[("queue_depth", "Queued", 7)])
+    assert 'agentic_stage_duration_seconds_bucket{stage="decide",le="0.01"} 2' in text
+    assert 'agentic_stage_duration_seconds_bucket{stage="decide",le="0.1"} 3' in text
+    assert 'agentic_stage_duration_seconds_bucket{stage="decide",le="+Inf"} 4' in text
+    assert 'agentic_stage_duration_seconds_count{stage="decide"} 4' in text
+    assert 'agentic_stage_duration_seconds_sum{stage="decide"} 0.556' in text
+    assert "agentic_llm_requests_total 4" in text and "agentic_llm_errors_total 0" in text
+    assert "# TYPE agentic_queue_depth gauge\nagentic_queue_depth 7" in text
+
+def test_failed_flush_keeps_the_counts():
+    class Down:
+        def pipeline(self, transaction=True):
+            raise ConnectionError("redis down")
+    metrics = Metrics()
+    metrics.observe("decide", 0.2)
+    metrics.inc("events_processed_total")
+    with pytest.raises(ConnectionError):
+        metrics.flush(Down())
+    client = fakeredis.FakeRedis(decode_responses=True)
+    metrics.flush(client)
+    assert client.hget(METRICS_KEY, "counter:events_processed_total") == "1"
+    assert client.hget(METRICS_KEY, "stage:decide:count") == "1"
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.timer("decide"):
+        metrics.inc("events_processed_total")
+    assert metrics.flush(fakeredis.FakeRedis()) == 0
+
+@pytest.fixture
+def worker(monkeypatch):
+    import agentic_worker.main as worker
+
+    monkeypatch.setattr(worker, "redis_client", fakeredis.FakeRedis(decode_responses=True))
+    monkeypatch.setattr(worker.agent, "memory", Memory())
+    monkeypatch.setattr(worker.agent, "reasoning_module", SimpleReasoningModule())
+    monkeypatch.setattr(worker.agent, "effectors", [])
+    monkeypatch.setattr(worker.agent, "suppressor", None)
+    monkeypatch.setattr(worker, "metrics", Metrics())
+    return worker
+
+def test_worker_counts_stages_and_strips_enqueued_at(worker):
+    payloads = [json.dumps({"job_id": i, "status": "fail", "event_id": f"e{i}", "enqueued_at": time.time() - 2}) for i in range(3)]
+    worker.process_batch(payloads + ["{not json"])
+    worker.process_event({"job_id": 9, "status": "fail"})
+    worker.metrics.flush(worker.redis_client)
+    fields = worker.redis_client.hgetall(METRICS_KEY)
+    assert fields["counter:events_processed_total"] == "4" and fields["counter:events_failed_total"] == "1"
+    assert fields["stage:queue_wait:count"] == "3" and float(fields["stage:queue_wait:sum"]) >= 6
+    assert fields["stage:decide_batch:count"] == "1" and fields["stage:decide:count"] == "1"
+    assert fields["stage:history_write:count"] == "2" and fields["stage:effector_execute:count"] == "4"
+    records, _ = query_history(worker.redis_client)
+    assert all("enqueued_at" not in record["event"] for record in records)
+
+def test_metrics_endpoint(monkeypatch):
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(api.main, "create_redis", lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True))
+    metrics = Metrics()
+    metrics.observe("llm_call", 0.3)
+    metrics.inc("llm_requests_total", 4)
+    metrics.inc("llm_errors_total")
+    metrics.flush(client)
+    with TestClient(api.main.app) as http:
+        assert http.post("/events", json=[{"job_id": 1, "status": "fail"}, {"job_id": 2, "status": "fail"}]).status_code == 200
+        response = http.get("/metrics")
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain")
+    assert "agentic_queue_depth 2" in response.text
+    assert "agentic_llm_error_ratio 0.25" in response.text
+    assert 'agentic_stage_duration_seconds_count{stage="llm_call"} 1' in response.text
+    assert all("enqueued_at" in json.loads(item) for item in client.lrange(api.main.EVENT_QUEUE, 0, -1))
+
+def test_circuit_open_rejections_are_not_counted_as_requests(monkeypatch):
+    import llm.llama3_client
+    from llm.llama3_client import Llama3Client
+
+    monkeypatch.setattr(llm.llama3_client, "metrics", Metrics())
+    client = Llama3Client({"llm": {"endpoint": "http://localhost:1", "model": "m", "log_analysis_prompt": "p", "max_retries": 0,
+                                   "backoff_base": 0, "circuit_failure_threshold": 1, "circuit_reset_timeout": 60}})
+    assert client.analyze_log("a").startswith("[LLM Error]")  # sent, connection refused, circuit opens
+    assert "circuit open" in client.analyze_log("b")
+    assert "circuit open" in client.analyze_log("c")
+    redis_client = fakeredis.FakeRedis(decode_responses=True)
+    llm.llama3_client.metrics.flush(redis_client)
+    fields = redis_client.hgetall(METRICS_KEY)
+    assert fields["counter:llm_requests_total"] == "1" and fields["counter:llm_errors_total"] == "1"
+    assert fields["counter:llm_rejected_total"] == "2" and fields["stage:llm_call:count"] == "1"
+
+def test_dispatch_batch_nacks_payloads_that_are_not_events(worker):
+    from agentic_worker.dispatcher import KeyedDispatcher
+
+    class Queue:
+        def __init__(self):
+            self.acked, self.nacked = [], []
+        def ack(self, payload):
+            self.acked.append(payload)
+        def nack(self, payload):
+            self.nacked.append(payload)
+    queue = Queue()
+    good = json.dumps({"job_id": 1, "status": "fail", "enqueued_at": time.time()})
+    dispatcher = KeyedDispatcher(max_workers=2)
+    worker.dispatch_batch(["[1, 2]", '"x"', "7", good], dispatcher, queue)
+    dispatcher.join(timeout=5)
+    dispatcher.shutdown()
+    assert queue.nacked == ["[1, 2]", '"x"', "7"] and queue.acked == [good]
+    worker.metrics.flush(worker.redis_client)
+    assert worker.redis_client.hget(METRICS_KEY, "counter:events_failed_total") == "3"
+
+def test_load_event_accepts_only_json_objects(worker):
+    assert worker.load_event('{"job_id": 1}') == {"job_id": 1}
+    for payload in ("[1, 2]", '"x"', "7", "null"):
+        with pytest.raises(ValueError, match="not a JSON object"):
+            worker.load_event(payload)
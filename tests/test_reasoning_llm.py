@@ -0,0 +1,73 @@
+import os
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+import feedback.store
+from agentic.reasoning_llm import LLMReasoningModule
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config.yaml")
+
+def make_event(job_id, source="TestSource", description="Service crashed unexpectedly.", status="fail"):
+    return {
+        "job_id": job_id,
+        "status": status,
+        "event_type": "job_issue",
+        "details": {"timestamp": "2024-07-19T12:00:00Z", "source": source, "description": description},
+    }
+
+@pytest.fixture
+def reasoning(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(feedback.store, "r", fakeredis.FakeRedis())
+    module = LLMReasoningModule(CONFIG_PATH)
+    module.fast_path = module.fast_path._replace(enabled=False)
+    module.prompts = []
+    def complete(prompt):
+        module.prompts.append(prompt)
+        return '{"1": "notify", "2": "escalate"}'
+    module.llm_client._complete = complete
+    return module
+
+def test_decide_batch_uses_one_llm_call_and_dedupes(reasoning):
+    events = [
+        make_event(1),
+        make_event(2, source="Updater", description="update failed"),
+        make_event(3),  # same content as event 1
+    ]
+    decisions = reasoning.decide_batch(events, {})
+    assert len(reasoning.prompts) == 1
+    assert decisions[0][0]["params"]["escalation"] is False
+    assert decisions[1][0]["params"]["escalation"] is True
+    assert decisions[2][0]["params"]["job"]["job_id"] == 3
+    assert [a["type"] for a in decisions[0]] == ["notify", "remediate"]
+    # Second pass is served from the decision cache
+    reasoning.decide_batch(events, {})
+    assert len(reasoning.prompts) == 1
+
+def test_model_outage_falls_back_to_rule_based_path(reasoning):
+    def down(prompt):
+        raise ConnectionError("model down")
+    reasoning.llm_client._complete = down
+    actions = reasoning.decide(make_event(1), {})
+    # SimpleReasoningModule escalates failures; remediation.yaml still applies
+    assert actions[0] == {"type": "notify", "params": {"job": make_event(1), "escalation": True}}
+    assert actions[1]["params"]["remediation"] == "restart_service"
+    assert reasoning.llm_fallbacks == 1
+    # Errors are never cached
+    assert reasoning.cache.stats()["size"] == 0
+
+def test_fast_path_settles_events_without_llm(reasoning):
+    reasoning.fast_path = reasoning.fast_path._replace(enabled=True)
+    escalated = dict(make_event(1, source="Other", description="overheating"), escalate=True)
+    remediable = make_event(2)
+    chatter = make_event(3, source="Other", description="heartbeat ok", status="debug")
+    unknown = make_event(4, source="Other", description="something odd")
+    decisions = reasoning.decide_batch([escalated, remediable, chatter, unknown], {})
+    assert decisions[0] == [{"type": "notify", "params": {"job": escalated, "escalation": True}}]
+    assert decisions[1] == [{"type": "remediate", "params": {"job": remediable, "remediation": "restart_service"}}]
+    assert decisions[2] == [{"type": "notify", "params": {"job": chatter, "escalation": False}}]
+    # Only the event no tier could settle reaches the model
+    assert len(reasoning.prompts) == 1 and "something odd" in reasoning.prompts[0]
+    tiers = reasoning.stats()["tiers"]
+    assert (tiers["escalation"], tiers["remediation"], tiers["rules"], tiers["llm"]) == (1, 1, 1, 1)
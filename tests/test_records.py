@@ -0,0 +1,52 @@
+import json
+
+from agentic.records import Action, Event, HistoryEntry, dumps, loads
+
+EVENT = {
+    "job_id": 7,
+    "status": "fail",
+    "event_type": "job_issue",
+    "details": {"timestamp": "2024-07-19T12:00:00Z", "source": "DiskMonitor", "description": "Disk full"},
+    "escalate": True,
+    "region": "eu",
+}
+
+def decided_actions(event):
+    # The shape reasoning modules return: every action embeds the event
+    return [
+        {"type": "notify", "params": {"job": event, "escalation": True}},
+        {"type": "remediate", "params": {"job": event, "remediation": "clear_temp_files"}},
+    ]
+
+def test_event_round_trip_keeps_unknown_keys():
+    assert Event.from_dict(EVENT).to_dict() == EVENT
+    assert Event.from_dict({"job_id": 1, "status": "ok"}).to_dict() == {"job_id": 1, "status": "ok"}
+
+def test_actions_reference_the_event_by_id():
+    entry = HistoryEntry.from_parts(EVENT, decided_actions(EVENT), [None, None])
+    assert entry.event_id and all(action.event_id == entry.event_id for action in entry.actions)
+    record = entry.to_dict()
+    assert record["actions"] == [
+        {"type": "notify", "params": {"event_id": entry.event_id, "escalation": True}},
+        {"type": "remediate", "params": {"event_id": entry.event_id, "remediation": "clear_temp_files"}},
+    ]
+    assert record["event"] == dict(EVENT, event_id=entry.event_id)
+    assert entry.is_escalated()
+
+def test_foreign_job_params_are_kept():
+    other = {"job_id": 99, "status": "fail"}
+    action = Action.from_dict({"type": "notify", "params": {"job": other, "message": "hi"}}, Event.from_dict(EVENT), EVENT)
+    assert action.event_id is None
+    assert action.to_dict() == {"type": "notify", "params": {"job": other, "message": "hi"}}
+
+def test_legacy_record_dicts_compact_on_load():
+    legacy = {"event": EVENT, "actions": decided_actions(EVENT), "outcomes": [None, None], "id": 3, "processed_at": 1.5}
+    entry = HistoryEntry.from_dict(legacy)
+    assert entry.id == 3 and entry.processed_at == 1.5
+    assert HistoryEntry.from_dict(entry.to_dict()).to_dict() == entry.to_dict()
+    assert len(dumps(entry.to_dict())) < len(json.dumps(legacy))
+
+def test_wire_format_is_plain_json():
+    record = HistoryEntry.from_parts(EVENT, decided_actions(EVENT), [None, None]).to_dict()
+    assert isinstance(dumps(record), bytes)
+    assert json.loads(dumps(record)) == record == loads(dumps(record))
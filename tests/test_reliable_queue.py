@@ -0,0 +1,76 @@
+import pytest
+
+fakeredis = pytest.importorskip("fakeredis")
+
+from agentic_worker.event_queue import ReliableEventQueue
+
+QUEUE = "test:events"
+
+def make_queue(client, worker_id, **kwargs):
+    kwargs.setdefault("max_wait", 0.05)
+    return ReliableEventQueue(client, QUEUE, worker_id=worker_id, **kwargs)
+
+@pytest.fixture
+def client():
+    return fakeredis.FakeRedis(decode_responses=True)
+
+def test_fetch_moves_events_to_processing_list(client):
+    client.rpush(QUEUE, "a", "b", "c")
+    queue = make_queue(client, "w1", max_batch=2)
+    assert queue.fetch() == ["a", "b"]
+    assert client.lrange(QUEUE, 0, -1) == ["c"]
+    assert client.lrange(queue.processing, 0, -1) == ["a", "b"]
+
+def test_ack_removes_in_flight_entry(client):
+    client.rpush(QUEUE, "a")
+    queue = make_queue(client, "w1")
+    queue.fetch()
+    queue.ack("a")
+    assert client.llen(queue.processing) == 0
+    assert client.llen(QUEUE) == 0
+
+def test_ack_keeps_attempts_of_an_identical_copy_in_flight(client):
+    client.rpush(QUEUE, "dup", "dup")
+    queue = make_queue(client, "w1", max_batch=1, max_attempts=2)
+    assert queue.fetch() == ["dup"]
+    queue.nack("dup")
+    assert queue.fetch() == ["dup"]
+    assert queue.fetch() == ["dup"]
+    queue.ack("dup")
+    assert client.hget(queue.attempts_key, queue._digest("dup")) == "1"
+    queue.ack("dup")
+    assert client.hlen(queue.attempts_key) == 0
+
+def test_nack_requeues_then_dead_letters(client):
+    client.rpush(QUEUE, "poison")
+    queue = make_queue(client, "w1", max_attempts=2)
+    for _ in range(2):
+        assert queue.fetch() == ["poison"]
+        queue.nack("poison")
+    # Third delivery exceeds max_attempts and goes to the dead-letter list
+    assert queue.fetch() == []
+    assert client.lrange(queue.dead_letter, 0, -1) == ["poison"]
+    assert client.llen(queue.processing) == 0
+    assert client.hlen(queue.attempts_key) == 0
+
+def test_reaper_requeues_entries_of_dead_worker_in_order(client):
+    client.rpush(QUEUE, "a", "b", "c")
+    crashed = make_queue(client, "crashed", max_batch=2, visibility_timeout=1)
+    crashed.heartbeat()
+    assert crashed.fetch() == ["a", "b"]
+    survivor = make_queue(client, "survivor")
+    survivor.heartbeat()
+    # Heartbeat still alive: nothing to reap
+    assert survivor.reap() == 0
+    client.delete(crashed._heartbeat_key("crashed"))
+    assert survivor.reap() == 2
+    assert client.lrange(QUEUE, 0, -1) == ["a", "b", "c"]
+    assert "crashed" not in client.smembers(survivor.workers_key)
+    assert client.hget(survivor.attempts_key, survivor._digest("a")) == "1"
+
+def test_recover_requeues_own_in_flight_entries(client):
+    client.rpush(QUEUE, "a")
+    make_queue(client, "w1").fetch()
+    restarted = make_queue(client, "w1")
+    assert restarted.recover() == 1
+    assert restarted.fetch() == ["a"]
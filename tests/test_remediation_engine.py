@@ -0,0 +1,57 @@
+import random
+import pytest
+
+from remediation.engine import (
+    load_remediation_rules, compile_remediation_rules, find_remediation_action, CompiledRules,
+)
+
+def make_event(status="fail", source="TestSource", description="Service crashed unexpectedly.", event_type="job_issue"):
+    return {"job_id": 1, "status": status, "event_type": event_type,
+            "details": {"source": source, "description": description}}
+
+def test_compiled_rules_match_shipped_yaml():
+    rules = load_remediation_rules()
+    compiled = compile_remediation_rules(rules)
+    assert find_remediation_action(make_event(), compiled) == "restart_service"
+    assert find_remediation_action(make_event(source="DiskMonitor", description="DISK FULL on /dev/sda1"), compiled) == "clear_temp_files"
+    assert find_remediation_action(make_event(source="UnknownSource"), compiled) is None
+
+def test_priority_and_regex():
+    rules = [
+        {"match": {"status": "fail"}, "action": "generic"},
+        {"match": {"source": "Db", "description_regex": r"deadlock.*table \w+"}, "action": "kill_blocker", "priority": 10},
+    ]
+    compiled = CompiledRules(rules)
+    event = make_event(source="Db", description="Deadlock detected on table orders")
+    assert compiled.match(event) == "kill_blocker"
+    assert find_remediation_action(event, rules) == "kill_blocker"
+    assert compiled.match(make_event(source="Db", description="slow query")) == "generic"
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        CompiledRules([{"match": {"description_regex": "("}, "action": "x"}])
+    with pytest.raises(ValueError):
+        CompiledRules([{"action": "x"}])
+
+def test_compiled_matches_linear_scan_on_random_rules():
+    rng = random.Random(7)
+    statuses = ["fail", "warning", "escalate", None]
+    sources = ["A", "B", "C", None]
+    words = ["disk", "full", "crash", "timeout", "retry", None]
+    rules = [{
+        "match": {
+            "event_type": rng.choice(["job_issue", None]),
+            "status": rng.choice(statuses),
+            "source": rng.choice(sources),
+            "description_contains": rng.choice(words),
+        },
+        "action": f"action_{i}",
+    } for i in range(200)]
+    compiled = CompiledRules(rules)
+    for _ in range(2000):
+        event = make_event(
+            status=rng.choice(statuses[:-1]),
+            source=rng.choice(sources[:-1]),
+            description=" ".join(rng.choice(words[:-1]).upper() for _ in range(2)),
+        )
+        assert compiled.match(event) == find_remediation_action(event, rules)
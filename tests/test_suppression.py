@@ -0,0 +1,196 @@
+import json
+
+import fakeredis
+import pytest
+
+from agentic.agent import Agent
+from agentic.base import Effector, Sensor
+from agentic.memory import Memory
+from agentic.reasoning_simple import SimpleReasoningModule
+from agentic.suppression import EventSuppressor, build_suppressor
+from history.store import count_records, find_event, query_history
+
+EVENT = {
+    "job_id": 1,
+    "status": "fail",
+    "event_type": "job_issue",
+    "details": {"source": "DiskMonitor", "description": "Disk full on /dev/sda1"},
+}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+class ListSensor(Sensor):
+    def __init__(self, events):
+        self.events = list(events)
+    def get_event(self):
+        return self.events.pop(0) if self.events else None
+
+class CountingReasoning(SimpleReasoningModule):
+    def __init__(self, fail_on=None):
+        self.calls = 0
+        self.fail_on = fail_on
+    def decide(self, event, context):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("model down")
+        return super().decide(event, context)
+
+class CountingEffector(Effector):
+    def __init__(self):
+        self.calls = 0
+    def execute(self, action, params):
+        self.calls += 1
+
+def test_repeats_within_window_are_folded_into_the_leader():
+    clock = FakeClock()
+    suppressor = EventSuppressor(window_seconds=60, clock=clock)
+    assert suppressor.admit(EVENT) is None
+    leader = suppressor.admit(dict(EVENT, details=dict(EVENT["details"], timestamp="later")))
+    assert leader is not None and leader.count == 2
+    # Another job, another status or another description is a different event
+    assert suppressor.admit(dict(EVENT, job_id=2)) is None
+    assert suppressor.admit(dict(EVENT, status="escalate")) is None
+    clock.now = 60
+    assert suppressor.admit(EVENT) is None  # window over: decided again
+    assert suppressor.stats() == {"tracked": 1, "admitted": 4, "suppressed": 1, "evictions": 0, "suppression_ratio": 0.2}
+
+def test_tracked_keys_are_bounded_and_failed_leaders_released():
+    suppressor = EventSuppressor(window_seconds=60, max_keys=3, clock=FakeClock())
+    for job_id in range(5):
+        suppressor.admit(dict(EVENT, job_id=job_id))
+    assert suppressor.stats()["tracked"] == 3 and suppressor.stats()["evictions"] == 2
+    assert suppressor.admit(dict(EVENT, job_id=0)) is None  # evicted first, so decided again
+    suppressor.release(dict(EVENT, job_id=4))
+    assert suppressor.admit(dict(EVENT, job_id=4)) is None
+    assert build_suppressor(0) is None
+
+def test_agent_decides_once_per_window_and_counts_occurrences():
+    clock = FakeClock()
+    reasoning, effector = CountingReasoning(), CountingEffector()
+    agent = Agent([ListSensor([EVENT] * 5)], [effector], reasoning, Memory(), EventSuppressor(window_seconds=60, clock=clock))
+    for _ in range(5):
+        agent.run_once()
+    history = agent.memory.get_history()
+    assert reasoning.calls == effector.calls == 1
+    assert len(history) == 1 and history[0].occurrences == 5
+    assert history[0].to_dict()["occurrences"] == 5
+
+def test_agent_decides_again_after_a_failed_leader():
+    reasoning = CountingReasoning(fail_on=1)
+    agent = Agent([ListSensor([EVENT] * 3)], [], reasoning, Memory(), EventSuppressor(clock=FakeClock()))
+    with pytest.raises(RuntimeError):
+        agent.run_once()
+    agent.run_once()
+    agent.run_once()
+    assert reasoning.calls == 2 and agent.memory.get_history()[0].occurrences == 2
+
+@pytest.fixture
+def worker(monkeypatch):
+    import agentic_worker.main as worker
+
+    client = fakeredis.FakeRedis(decode_responses=True)
+    monkeypatch.setattr(worker, "redis_client", client)
+    monkeypatch.setattr(worker.agent, "memory", Memory())
+    monkeypatch.setattr(worker.agent, "reasoning_module", CountingReasoning())
+    monkeypatch.setattr(worker.agent, "effectors", [CountingEffector()])
+    monkeypatch.setattr(worker.agent, "suppressor", EventSuppressor(window_seconds=60, clock=FakeClock()))
+    return worker
+
+def test_worker_batch_writes_one_record_and_maps_repeats_to_it(worker):
+    payloads = [json.dumps(dict(EVENT, event_id=f"e{i}")) for i in range(4)]
+    payloads.append(json.dumps(dict(EVENT, job_id=2, event_id="other")))
+    worker.process_batch(payloads[:3])
+    worker.process_batch(payloads[3:])
+    worker.process_event(dict(EVENT, event_id="e4"))
+    records, _ = query_history(worker.redis_client)
+    assert [(r["event"]["job_id"], r.get("occurrences", 1)) for r in records] == [(2, 1), (1, 5)]
+    assert worker.agent.reasoning_module.calls == 2 and worker.agent.effectors[0].calls == 2
+    for event_id in ("e0", "e2", "e3", "e4"):
+        assert find_event(worker.redis_client, event_id)[0]["id"] == records[1]["id"]
+    assert worker.agent.suppressor.stats()["suppression_ratio"] == 0.6667
+
+class FlakyRedis:
+    # Proxy to a fake Redis whose next `failures` pipelined writes raise
+    def __init__(self, client, failures=1):
+        self.client = client
+        self.failures = failures
+    def pipeline(self, transaction=True):
+        pipe = self.client.pipeline(transaction=transaction)
+        if self.failures > 0:
+            self.failures -= 1
+            def execute():
+                raise ConnectionError("redis down")
+            pipe.execute = execute
+        return pipe
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+class RecordingQueue:
+    def __init__(self):
+        self.acked, self.nacked = [], []
+    def ack(self, payload):
+        self.acked.append(payload)
+    def nack(self, payload):
+        self.nacked.append(payload)
+
+def test_failed_history_write_releases_the_leader(worker, monkeypatch):
+    client = worker.redis_client
+    monkeypatch.setattr(worker, "redis_client", FlakyRedis(client))
+    with pytest.raises(ConnectionError):
+        worker.process_event(dict(EVENT, event_id="e1"))
+    worker.process_event(dict(EVENT, event_id="e1"))  # redelivered: decided and written this time
+    assert count_records(client) == 1 and find_event(client, "e1") is not None
+
+def test_failed_batch_write_nacks_leaders_and_repeats(worker, monkeypatch):
+    client = worker.redis_client
+    monkeypatch.setattr(worker, "redis_client", FlakyRedis(client))
+    payloads = [json.dumps(dict(EVENT, event_id=f"e{i}")) for i in range(2)]
+    queue = RecordingQueue()
+    worker.process_batch(payloads, queue)
+    assert queue.nacked == payloads and queue.acked == []
+    queue = RecordingQueue()
+    worker.process_batch(payloads, queue)
+    assert queue.acked == payloads and queue.nacked == []
+    assert count_records(client) == 1 and find_event(client, "e1")[0]["id"] == find_event(client, "e0")[0]["id"]
+
+def test_events_without_details_are_processed_not_fatal(worker):
+    from api.main import EventIn
+    payload = EventIn(job_id=1, status="fail").model_dump_json()
+    queue = RecordingQueue()
+    worker.process_batch([payload, payload], queue)
+    assert queue.acked == [payload, payload] and queue.nacked == []
+    assert count_records(worker.redis_client) == 1
+
+def test_failed_occurrence_write_nacks_the_repeats(worker, monkeypatch):
+    client = worker.redis_client
+    first, repeat = json.dumps(dict(EVENT, event_id="e0")), json.dumps(dict(EVENT, event_id="e1"))
+    worker.process_batch([first])
+    monkeypatch.setattr(worker, "redis_client", FlakyRedis(client))
+    queue = RecordingQueue()
+    worker.process_batch([repeat], queue)
+    assert queue.nacked == [repeat] and queue.acked == []
+
+def test_dispatch_batch_decides_new_events_together(worker):
+    from agentic_worker.dispatcher import KeyedDispatcher
+
+    batches = []
+    reasoning = worker.agent.reasoning_module
+    def decide_batch(events, context):
+        batches.append(len(events))
+        return [reasoning.decide(event, context) for event in events]
+    reasoning.decide_batch = decide_batch
+    payloads = [json.dumps(dict(EVENT, event_id=f"e{i}")) for i in range(3)]
+    payloads += [json.dumps(dict(EVENT, job_id=job_id, event_id=f"j{job_id}")) for job_id in (2, 3)]
+    queue = RecordingQueue()
+    dispatcher = KeyedDispatcher(max_workers=2)
+    worker.dispatch_batch(payloads, dispatcher, queue)
+    dispatcher.join(timeout=5)
+    dispatcher.shutdown()
+    assert batches == [3] and sorted(queue.acked) == sorted(payloads) and queue.nacked == []
+    records, _ = query_history(worker.redis_client)
+    assert sorted((r["event"]["job_id"], r.get("occurrences", 1)) for r in records) == [(1, 3), (2, 1), (3, 1)]
+    assert find_event(worker.redis_client, "e2")[0]["id"] == find_event(worker.redis_client, "e0")[0]["id"]